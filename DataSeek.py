@@ -1,20 +1,84 @@
 import sys
 import os
-import re
-import pandas as pd
+import time
+import importlib
 import datetime
 import csv
+import io
 import warnings
-import numpy as np
+from collections import OrderedDict, deque
+
+class StartupProfiler:
+    """启动耗时记录器，使用 --profile-startup 参数运行时输出报告"""
+    def __init__(self):
+        self.enabled = False
+        self.start_time = time.perf_counter()
+        self.events = []  # (事件名称, 距启动的秒数, 自身耗时秒数或None)
+        
+    def mark(self, name):
+        """记录一个启动阶段的完成时刻"""
+        self.events.append((name, time.perf_counter() - self.start_time, None))
+        
+    def record(self, name, duration):
+        """记录一个有自身耗时的步骤（如模块导入）"""
+        self.events.append((name, time.perf_counter() - self.start_time, duration))
+        
+    def report(self, stream=None):
+        """输出启动耗时报告"""
+        if not self.enabled:
+            return
+        stream = stream or sys.stderr
+        stream.write('启动耗时报告:\n')
+        for name, elapsed, duration in self.events:
+            line = f'  {elapsed * 1000:8.1f} ms  {name}'
+            if duration is not None:
+                line += f' (耗时 {duration * 1000:.1f} ms)'
+            stream.write(line + '\n')
+        stream.flush()
+
+startup_profiler = StartupProfiler()
+
+class _LazyModule:
+    """延迟导入的模块代理，首次访问属性时才真正导入模块"""
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        
+    def _load(self):
+        if self._module is None:
+            already_imported = self._name in sys.modules
+            start = time.perf_counter()
+            self._module = importlib.import_module(self._name)
+            if not already_imported:
+                startup_profiler.record(f'导入 {self._name}', time.perf_counter() - start)
+        return self._module
+        
+    def __getattr__(self, attr):
+        value = getattr(self._load(), attr)
+        # 缓存属性，后续访问不再经过代理
+        setattr(self, attr, value)
+        return value
+
+# pandas/numpy及依赖它们的核心引擎导入较慢，延迟到首次使用或窗口显示后的后台预热时再导入
+pd = _LazyModule('pandas')
+np = _LazyModule('numpy')
+engine = _LazyModule('dataseek.engine')
+workspace = _LazyModule('dataseek.workspace')
+export = _LazyModule('dataseek.export')
+
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QTableWidget, QTableWidgetItem,
                            QVBoxLayout, QHBoxLayout, QWidget, QPushButton, QFileDialog,
                            QLineEdit, QLabel, QComboBox, QCheckBox, QMessageBox, QTabWidget,
                            QTextEdit, QGroupBox, QRadioButton, QListWidget, QListWidgetItem,
                            QSplitter, QMenu, QAction, QToolBar, QDialog, QHeaderView,
                            QProgressDialog, QProgressBar, QAbstractItemView, QScrollArea,
-                           QTableView)
-from PyQt5.QtCore import Qt, QRegExp, QSettings, QThread, pyqtSignal, pyqtSlot, QTimer, QMimeData, QAbstractTableModel
-from PyQt5.QtGui import QColor, QBrush, QIcon, QFont, QDragEnterEvent, QDropEvent
+                           QTableView, QShortcut, QDoubleSpinBox, QSpinBox, QInputDialog)
+from PyQt5.QtCore import Qt, QRegExp, QSettings, QThread, pyqtSignal, pyqtSlot, QTimer, QMimeData, QAbstractTableModel, QModelIndex, QObject
+from PyQt5.QtGui import QColor, QBrush, QIcon, QFont, QFontMetrics, QKeySequence, QDragEnterEvent, QDropEvent
+
+from dataseek.constants import FUZZY_DEFAULT_THRESHOLD
+
+startup_profiler.mark('导入PyQt5')
 
 # 过滤字体相关的OpenType支持缺失警告
 warnings.filterwarnings("ignore", message="OpenType support missing for.*")
@@ -24,8 +88,8 @@ warnings.filterwarnings("ignore", message=".*script [0-9]+.*")
 class FileLoaderThread(QThread):
     # 定义信号
     progress_signal = pyqtSignal(int)  # 进度信号
-    chunk_loaded_signal = pyqtSignal(str, pd.DataFrame, bool)  # 块加载信号 (文件路径, 数据块, 是否是最后一块)
-    finished_signal = pyqtSignal(str, pd.DataFrame)  # 完成信号，返回文件路径和DataFrame
+    chunk_loaded_signal = pyqtSignal(str, object, bool)  # 块加载信号 (文件路径, 数据块DataFrame, 是否是最后一块)
+    finished_signal = pyqtSignal(str, object)  # 完成信号，返回文件路径和DataFrame
     error_signal = pyqtSignal(str, str)  # 错误信号，返回文件路径和错误信息
     
     def __init__(self, file_path, chunk_size=50000, low_memory_mode=False):
@@ -43,234 +107,581 @@ class FileLoaderThread(QThread):
             # 发送开始加载信号
             self.progress_signal.emit(10)
             
-            # 根据文件扩展名选择加载方法
-            if self.file_path.endswith(('.xlsx', '.xls')):
-                if self.low_memory_mode:
-                    # Excel文件低内存模式加载
-                    self.load_excel_in_chunks()
-                else:
-                    # 普通方式加载Excel
-                    self.load_excel_regular()
-            elif self.file_path.endswith('.csv'):
-                if self.low_memory_mode:
-                    # CSV文件低内存模式加载
-                    self.load_csv_in_chunks()
-                else:
-                    # 普通方式加载CSV
-                    self.load_csv_regular()
-            else:
+            if not engine.is_supported_file(self.file_path):
                 self.error_signal.emit(self.file_path, '不支持的文件格式')
                 return
+            
+            if self.low_memory_mode:
+                # 低内存模式分块加载
+                self.load_in_chunks()
+            else:
+                # 普通方式加载
+                self.load_regular()
 
         except Exception as e:
             # 发送错误信号
             if not self.is_cancelled:
                 self.error_signal.emit(self.file_path, str(e))
 
-    def load_excel_regular(self):
-        """常规方式加载Excel文件"""
-        # 过滤openpyxl的默认样式警告
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl.styles.stylesheet")
-            df = pd.read_excel(self.file_path)
+    def load_regular(self):
+        """常规方式加载文件"""
+        df = engine.read_file(self.file_path)
         if self.is_cancelled:
             return
         self.progress_signal.emit(80)
         
-        # 处理数据
-        self.post_process_dataframe(df)
-        
         # 发送完成信号
         self.finished_signal.emit(self.file_path, df)
         self.progress_signal.emit(100)
     
-    def load_excel_in_chunks(self):
-        """分块加载Excel文件"""
+    def load_in_chunks(self):
+        """分块加载文件"""
         try:
-            # 获取Excel表的行数
-            with warnings.catch_warnings():
-                warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl.styles.stylesheet")
-                import openpyxl
-                wb = openpyxl.load_workbook(self.file_path, read_only=True)
-                sheet = wb.active
-                total_rows = sheet.max_row
-                
-            # 分块读取
-            chunks = []
-            for i in range(0, total_rows, self.chunk_size):
+            for chunk, is_last_chunk, fraction in engine.iter_file_chunks(self.file_path, self.chunk_size):
                 if self.is_cancelled:
                     return
                 
-                # 读取一块数据
-                with warnings.catch_warnings():
-                    warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl.styles.stylesheet")
-                    nrows = min(self.chunk_size, total_rows - i)
-                    skiprows = list(range(1, i + 1)) if i > 0 else None
-                    df_chunk = pd.read_excel(self.file_path, skiprows=skiprows, nrows=nrows)
-                
-                # 处理块数据
-                self.post_process_dataframe(df_chunk)
-                
                 # 发送块加载信号
-                is_last_chunk = (i + self.chunk_size >= total_rows)
-                self.chunk_loaded_signal.emit(self.file_path, df_chunk, is_last_chunk)
+                self.chunk_loaded_signal.emit(self.file_path, chunk, is_last_chunk)
                 
                 # 更新进度
-                progress = 10 + int(70 * (i + nrows) / total_rows)
-                self.progress_signal.emit(min(progress, 80))
+                self.progress_signal.emit(10 + int(70 * fraction))
             
-            # 最后一块读取可能已经发送完成信号，这里不再重复发送
             self.progress_signal.emit(100)
             
         except Exception as e:
-            self.error_signal.emit(self.file_path, f"分块加载Excel文件失败: {str(e)}")
+            self.error_signal.emit(self.file_path, f"分块加载文件失败: {str(e)}")
+
+class ImportWarmupThread(QThread):
+    """后台预导入线程，在主窗口显示后导入数据处理相关的重量级模块"""
+    MODULES = ('numpy', 'pandas', 'openpyxl', 'dataseek.engine', 'dataseek.workspace', 'dataseek.export')
+    
+    def run(self):
+        for name in self.MODULES:
+            if name in sys.modules:
+                continue
+            start = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                continue
+            startup_profiler.record(f'后台导入 {name}', time.perf_counter() - start)
+        startup_profiler.mark('后台预导入完成')
+
+class SortWorker(QThread):
+    """后台计算排序排列的线程"""
+    finished_signal = pyqtSignal(object, object, float)  # (排序键, 行号排列, 耗时秒数)
     
-    def load_csv_regular(self):
-        """常规方式加载CSV文件"""
-        # 小文件直接读取
-        df = pd.read_csv(self.file_path)
+    def __init__(self, key, series, ascending):
+        super().__init__()
+        self.key = key
+        self.series = series
+        self.ascending = ascending
         
-        if self.is_cancelled:
-            return
-        self.progress_signal.emit(80)
+    def run(self):
+        start = time.perf_counter()
+        order = engine.sort_permutation(self.series, self.ascending)
+        self.finished_signal.emit(self.key, order, time.perf_counter() - start)
+
+class ExportWorker(QThread):
+    """后台分批导出结果的线程"""
+    progress_signal = pyqtSignal(int)  # 已写出的行数
+    finished_signal = pyqtSignal(str, int, float)  # (文件路径, 写出行数, 耗时秒数)
+    cancelled_signal = pyqtSignal(str)  # 导出被取消，未写完的文件已删除
+    error_signal = pyqtSignal(str)  # 错误信息
+    
+    def __init__(self, file_path, columns, frames, row_order=None):
+        super().__init__()
+        self.file_path = file_path
+        self.columns = columns
+        self.frames = frames
+        self.row_order = row_order
+        self.is_cancelled = False
         
-        # 处理数据
-        self.post_process_dataframe(df)
+    def cancel(self):
+        self.is_cancelled = True
         
-        # 发送完成信号
-        self.finished_signal.emit(self.file_path, df)
-        self.progress_signal.emit(100)
+    def on_progress(self, written):
+        self.progress_signal.emit(written)
+        return not self.is_cancelled
+        
+    def run(self):
+        try:
+            start = time.perf_counter()
+            written, completed = export.export_rows(self.file_path, self.columns, self.frames,
+                                                    self.row_order, self.on_progress)
+            if completed:
+                self.finished_signal.emit(self.file_path, written, time.perf_counter() - start)
+            else:
+                self.cancelled_signal.emit(self.file_path)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+
+class ProfileWorker(QThread):
+    """后台计算列概况的线程"""
+    finished_signal = pyqtSignal(object, object, float)  # ((文件路径, 列名, 数据版本), 列概况, 耗时秒数)
+    error_signal = pyqtSignal(str)  # 错误信息
     
-    def load_csv_in_chunks(self):
-        """分块加载CSV文件"""
+    def __init__(self, key, series):
+        super().__init__()
+        self.key = key
+        self.series = series
+        
+    def run(self):
         try:
-            # 获取总行数
-            total_rows = 0
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                for _ in f:
-                    total_rows += 1
-            
-            # 分块读取
-            reader = pd.read_csv(self.file_path, chunksize=self.chunk_size)
-            for i, chunk in enumerate(reader):
-                if self.is_cancelled:
-                    return
-                
-                # 处理块数据
-                self.post_process_dataframe(chunk)
-                
-                # 发送块加载信号
-                is_last_chunk = ((i+1) * self.chunk_size >= total_rows)
-                self.chunk_loaded_signal.emit(self.file_path, chunk, is_last_chunk)
-                
-                # 更新进度
-                progress = 10 + int(70 * (i+1) * self.chunk_size / total_rows)
-                self.progress_signal.emit(min(progress, 80))
-            
-            # 最后一块读取可能已经发送完成信号，这里不再重复发送
-            self.progress_signal.emit(100)
-            
+            start = time.perf_counter()
+            profile = engine.profile_column(self.series)
+            self.finished_signal.emit(self.key, profile, time.perf_counter() - start)
         except Exception as e:
-            self.error_signal.emit(self.file_path, f"分块加载CSV文件失败: {str(e)}")
-    
-    def post_process_dataframe(self, df):
-        """处理DataFrame"""
-        # 处理NaN值，将其替换为空字符串
-        df.fillna('', inplace=True)
-        
-        # 确保所有列名都是字符串类型
-        df.columns = [str(col) for col in df.columns]
-        
-        # 处理无名列（Unnamed列）
-        # 检测列名中是否包含'Unnamed'开头的列
-        unnamed_cols = [col for col in df.columns if str(col).startswith('Unnamed')]            
-        if unnamed_cols:
-            # 重命名无名列为更有意义的名称
-            rename_dict = {col: f"列{i+1}" for i, col in enumerate(unnamed_cols)}
-            df.rename(columns=rename_dict, inplace=True)
-        
-        # 优化内存使用
-        self.optimize_dataframe_memory(df)
-        
-    def optimize_dataframe_memory(self, df):
-        """优化DataFrame内存使用"""
-        # 对于字符串列，转换为category类型可以节省内存
-        for col in df.columns:
-            if df[col].dtype == 'object' and df[col].nunique() < len(df) * 0.5:
-                df[col] = df[col].astype('category')
-                
-        # 对于数值列，如果可能，使用较小的数据类型
-        for col in df.columns:
-            if pd.api.types.is_integer_dtype(df[col]):
-                # 对于整数列，尝试使用较小的整数类型
-                c_min = df[col].min()
-                c_max = df[col].max()
-                if c_min > -128 and c_max < 128:
-                    df[col] = df[col].astype(np.int8)
-                elif c_min > -32768 and c_max < 32768:
-                    df[col] = df[col].astype(np.int16)
-                elif c_min > -2147483648 and c_max < 2147483648:
-                    df[col] = df[col].astype(np.int32)
-            elif pd.api.types.is_float_dtype(df[col]):
-                # 对于浮点列，尝试使用较小的浮点类型
-                df[col] = df[col].astype(np.float32)
+            self.error_signal.emit(str(e))
+
+class IndexBuildWorker(QThread):
+    """后台建立搜索索引（标准化影子列、关联键索引）的线程"""
+    finished_signal = pyqtSignal(object, object, float)  # ((文件路径, 数据版本, 缓存键), 索引, 耗时秒数)
+    error_signal = pyqtSignal(str)  # 错误信息
+    
+    def __init__(self, key, build):
+        super().__init__()
+        self.key = key
+        self.build = build
+        
+    def run(self):
+        try:
+            start = time.perf_counter()
+            index = self.build()
+            self.finished_signal.emit(self.key, index, time.perf_counter() - start)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+
+class CopyWorker(QThread):
+    """后台把选中的行列序列化为TSV文本，或直接写入文件"""
+    finished_signal = pyqtSignal(object, int, float)  # (TSV文本，写入文件时为None, 行数, 耗时秒数)
+    error_signal = pyqtSignal(str)  # 错误信息
+    
+    def __init__(self, frames, rows, columns, file_path=None, header=None):
+        super().__init__()
+        self.frames = frames
+        self.rows = rows
+        self.columns = columns
+        self.file_path = file_path
+        self.header = header
+        
+    def run(self):
+        try:
+            start = time.perf_counter()
+            if self.file_path:
+                with open(self.file_path, 'w', encoding='utf-8-sig', newline='') as out:
+                    export.write_delimited(out, self.frames, self.rows, self.columns, header=self.header)
+                text = None
+            else:
+                out = io.StringIO()
+                export.write_delimited(out, self.frames, self.rows, self.columns, header=self.header)
+                text = out.getvalue()
+            self.finished_signal.emit(text, len(self.rows), time.perf_counter() - start)
+        except Exception as e:
+            self.error_signal.emit(str(e))
 
 class VirtualizedDataModel(QAbstractTableModel):
-    """虚拟化数据模型，用于高效显示大型数据集"""
+    """虚拟化数据模型，用于高效显示大型数据集
+    
+    数据按块保存（一次性加载的文件只有一块），分块加载时新数据块以插入行的方式
+    追加，不合并数据、不重置模型，滚动位置和选中项保持不变。
+    单元格直接从缓存的列数组中读取；显示文本按行块（BLOCK_ROWS行×1列）
+    批量格式化，并保存在一个小型LRU缓存中，滚动重绘时几乎不再有额外开销。
+    排序不复制数据，而是在后台线程计算行号排列，视图行通过排列映射到源数据行。
+    筛选同样不复制数据：每个筛选条件保存一个行级匹配掩码，多个条件按“且”叠加，
+    视图只保留掩码为True的源数据行号。
+    搜索结果的高亮来自搜索引擎给出的每行匹配列序号，绘制时只需查表。
+    """
+    BLOCK_ROWS = 256  # 每个格式化块包含的行数
+    BLOCK_CACHE_SIZE = 512  # 最多缓存的格式化块数
+    SORT_CACHE_SIZE = 4  # 最多缓存的排序排列数
+    
+    sort_finished_signal = pyqtSignal(str, float)  # 排序完成 (列名, 耗时秒数)
+    filters_changed_signal = pyqtSignal()  # 筛选条件变化
+    
     def __init__(self, df=None, parent=None):
         super().__init__(parent)
-        self._df = pd.DataFrame() if df is None else df
+        self._row_order = None  # 视图行 -> 源数据行，None表示原始顺序且未筛选
+        self._sort_order = None  # 按排序排列的全部源数据行号，None表示原始顺序
+        self._filters = []  # 筛选条件列表 [(搜索内容, 搜索选项, 行级匹配掩码)]
+        self._filter_mask = None  # 所有筛选条件叠加后的掩码，None表示不筛选
+        self._filter_enabled = True
+        self._sort_cache = OrderedDict()  # (列号, 排序方向) -> 行号排列
+        self._pending_sort = None  # 最近一次请求的排序键
+        self._sort_workers = set()  # 运行中的排序线程
+        self._generation = 0  # 数据版本，过期的排序结果会被丢弃
+        # 交替行背景色和高亮颜色，只创建一次
+        self._row_brushes = (QBrush(QColor('#ffffff')), QBrush(QColor('#f5f5f5')))
+        self._highlight_brush = QBrush(QColor('#ffe58f'))
+        self._highlight_text_brush = QBrush(QColor('#873800'))
+        self._highlight_bits = None  # 每个源数据行匹配列的位图（见engine.row_hits），None表示不高亮
+        self._key_columns = set()  # 关联键列名，表头加粗显示
+        self._key_font = QFont()
+        self._key_font.setBold(True)
+        # 未设置数据时保持为空，避免在窗口创建阶段就导入pandas
+        self._chunks = []  # 数据块列表
+        self._chunk_starts = []  # 每个数据块第一行的源数据行号
+        self._row_count = 0
         self._columns = []
+        self._alignments = []
+        self._column_values = {}  # (块号, 列号) -> (取值数组, category列的取值文本或None)
+        self._block_cache = OrderedDict()  # (块号, 列号) -> 该块的显示文本列表
+        self._pending_chunks = []  # 等待合并刷新时追加的数据块
         if df is not None:
-            self._columns = [str(col) for col in df.columns]
+            self._load_chunks([df])
+    
+    def _load_chunks(self, chunks):
+        """设置数据块并重建列级缓存"""
+        self._chunks = list(chunks)
+        self._pending_chunks = []
+        self._chunk_starts = []
+        self._row_count = 0
+        for chunk in self._chunks:
+            self._chunk_starts.append(self._row_count)
+            self._row_count += len(chunk)
+        df = self._chunks[0] if self._chunks else None
+        self._columns = [] if df is None else [str(col) for col in df.columns]
+        self._column_values = {}
+        self._block_cache.clear()
+        self._row_order = None
+        self._sort_order = None
+        self._filters = []
+        self._filter_mask = None
+        self._filter_enabled = True
+        self._highlight_bits = None
+        self._sort_cache.clear()
+        self._pending_sort = None
+        self._generation += 1
+        
+        # 根据列的数据类型预先确定对齐方式
+        self._alignments = []
+        if df is not None:
+            for col in range(len(self._columns)):
+                dtype = df.dtypes.iloc[col]
+                if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+                    self._alignments.append(Qt.AlignRight | Qt.AlignVCenter)
+                else:
+                    self._alignments.append(Qt.AlignLeft | Qt.AlignVCenter)
     
     def set_dataframe(self, df):
         """设置数据框"""
+        self.set_chunks([] if df is None else [df])
+    
+    def set_chunks(self, chunks):
+        """设置按块保存的数据，数据块不会被合并"""
+        had_filters = bool(self._filters)
         self.beginResetModel()
-        self._df = df
-        self._columns = [str(col) for col in df.columns]
+        self._load_chunks(chunks)
         self.endResetModel()
+        if had_filters:
+            self.filters_changed_signal.emit()
+    
+    def set_highlights(self, matched_bits):
+        """设置每个源数据行需要高亮的列位图（见engine.row_hits，一行可高亮多列），None取消高亮"""
+        if matched_bits is not None:
+            matched_bits = np.asarray(matched_bits, dtype=np.uint8)
+            if len(matched_bits) != self._row_count:
+                raise ValueError('高亮数据的行数与表格行数不一致')
+        self._highlight_bits = matched_bits
+        if self._row_count and self._columns:
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, len(self._columns) - 1),
+                                  [Qt.BackgroundRole, Qt.ForegroundRole])
+    
+    def set_key_columns(self, names):
+        """设置关联键列名"""
+        self._key_columns = set(names)
+        if self._columns:
+            self.headerDataChanged.emit(Qt.Horizontal, 0, len(self._columns) - 1)
+    
+    def is_highlighted(self, row, col):
+        """单元格是否是搜索命中的单元格"""
+        if self._highlight_bits is None or col >> 3 >= self._highlight_bits.shape[1]:
+            return False
+        return bool(self._highlight_bits[self.source_row(row), col >> 3] >> (col & 7) & 1)
+    
+    @property
+    def chunks(self):
+        """当前的数据块列表"""
+        return self._chunks
+    
+    @property
+    def columns(self):
+        """列名列表"""
+        return self._columns
+    
+    @property
+    def row_order(self):
+        """视图行对应的源数据行号数组，None表示原始顺序且未筛选"""
+        return self._row_order
+    
+    def append_chunk(self, chunk):
+        """在末尾追加一个数据块，只通知视图插入了新行"""
+        self.append_chunks([chunk])
+    
+    def append_chunks(self, chunks):
+        """在末尾追加多个数据块，只发出一次插入行通知"""
+        if not self._chunks:
+            self.set_chunks(chunks)
+            return
+        new_rows = sum(len(chunk) for chunk in chunks)
+        if new_rows == 0:
+            return
+        
+        # 新行同样按已有的筛选条件计算掩码，视图末尾只追加通过筛选的行
+        first_source = self._row_count
+        new_sources = np.arange(first_source, first_source + new_rows)
+        new_masks = [np.concatenate([engine.match_mask(chunk, search_text, options) for chunk in chunks])
+                     for search_text, options, _ in self._filters]
+        new_visible = new_sources
+        if new_masks and self._filter_enabled:
+            new_visible = new_sources[np.logical_and.reduce(new_masks)]
+        
+        first = self.rowCount()
+        if len(new_visible):
+            self.beginInsertRows(QModelIndex(), first, first + len(new_visible) - 1)
+        for chunk in chunks:
+            self._chunks.append(chunk)
+            self._chunk_starts.append(self._row_count)
+            self._row_count += len(chunk)
+        if self._filters:
+            self._filters = [(search_text, options, np.concatenate([mask, new_mask]))
+                             for (search_text, options, mask), new_mask in zip(self._filters, new_masks)]
+            self._filter_mask = np.logical_and.reduce([mask for _, _, mask in self._filters])
+        if self._highlight_bits is not None:
+            self._highlight_bits = np.concatenate(
+                [self._highlight_bits, np.zeros((new_rows, self._highlight_bits.shape[1]), dtype=np.uint8)])
+        if self._sort_order is not None:
+            # 已排序时新行暂时按原顺序排在末尾，加载完成后再重新排序
+            self._sort_order = np.concatenate([self._sort_order, new_sources])
+        if self._row_order is not None:
+            self._row_order = np.concatenate([self._row_order, new_visible])
+        # 末尾未满的行块需要重新格式化
+        if first % self.BLOCK_ROWS:
+            tail_block = first // self.BLOCK_ROWS
+            for key in [key for key in self._block_cache if key[0] == tail_block]:
+                del self._block_cache[key]
+        # 已缓存和计算中的排列都不包含新行
+        self._sort_cache.clear()
+        self._generation += 1
+        if len(new_visible):
+            self.endInsertRows()
+        if self._filters:
+            self.filters_changed_signal.emit()
+    
+    def queue_chunk(self, chunk):
+        """登记一个待追加的数据块，调用flush_pending_chunks时才统一插入"""
+        self._pending_chunks.append(chunk)
+    
+    def flush_pending_chunks(self):
+        """插入所有已登记的数据块"""
+        if self._pending_chunks:
+            chunks, self._pending_chunks = self._pending_chunks, []
+            self.append_chunks(chunks)
+    
+    def finish_chunks(self, df=None):
+        """分块加载完成：可用合并后的数据替换数据块（行不变，无需重置），并恢复排序"""
+        self.flush_pending_chunks()
+        if df is not None and len(df) == self._row_count:
+            self._chunks = [df]
+            self._chunk_starts = [0]
+            self._column_values = {}
+        if self._pending_sort is not None:
+            column, order = self._pending_sort
+            self.sort(column, Qt.SortOrder(order))
     
     def rowCount(self, parent=None):
-        """返回行数"""
-        return len(self._df)
+        """返回行数（筛选后的可见行数）"""
+        return self._row_count if self._row_order is None else len(self._row_order)
+    
+    @property
+    def source_row_count(self):
+        """源数据总行数"""
+        return self._row_count
+    
+    @property
+    def filters(self):
+        """当前的筛选条件 [(搜索内容, 搜索选项)]"""
+        return [(search_text, options) for search_text, options, _ in self._filters]
+    
+    @property
+    def filter_enabled(self):
+        """筛选是否生效"""
+        return self._filter_enabled
+    
+    def _rebuild_row_order(self):
+        """根据排序排列和筛选掩码重新计算视图行对应的源数据行"""
+        mask = self._filter_mask if self._filter_enabled else None
+        if mask is None:
+            self._row_order = self._sort_order
+        elif self._sort_order is None:
+            self._row_order = np.flatnonzero(mask)
+        else:
+            self._row_order = self._sort_order[mask[self._sort_order]]
+        self._block_cache.clear()
+    
+    def _reset_view(self):
+        """筛选变化时重建视图"""
+        self.beginResetModel()
+        self._rebuild_row_order()
+        self.endResetModel()
+        self.filters_changed_signal.emit()
+    
+    def add_filter(self, search_text, options, profiles=None):
+        """叠加一个筛选条件，使用与搜索相同的向量化匹配计算行级掩码；profiles 为已缓存的列概况"""
+        if not self._chunks:
+            return
+        mask = np.concatenate([engine.match_mask(chunk, search_text, options, profiles=profiles)
+                               for chunk in self._chunks])
+        self._filters.append((search_text, options, mask))
+        self._filter_mask = mask if self._filter_mask is None else self._filter_mask & mask
+        self._filter_enabled = True
+        self._reset_view()
+    
+    def remove_last_filter(self):
+        """撤销最后一个筛选条件"""
+        if not self._filters:
+            return
+        self._filters.pop()
+        self._filter_mask = (np.logical_and.reduce([mask for _, _, mask in self._filters])
+                             if self._filters else None)
+        self._reset_view()
+    
+    def clear_filters(self):
+        """清除所有筛选条件"""
+        if not self._filters:
+            return
+        self._filters = []
+        self._filter_mask = None
+        self._reset_view()
+    
+    def set_filter_enabled(self, enabled):
+        """临时停用或重新启用筛选，筛选条件保留"""
+        if enabled == self._filter_enabled:
+            return
+        self._filter_enabled = enabled
+        if self._filters:
+            self._reset_view()
     
     def columnCount(self, parent=None):
         """返回列数"""
         return len(self._columns)
     
+    def _get_column_values(self, chunk, col):
+        """获取数据块中某列的NumPy数组；category列返回编码数组和预先格式化的取值文本"""
+        key = (chunk, col)
+        if key not in self._column_values:
+            series = self._chunks[chunk].iloc[:, col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                labels = [('' if pd.isna(value) else str(value)) for value in series.cat.categories]
+                # 编码-1表示缺失值，对应追加在末尾的空字符串
+                labels = np.array(labels + [''], dtype=object)
+                self._column_values[key] = (series.cat.codes.to_numpy(), labels)
+            else:
+                self._column_values[key] = (series.to_numpy(), None)
+        return self._column_values[key]
+    
+    def _chunk_texts(self, chunk, col, rows):
+        """格式化数据块内指定行（块内行号）的显示文本"""
+        values, labels = self._get_column_values(chunk, col)
+        if labels is not None:
+            return labels[values[rows]].tolist()
+        return ['' if pd.isna(value) else str(value) for value in values[rows]]
+    
+    def _source_texts(self, col, rows):
+        """格式化指定源数据行的显示文本，行可以分布在多个数据块中"""
+        if len(self._chunks) == 1:
+            return self._chunk_texts(0, col, rows)
+        starts = np.asarray(self._chunk_starts)
+        chunk_ids = np.searchsorted(starts, rows, side='right') - 1
+        texts = np.empty(len(rows), dtype=object)
+        for chunk in np.unique(chunk_ids):
+            mask = chunk_ids == chunk
+            texts[mask] = self._chunk_texts(int(chunk), col, rows[mask] - starts[chunk])
+        return texts.tolist()
+    
+    def column_series(self, col):
+        """某列的完整Series，多个数据块时才合并"""
+        if len(self._chunks) == 1:
+            return self._chunks[0].iloc[:, col]
+        return pd.concat([chunk.iloc[:, col] for chunk in self._chunks], ignore_index=True)
+    
+    def sample_texts(self, col, rows):
+        """直接格式化指定视图行的显示文本（不经过块缓存），用于列宽估算等少量抽样"""
+        rows = np.asarray(rows, dtype=np.int64)
+        if self._row_order is not None:
+            rows = self._row_order[rows]
+        return self._source_texts(col, rows)
+    
+    def longest_category_labels(self, col, count=5):
+        """category列中最长的几个取值文本；非category列返回None"""
+        labels = []
+        for chunk in range(len(self._chunks)):
+            chunk_labels = self._get_column_values(chunk, col)[1]
+            if chunk_labels is None:
+                return None
+            labels.extend(chunk_labels.tolist())
+        return sorted(set(labels), key=len)[-count:]
+    
+    def source_row(self, row):
+        """视图行对应的源数据行"""
+        return row if self._row_order is None else int(self._row_order[row])
+    
+    def _format_block(self, block, col):
+        """格式化一个行块中某列的显示文本"""
+        start = block * self.BLOCK_ROWS
+        if self._row_order is None:
+            rows = np.arange(start, min(start + self.BLOCK_ROWS, self._row_count))
+        else:
+            rows = self._row_order[start:start + self.BLOCK_ROWS]
+        return self._source_texts(col, rows)
+    
+    def _display_text(self, row, col):
+        """返回单元格显示文本，优先从块缓存中读取"""
+        key = (row // self.BLOCK_ROWS, col)
+        texts = self._block_cache.get(key)
+        if texts is None:
+            texts = self._format_block(key[0], col)
+            self._block_cache[key] = texts
+            if len(self._block_cache) > self.BLOCK_CACHE_SIZE:
+                self._block_cache.popitem(last=False)
+        else:
+            self._block_cache.move_to_end(key)
+        return texts[row % self.BLOCK_ROWS]
+    
     def data(self, index, role=Qt.DisplayRole):
         """返回单元格数据"""
         if not index.isValid():
             return None
             
         row, col = index.row(), index.column()
-        if row >= len(self._df) or col >= len(self._columns):
+        if row >= self.rowCount() or col >= len(self._columns):
             return None
-            
-        # 获取单元格值
-        value = self._df.iloc[row, col]
         
         if role == Qt.DisplayRole:
             # 显示用的文本
-            return '' if pd.isna(value) else str(value)
+            return self._display_text(row, col)
         elif role == Qt.TextAlignmentRole:
-            # 根据数据类型设置对齐方式
-            if isinstance(value, (int, float)) and not pd.isna(value):
-                return Qt.AlignRight | Qt.AlignVCenter
-            else:
-                return Qt.AlignLeft | Qt.AlignVCenter
+            # 对齐方式按列的数据类型预先确定
+            return self._alignments[col]
         elif role == Qt.BackgroundRole:
-            # 设置交替行颜色
-            if row % 2 == 0:
-                return QBrush(QColor('#ffffff'))
-            else:
-                return QBrush(QColor('#f5f5f5'))
+            # 搜索命中的单元格高亮，其余为交替行颜色
+            if self.is_highlighted(row, col):
+                return self._highlight_brush
+            return self._row_brushes[row % 2]
+        elif role == Qt.ForegroundRole:
+            if self.is_highlighted(row, col):
+                return self._highlight_text_brush
         
         return None
     
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         """返回表头数据"""
+        if orientation == Qt.Horizontal and role in (Qt.FontRole, Qt.ToolTipRole):
+            # 关联键列的表头加粗
+            if section < len(self._columns) and str(self._columns[section]) in self._key_columns:
+                return self._key_font if role == Qt.FontRole else '关联键'
+            return None
         if role != Qt.DisplayRole:
             return None
             
@@ -285,92 +696,213 @@ class VirtualizedDataModel(QAbstractTableModel):
         return None
     
     def sort(self, column, order):
-        """排序表格"""
-        self.beginResetModel()
-        if column < len(self._columns):
-            col_name = self._columns[column]
-            ascending = (order == Qt.AscendingOrder)
-            self._df = self._df.sort_values(by=col_name, ascending=ascending)
-        self.endResetModel()
-
-class ChunkedDataManager:
-    """分块数据管理器，用于处理大型数据集"""
-    def __init__(self):
-        self.chunks = {}  # 存储文件的数据块，键为文件路径，值为数据块列表
-        self.full_data = {}  # 存储完整数据，用于小型文件
-        self.meta_info = {}  # 存储元数据，如总行数、列名等
-        
-    def add_chunk(self, file_path, chunk_df, is_last_chunk):
-        """添加数据块"""
-        # 确保文件路径存在于字典中
-        if file_path not in self.chunks:
-            self.chunks[file_path] = []
-            # 存储元数据
-            self.meta_info[file_path] = {
-                'columns': [str(col) for col in chunk_df.columns],
-                'total_rows': 0
-            }
-        
-        # 添加数据块
-        self.chunks[file_path].append(chunk_df)
+        """排序表格：在后台线程计算行号排列，已计算过的排列直接复用"""
+        if not self._chunks or column < 0 or column >= len(self._columns):
+            return
         
-        # 更新总行数
-        self.meta_info[file_path]['total_rows'] += len(chunk_df)
+        key = (column, int(order))
+        self._pending_sort = key
+        if key in self._sort_cache:
+            self._sort_cache.move_to_end(key)
+            self._apply_row_order(self._sort_cache[key])
+            return
         
-        # 如果是最后一块，合并所有块
-        if is_last_chunk and len(self.chunks[file_path]) > 0:
-            # 如果总行数不太大，合并为完整数据
-            if self.meta_info[file_path]['total_rows'] < 500000:
-                self.full_data[file_path] = pd.concat(self.chunks[file_path], ignore_index=True)
-                # 释放块数据内存
-                self.chunks[file_path] = []
+        worker = SortWorker((self._generation, key), self.column_series(column), order == Qt.AscendingOrder)
+        worker.finished_signal.connect(self._on_sort_finished)
+        worker.finished.connect(lambda: self._sort_workers.discard(worker))
+        self._sort_workers.add(worker)
+        worker.start()
     
-    def get_dataframe(self, file_path):
-        """获取文件的完整DataFrame"""
-        # 如果有完整数据，返回完整数据
-        if file_path in self.full_data:
-            return self.full_data[file_path]
-        
-        # 如果只有块数据，合并所有块返回
-        if file_path in self.chunks and self.chunks[file_path]:
-            return pd.concat(self.chunks[file_path], ignore_index=True)
-        
-        return None
+    def _on_sort_finished(self, worker_key, order, elapsed):
+        """后台排序完成，缓存排列并在仍是最新请求时应用"""
+        generation, key = worker_key
+        if generation != self._generation:
+            return
+        self._sort_cache[key] = order
+        while len(self._sort_cache) > self.SORT_CACHE_SIZE:
+            self._sort_cache.popitem(last=False)
+        if key == self._pending_sort:
+            self._apply_row_order(order)
+            self.sort_finished_signal.emit(self._columns[key[0]], elapsed)
     
-    def get_chunk(self, file_path, chunk_index):
-        """获取特定的数据块"""
-        if file_path in self.chunks and chunk_index < len(self.chunks[file_path]):
-            return self.chunks[file_path][chunk_index]
-        return None
+    def _apply_row_order(self, order):
+        """切换排序排列，同时保持选中等持久索引指向原来的数据行"""
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_sources = [self.source_row(index.row()) for index in old_indexes]
+        
+        self._sort_order = order
+        self._rebuild_row_order()
+        
+        if old_indexes:
+            # 筛选不变，原来可见的行排序后仍然可见
+            view_order = self._row_order
+            inverse = np.empty(self._row_count, dtype=np.int64)
+            inverse[view_order] = np.arange(len(view_order))
+            new_indexes = [self.index(int(inverse[source]), index.column())
+                           for index, source in zip(old_indexes, old_sources)]
+            self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+def autosize_columns(table_view, head_rows=50, tail_rows=20, random_rows=100,
+                     min_width=40, max_width=400, padding=16):
+    """按抽样估算并设置列宽，代替对百万行表格调用resizeColumnsToContents
+    
+    只测量表头、开头和结尾若干行以及固定数量的随机行；category列直接使用
+    最长的取值文本。无论表格有多少行，耗时都只与列数和抽样行数有关。
+    """
+    model = table_view.model()
+    row_count, column_count = model.rowCount(), model.columnCount()
+    if column_count == 0:
+        return
+    
+    # 抽样行：开头、结尾和固定随机种子的随机行
+    rows = np.arange(min(head_rows, row_count))
+    if row_count > head_rows:
+        tail = np.arange(max(head_rows, row_count - tail_rows), row_count)
+        middle_count = min(random_rows, max(row_count - head_rows - tail_rows, 0))
+        middle = head_rows + np.random.default_rng(0).choice(
+            row_count - head_rows - tail_rows, middle_count, replace=False) if middle_count else []
+        rows = np.unique(np.concatenate([rows, tail, middle])).astype(np.int64)
+    
+    cell_metrics = QFontMetrics(table_view.font())
+    header = table_view.horizontalHeader()
+    header_metrics = QFontMetrics(header.font())
+    for col in range(column_count):
+        # 表头额外预留排序指示器的宽度
+        title = str(model.headerData(col, Qt.Horizontal, Qt.DisplayRole) or '')
+        width = header_metrics.horizontalAdvance(title) + padding + 12
+        
+        texts = model.longest_category_labels(col) if hasattr(model, 'longest_category_labels') else None
+        if texts is None and len(rows):
+            texts = model.sample_texts(col, rows)
+        for text in texts or []:
+            width = max(width, cell_metrics.horizontalAdvance(text) + padding)
+            if width >= max_width:
+                break
+        header.resizeSection(col, max(min_width, min(width, max_width)))
+
+class FrameMonitor(QObject):
+    """GUI线程阻塞监测，使用 --profile-ui 参数运行时启用
     
-    def get_row_count(self, file_path):
-        """获取文件的总行数"""
-        if file_path in self.meta_info:
-            return self.meta_info[file_path]['total_rows']
-        return 0
-    
-    def get_columns(self, file_path):
-        """获取文件的列名"""
-        if file_path in self.meta_info:
-            return self.meta_info[file_path]['columns']
-        return []
-    
-    def clear_file(self, file_path):
-        """清除文件数据"""
-        if file_path in self.chunks:
-            del self.chunks[file_path]
-        if file_path in self.full_data:
-            del self.full_data[file_path]
-        if file_path in self.meta_info:
-            del self.meta_info[file_path]
-    
-    def clear_all(self):
-        """清除所有数据"""
-        self.chunks.clear()
-        self.full_data.clear()
-        self.meta_info.clear()
+    以固定间隔的心跳定时器测量事件循环的响应：心跳实际间隔超出设定间隔的部分
+    即为这一帧内GUI线程被占用的时间。
+    """
+    HEARTBEAT_MS = 16  # 心跳间隔，约60帧每秒
+    JANK_MS = 50  # 阻塞超过该时间视为卡顿
+    RECENT_FRAMES = 600  # 计算分位数时保留的最近帧数
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.enabled = False
+        self._last_tick = None
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_heartbeat)
+        self.reset()
+        
+    def reset(self):
+        """清空统计数据"""
+        self.frame_count = 0
+        self.total_blocked = 0.0
+        self.max_blocked = 0.0
+        self.jank_count = 0
+        self.recent_blocked = deque(maxlen=self.RECENT_FRAMES)
+        self.flush_count = 0
+        self.total_flush = 0.0
+        self.max_flush = 0.0
+        
+    def start(self):
+        """开始监测"""
+        self.enabled = True
+        self._last_tick = time.perf_counter()
+        self._timer.start(self.HEARTBEAT_MS)
+        
+    def _on_heartbeat(self):
+        now = time.perf_counter()
+        blocked = max((now - self._last_tick) * 1000 - self.HEARTBEAT_MS, 0.0)
+        self._last_tick = now
+        self.frame_count += 1
+        self.total_blocked += blocked
+        self.max_blocked = max(self.max_blocked, blocked)
+        if blocked > self.JANK_MS:
+            self.jank_count += 1
+        self.recent_blocked.append(blocked)
+        
+    def record_flush(self, duration):
+        """记录一次合并刷新的耗时（秒）"""
+        if not self.enabled:
+            return
+        duration *= 1000
+        self.flush_count += 1
+        self.total_flush += duration
+        self.max_flush = max(self.max_flush, duration)
+        
+    def recent_percentile(self, percent):
+        """最近若干帧阻塞时间的分位数（毫秒）"""
+        if not self.recent_blocked:
+            return 0.0
+        values = sorted(self.recent_blocked)
+        return values[min(int(len(values) * percent / 100), len(values) - 1)]
+        
+    def summary(self):
+        """状态栏显示的简要信息"""
+        return f'帧阻塞 p95 {self.recent_percentile(95):.0f} ms / 最长 {self.max_blocked:.0f} ms'
+        
+    def report(self, stream=None):
+        """输出界面响应报告"""
+        if not self.enabled:
+            return
+        stream = stream or sys.stderr
+        average_blocked = self.total_blocked / self.frame_count if self.frame_count else 0.0
+        average_flush = self.total_flush / self.flush_count if self.flush_count else 0.0
+        stream.write('界面响应报告:\n')
+        stream.write(f'  心跳帧数 {self.frame_count}, 平均阻塞 {average_blocked:.1f} ms, '
+                     f'最近p95 {self.recent_percentile(95):.1f} ms, 最长阻塞 {self.max_blocked:.1f} ms, '
+                     f'超过{self.JANK_MS}ms {self.jank_count} 次\n')
+        stream.write(f'  合并刷新 {self.flush_count} 次, 平均耗时 {average_flush:.1f} ms, '
+                     f'最长 {self.max_flush:.1f} ms\n')
+        stream.flush()
+
+class UiUpdateScheduler(QObject):
+    """界面更新合并器
+    
+    加载进度、状态栏文本、表格追加行等更新先按键登记，同一键只保留最新的回调，
+    再以不超过MAX_RATE的频率统一执行，避免每个信号都单独触发重绘。
+    """
+    MAX_RATE = 20  # 每秒最多刷新次数
+    
+    def __init__(self, parent=None, monitor=None):
+        super().__init__(parent)
+        self.monitor = monitor
+        self._pending = OrderedDict()  # 键 -> 回调
+        self._last_flush = 0.0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        
+    def schedule(self, key, callback):
+        """登记一个更新，同一键重复登记时只保留最新的回调"""
+        self._pending[key] = callback
+        if not self._timer.isActive():
+            wait = self._last_flush + 1.0 / self.MAX_RATE - time.perf_counter()
+            self._timer.start(max(int(wait * 1000), 0))
+            
+    def flush(self):
+        """立即执行所有已登记的更新"""
+        self._timer.stop()
+        start = time.perf_counter()
+        while self._pending:
+            _, callback = self._pending.popitem(last=False)
+            callback()
+        self._last_flush = time.perf_counter()
+        if self.monitor is not None:
+            self.monitor.record_flush(self._last_flush - start)
 
 class DataSeek(QMainWindow):
+    COPY_MAX_CELLS = 5000000  # 直接复制到剪贴板的最大单元格数，超过时建议保存到文件
+    SEARCH_LIMIT_DEFAULT = 10000  # 默认每次搜索最多取出的匹配行数，0表示不限制
+    
     def __init__(self):
         super().__init__()
         self.dfs = {}  # 存储多个pandas DataFrame，键为文件路径
@@ -380,11 +912,22 @@ class DataSeek(QMainWindow):
         self.settings = QSettings('DataSeek', 'Settings')
         self.last_search_results = []  # 存储最近一次搜索的结果
         self.last_search_text = ""  # 存储最近一次搜索的文本
+        self.search_limit = self.settings.value('search_limit', self.SEARCH_LIMIT_DEFAULT, type=int)
+        self.search_cursor = None  # 达到结果上限时保存的搜索位置，用于加载更多
         self.loader_threads = []  # 存储文件加载线程
         self.progress_dialog = None  # 进度对话框
-        
-        # 创建数据管理器
-        self.data_manager = ChunkedDataManager()
+        self.export_worker = None  # 后台导出线程
+        self.copy_worker = None  # 后台复制线程
+        self.profile_workers = set()  # 运行中的列概况统计线程
+        self.index_workers = {}  # (文件路径, 数据版本, 缓存键) -> 运行中的索引建立线程
+        self.key_columns = self.settings.value('key_columns', [], type=list) or []  # 关联键列名，对所有文件生效
+        self.profile_dialog = None  # 列概况面板
+        self.profile_dialog_key = None  # 面板当前显示的 (文件路径, 列名, 数据版本)
+        self._process = None  # 缓存的psutil进程对象
+        self.warmup_thread = None  # 后台预导入线程
+        self._data_manager = None  # 数据管理器，首次使用时创建
+        self.frame_monitor = FrameMonitor(self)  # GUI线程阻塞监测
+        self.ui_scheduler = UiUpdateScheduler(self, monitor=self.frame_monitor)  # 界面更新合并器
         
         # 初始化低内存模式设置
         self.low_memory_mode = self.settings.value("low_memory_mode", False, type=bool)
@@ -394,6 +937,28 @@ class DataSeek(QMainWindow):
         # 启用拖放功能
         self.setAcceptDrops(True)
 
+    @property
+    def preview_table(self):
+        """当前显示的结果分组表格；选中汇总且有多个分组时为None"""
+        active_views = self.result_views[:self.active_result_views]
+        widget = self.result_tabs.currentWidget()
+        if widget in active_views:
+            return widget
+        return active_views[0] if len(active_views) == 1 else None
+
+    @property
+    def preview_model(self):
+        """当前显示的结果分组的数据模型"""
+        table_view = self.preview_table
+        return None if table_view is None else table_view.model()
+
+    @property
+    def data_manager(self):
+        """分块数据管理器（首次访问时才导入核心引擎）"""
+        if self._data_manager is None:
+            self._data_manager = engine.ChunkedDataManager()
+        return self._data_manager
+
     def init_ui(self):
         # 设置窗口标题和大小
         self.setWindowTitle('数探')
@@ -469,10 +1034,22 @@ class DataSeek(QMainWindow):
         self.search_input.returnPressed.connect(self.search_tables)
         search_button = QPushButton('搜索')
         search_button.clicked.connect(self.search_tables)
+        bulk_lookup_button = QPushButton('批量查找')
+        bulk_lookup_button.setToolTip('粘贴或导入一批值，一次扫描查出每个值所在的行')
+        bulk_lookup_button.clicked.connect(self.show_bulk_lookup_dialog)
+        filter_button = QPushButton('筛选')
+        filter_button.setToolTip('按搜索条件直接筛选下方表格的行，可多次叠加')
+        filter_button.clicked.connect(self.apply_table_filter)
+        count_button = QPushButton('统计')
+        count_button.setToolTip('只统计各文件、各列的匹配数量，并可对匹配行的数值列求和，不取出匹配行')
+        count_button.clicked.connect(self.count_search_matches)
         
         search_input_layout.addWidget(QLabel('搜索:'))
         search_input_layout.addWidget(self.search_input, 1)
         search_input_layout.addWidget(search_button)
+        search_input_layout.addWidget(filter_button)
+        search_input_layout.addWidget(count_button)
+        search_input_layout.addWidget(bulk_lookup_button)
         search_layout.addLayout(search_input_layout)
         
         # 高级搜索选项
@@ -482,15 +1059,21 @@ class DataSeek(QMainWindow):
         # 搜索模式选项
         search_mode_layout = QHBoxLayout()
         self.search_mode = QComboBox()
-        self.search_mode.addItems(['全局搜索', '按列搜索'])
+        self.search_mode.addItems(['全局搜索', '按列搜索', '多列搜索'])
         self.search_mode.currentIndexChanged.connect(self.toggle_column_selection)
         self.column_selector = QComboBox()
         self.column_selector.setEnabled(False)
+        # 多列搜索的列范围，按列名对所有文件生效
+        self.scope_columns = []
+        self.scope_button = QPushButton('选择列...')
+        self.scope_button.setEnabled(False)
+        self.scope_button.clicked.connect(self.show_column_scope_dialog)
         
         search_mode_layout.addWidget(QLabel('搜索模式:'))
         search_mode_layout.addWidget(self.search_mode)
         search_mode_layout.addWidget(QLabel('列:'))
         search_mode_layout.addWidget(self.column_selector)
+        search_mode_layout.addWidget(self.scope_button)
         search_mode_layout.addStretch(1)
         advanced_layout.addLayout(search_mode_layout)
         
@@ -500,11 +1083,39 @@ class DataSeek(QMainWindow):
         self.case_sensitive = QCheckBox('区分大小写')
         self.whole_word = QCheckBox('整词匹配')
         self.regex_match = QCheckBox('正则表达式')
+        self.fuzzy_match = QCheckBox('模糊匹配')
+        self.fuzzy_match.setToolTip('按编辑距离匹配整个单元格，可找到有错别字的姓名、公司名等')
+        self.fuzzy_threshold = QDoubleSpinBox()
+        self.fuzzy_threshold.setRange(0.5, 1.0)
+        self.fuzzy_threshold.setSingleStep(0.05)
+        self.fuzzy_threshold.setValue(FUZZY_DEFAULT_THRESHOLD)
+        self.fuzzy_threshold.setToolTip('相似度阈值：1 - 编辑距离 / 较长文本的长度')
+        self.fuzzy_threshold.setEnabled(False)
+        self.fuzzy_match.toggled.connect(self.fuzzy_threshold.setEnabled)
+        self.normalize_match = QCheckBox('标准化')
+        self.normalize_match.setToolTip('忽略全角/半角、繁简体（需安装opencc）和多余空白的差异，'
+                                        '各文件的标准化列在后台生成一次后反复使用')
+        self.pinyin_match = QCheckBox('拼音')
+        self.pinyin_match.setToolTip('按拼音匹配汉字，如用 zhangsan 搜索“张三”（需安装pypinyin）')
+        self.pinyin_match.setEnabled(False)
+        self.normalize_match.toggled.connect(self.pinyin_match.setEnabled)
+        self.normalize_match.toggled.connect(lambda: self.prepare_indexes())
+        self.pinyin_match.toggled.connect(self.on_pinyin_match_toggled)
+        self.range_match = QCheckBox('范围查询')
+        self.range_match.setToolTip('按数值或日期范围查询数值列、日期列，例如：\n'
+                                    '1000..5000、>=1000 <5000、..5000\n'
+                                    '2025-Q3、2025-07、2025-07-01~2025-07-31、>2025')
         
         match_options_layout.addWidget(self.exact_match)
         match_options_layout.addWidget(self.case_sensitive)
         match_options_layout.addWidget(self.whole_word)
         match_options_layout.addWidget(self.regex_match)
+        match_options_layout.addWidget(self.fuzzy_match)
+        match_options_layout.addWidget(QLabel('相似度:'))
+        match_options_layout.addWidget(self.fuzzy_threshold)
+        match_options_layout.addWidget(self.normalize_match)
+        match_options_layout.addWidget(self.pinyin_match)
+        match_options_layout.addWidget(self.range_match)
         match_options_layout.addStretch(1)
         advanced_layout.addLayout(match_options_layout)
         
@@ -525,27 +1136,66 @@ class DataSeek(QMainWindow):
         # 表格区域 - 使用自定义的虚拟化表格
         # 虚拟化表格视图
         self.table_model = VirtualizedDataModel()
+        self.table_model.sort_finished_signal.connect(self.on_sort_finished)
+        self.table_model.filters_changed_signal.connect(self.update_filter_bar)
+        self.table_model.set_key_columns(self.key_columns)
+        
+        # 筛选条件栏，有筛选条件时才显示
+        self.filter_bar = QWidget()
+        filter_bar_layout = QHBoxLayout(self.filter_bar)
+        filter_bar_layout.setContentsMargins(0, 0, 0, 0)
+        self.filter_checkbox = QCheckBox('启用筛选')
+        self.filter_checkbox.setChecked(True)
+        self.filter_checkbox.toggled.connect(self.table_model.set_filter_enabled)
+        self.filter_label = QLabel()
+        undo_filter_button = QPushButton('撤销筛选')
+        undo_filter_button.clicked.connect(self.table_model.remove_last_filter)
+        clear_filter_button = QPushButton('清除筛选')
+        clear_filter_button.clicked.connect(self.table_model.clear_filters)
+        filter_bar_layout.addWidget(self.filter_checkbox)
+        filter_bar_layout.addWidget(self.filter_label, 1)
+        filter_bar_layout.addWidget(undo_filter_button)
+        filter_bar_layout.addWidget(clear_filter_button)
+        self.filter_bar.setVisible(False)
+        search_layout.addWidget(self.filter_bar)
+        
         self.table = QTableView()
         self.table.setModel(self.table_model)
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table.setSortingEnabled(True)
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self.show_context_menu)
+        # 表头右键菜单：查看列概况
+        self.table.horizontalHeader().setContextMenuPolicy(Qt.CustomContextMenu)
+        self.table.horizontalHeader().customContextMenuRequested.connect(self.show_header_context_menu)
         search_layout.addWidget(self.table)
         
         # 预览选项卡
         preview_tab = QWidget()
         preview_layout = QVBoxLayout(preview_tab)
         
-        # 创建预览表格
-        self.preview_model = VirtualizedDataModel()
-        self.preview_table = QTableView()
-        self.preview_table.setModel(self.preview_model)
-        self.preview_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.preview_table.setSortingEnabled(True)
-        self.preview_table.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.preview_table.customContextMenuRequested.connect(self.show_preview_context_menu)
-        preview_layout.addWidget(self.preview_table)
+        # 搜索结果按文件的列结构分组显示：第一个选项卡为汇总，其后每组一个结果表格
+        self.result_tabs = QTabWidget()
+        self.result_views = []  # 结果表格池，分组变化时复用，不销毁
+        self.active_result_views = 0  # 当前显示的分组数
+        self.summary_model = VirtualizedDataModel()
+        self.summary_group_indexes = []  # 汇总表每行对应的分组序号
+        self.summary_table = QTableView()
+        self.summary_table.setModel(self.summary_model)
+        self.summary_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.summary_table.doubleClicked.connect(self.open_result_group)
+        self.result_tabs.addTab(self.summary_table, '汇总')
+        self.load_more_button = QPushButton('加载更多')
+        self.load_more_button.setToolTip('从上次停止的位置继续搜索，再取出一批匹配行')
+        self.load_more_button.clicked.connect(self.load_more_results)
+        self.load_more_button.setVisible(False)
+        self.result_tabs.setCornerWidget(self.load_more_button)
+        preview_layout.addWidget(self.result_tabs)
+        
+        # Ctrl+C 复制选中的全部区域
+        copy_shortcut = QShortcut(QKeySequence.Copy, self.table)
+        copy_shortcut.setContext(Qt.WidgetWithChildrenShortcut)
+        copy_shortcut.activated.connect(lambda: self.copy_selection(False))
         
         # 添加选项卡到主界面
         self.tabs.addTab(search_tab, '搜索')
@@ -563,9 +1213,9 @@ class DataSeek(QMainWindow):
         self.statusBar().addPermanentWidget(self.memory_usage_label)
         self.update_memory_usage()
         
-        # 定时更新内存使用
+        # 定时更新内存使用，与其他界面更新合并刷新
         self.memory_timer = QTimer(self)
-        self.memory_timer.timeout.connect(self.update_memory_usage)
+        self.memory_timer.timeout.connect(lambda: self.ui_scheduler.schedule('memory', self.update_memory_usage))
         self.memory_timer.start(5000)  # 每5秒更新一次
         
     def create_toolbar(self):
@@ -578,6 +1228,15 @@ class DataSeek(QMainWindow):
         export_action.triggered.connect(self.export_results)
         toolbar.addAction(export_action)
         
+        # 工作区快照按钮
+        save_workspace_action = QAction('保存工作区', self)
+        save_workspace_action.triggered.connect(self.save_workspace)
+        toolbar.addAction(save_workspace_action)
+        
+        restore_workspace_action = QAction('恢复工作区', self)
+        restore_workspace_action.triggered.connect(self.restore_workspace)
+        toolbar.addAction(restore_workspace_action)
+        
         # 性能选项按钮
         performance_action = QAction('性能选项', self)
         performance_action.triggered.connect(self.show_performance_options)
@@ -598,21 +1257,7 @@ class DataSeek(QMainWindow):
         )
 
         if file_paths:
-            # 创建进度对话框
-            self.progress_dialog = QProgressDialog('正在加载文件...', '取消', 0, 100, self)
-            self.progress_dialog.setWindowTitle('加载进度')
-            self.progress_dialog.setWindowModality(Qt.WindowModal)
-            self.progress_dialog.setMinimumDuration(0)  # 立即显示
-            self.progress_dialog.setValue(0)
-            self.progress_dialog.setAutoClose(False)
-            self.progress_dialog.canceled.connect(self.cancel_loading)  # 连接取消信号
-            
-            # 加载多个文件时显示总体进度
-            if len(file_paths) > 1:
-                self.progress_dialog.setLabelText(f'正在加载 {len(file_paths)} 个文件 (0/{len(file_paths)})')
-            
-            # 开始加载第一个文件
-            self.load_files_batch(file_paths, 0)
+            self.start_batch_load(file_paths)
     
     def select_folder(self):
         options = QFileDialog.Options()
@@ -631,21 +1276,7 @@ class DataSeek(QMainWindow):
                         file_paths.append(file_path)
             
             if file_paths:
-                # 创建进度对话框
-                self.progress_dialog = QProgressDialog('正在加载文件...', '取消', 0, 100, self)
-                self.progress_dialog.setWindowTitle('加载进度')
-                self.progress_dialog.setWindowModality(Qt.WindowModal)
-                self.progress_dialog.setMinimumDuration(0)  # 立即显示
-                self.progress_dialog.setValue(0)
-                self.progress_dialog.setAutoClose(False)
-                self.progress_dialog.canceled.connect(self.cancel_loading)  # 连接取消信号
-                
-                # 加载多个文件时显示总体进度
-                if len(file_paths) > 1:
-                    self.progress_dialog.setLabelText(f'正在加载 {len(file_paths)} 个文件 (0/{len(file_paths)})')
-                
-                # 开始加载第一个文件
-                self.load_files_batch(file_paths, 0)
+                self.start_batch_load(file_paths)
     
     def clear_files(self):
         """清除所有加载的文件"""
@@ -660,7 +1291,7 @@ class DataSeek(QMainWindow):
         
         # 清空表格模型
         self.table_model.set_dataframe(pd.DataFrame())
-        self.preview_model.set_dataframe(pd.DataFrame())
+        self.clear_search_results()
         
         # 更新状态栏和窗口标题
         self.statusBar().showMessage('已清除所有文件')
@@ -668,16 +1299,131 @@ class DataSeek(QMainWindow):
     
     def switch_file(self, item):
         file_path = item.data(Qt.UserRole)
-        if file_path in self.dfs:
+        if file_path in self.dfs or file_path in self.data_manager.meta_info:
             self.current_file = file_path
             self.display_data(file_path)
             self.statusBar().showMessage(f'当前文件: {os.path.basename(file_path)}')
 
+    def start_import_warmup(self):
+        """窗口显示后在后台导入pandas等重量级模块"""
+        self.warmup_thread = ImportWarmupThread()
+        self.warmup_thread.finished.connect(startup_profiler.report)
+        self.warmup_thread.start()
+
+    def save_workspace(self):
+        """将当前加载的文件保存为工作区快照"""
+        if not self.file_paths:
+            QMessageBox.warning(self, '警告', '没有可保存的文件')
+            return
+        
+        snapshot_dir, _ = QFileDialog.getSaveFileName(
+            self, '保存工作区', self.settings.value('last_workspace', '', type=str),
+            '数探工作区 (*.dsw)'
+        )
+        if not snapshot_dir:
+            return
+        if not snapshot_dir.endswith('.dsw'):
+            snapshot_dir += '.dsw'
+        
+        progress_dialog = QProgressDialog('正在保存工作区...', None, 0, len(self.file_paths), self)
+        progress_dialog.setWindowTitle('保存工作区')
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.setValue(0)
+        
+        try:
+            saved_count = workspace.WorkspaceSnapshot.save(snapshot_dir, self.data_manager, self.file_paths,
+                                                 progress_callback=progress_dialog.setValue)
+            self.settings.setValue('last_workspace', snapshot_dir)
+            self.statusBar().showMessage(f'已保存工作区: {os.path.basename(snapshot_dir)} ({saved_count}个文件)')
+        except Exception as e:
+            QMessageBox.critical(self, '错误', f'保存工作区失败：{str(e)}')
+        finally:
+            progress_dialog.close()
+        
+        # 保存时访问过的文件可能发现源文件已变更
+        self.reload_stale_files()
+    
+    def restore_workspace(self):
+        """从工作区快照恢复文件列表，文件数据在访问时才映射"""
+        snapshot_dir = QFileDialog.getExistingDirectory(
+            self, '选择工作区 (*.dsw)', self.settings.value('last_workspace', '', type=str)
+        )
+        if not snapshot_dir:
+            return
+        
+        try:
+            start_time = datetime.datetime.now()
+            entries = workspace.WorkspaceSnapshot.load(snapshot_dir)
+            
+            self.clear_files()
+            for entry in entries:
+                self.data_manager.add_snapshot_entry(entry)
+                self.file_paths.append(entry.file_path)
+                item = QListWidgetItem(os.path.basename(entry.file_path))
+                item.setData(Qt.UserRole, entry.file_path)
+                self.file_list_widget.addItem(item)
+            
+            if self.file_paths:
+                self.current_file = self.file_paths[0]
+                self.update_column_selector(self.current_file)
+                self.display_data(self.current_file)
+            
+            self.settings.setValue('last_workspace', snapshot_dir)
+            elapsed_time = (datetime.datetime.now() - start_time).total_seconds()
+            self.statusBar().showMessage(f'已恢复工作区: {len(entries)}个文件 (耗时: {elapsed_time:.2f}秒)')
+        except Exception as e:
+            QMessageBox.critical(self, '错误', f'恢复工作区失败：{str(e)}')
+    
+    def reload_stale_files(self):
+        """重新加载快照中源文件已变更的文件"""
+        stale_files = self.data_manager.pop_stale_files()
+        if not stale_files:
+            return
+        
+        for file_path in stale_files:
+            if file_path in self.file_paths:
+                self.file_paths.remove(file_path)
+            for row in range(self.file_list_widget.count()):
+                if self.file_list_widget.item(row).data(Qt.UserRole) == file_path:
+                    self.file_list_widget.takeItem(row)
+                    break
+        
+        self.statusBar().showMessage(f'{len(stale_files)}个文件的源文件已变更，正在重新加载')
+        self.start_batch_load(stale_files)
+    
+    def start_batch_load(self, file_paths):
+        """显示进度对话框并开始批量加载文件"""
+        # 创建进度对话框
+        self.progress_dialog = QProgressDialog('正在加载文件...', '取消', 0, 100, self)
+        self.progress_dialog.setWindowTitle('加载进度')
+        # 分块加载时不阻塞窗口，已加载的行可以先浏览
+        self.progress_dialog.setWindowModality(Qt.NonModal if self.low_memory_mode else Qt.WindowModal)
+        self.progress_dialog.setMinimumDuration(0)  # 立即显示
+        self.progress_dialog.setValue(0)
+        self.progress_dialog.setAutoClose(False)
+        self.progress_dialog.canceled.connect(self.cancel_loading)  # 连接取消信号
+
+        # 加载多个文件时显示总体进度
+        if len(file_paths) > 1:
+            self.progress_dialog.setLabelText(f'正在加载 {len(file_paths)} 个文件 (0/{len(file_paths)})')
+
+        # 开始加载第一个文件
+        self.load_files_batch(file_paths, 0)
+
+    def cancel_loading(self):
+        """取消正在进行的文件加载"""
+        for loader_thread in self.loader_threads:
+            if loader_thread.isRunning():
+                loader_thread.cancel()
+        self.statusBar().showMessage('文件加载已取消')
+
     def load_files_batch(self, file_paths, current_index):
         """批量加载文件，一次加载一个"""
         try:
             if current_index >= len(file_paths):
-                # 所有文件加载完成
+                # 所有文件加载完成，先执行尚未刷新的界面更新
+                self.ui_scheduler.flush()
                 if self.progress_dialog:
                     self.progress_dialog.close()
                     self.progress_dialog = None
@@ -721,7 +1467,8 @@ class DataSeek(QMainWindow):
             
             # 连接信号
             loader_thread.progress_signal.connect(self.update_load_progress)
-            loader_thread.chunk_loaded_signal.connect(self.on_chunk_loaded)
+            loader_thread.chunk_loaded_signal.connect(
+                lambda fp, chunk, is_last: self.on_chunk_loaded(fp, chunk, is_last, file_paths, current_index))
             loader_thread.finished_signal.connect(lambda fp, df: self.on_file_loaded(fp, df, file_paths, current_index))
             loader_thread.error_signal.connect(lambda fp, err: self.on_file_error(fp, err, file_paths, current_index))
             
@@ -733,12 +1480,17 @@ class DataSeek(QMainWindow):
             
     @pyqtSlot(int)
     def update_load_progress(self, value):
-        """更新加载进度"""
-        if self.progress_dialog and not self.progress_dialog.wasCanceled():
-            self.progress_dialog.setValue(value)
+        """更新加载进度，合并刷新时只显示最新的进度"""
+        def apply_progress():
+            if self.progress_dialog and not self.progress_dialog.wasCanceled():
+                self.progress_dialog.setValue(value)
+        self.ui_scheduler.schedule('progress', apply_progress)
+    
+    def show_status(self, message):
+        """合并刷新状态栏文本，用于加载过程中频繁变化的消息"""
+        self.ui_scheduler.schedule('status', lambda: self.statusBar().showMessage(message))
     
-    @pyqtSlot(str, object, bool)
-    def on_chunk_loaded(self, file_path, chunk_df, is_last_chunk):
+    def on_chunk_loaded(self, file_path, chunk_df, is_last_chunk, file_paths=None, current_index=0):
         """数据块加载完成的回调"""
         try:
             # 将数据块添加到数据管理器
@@ -758,21 +1510,33 @@ class DataSeek(QMainWindow):
                     self.update_column_selector(file_path)
                     # 显示数据
                     self.display_data(file_path)
-            
-            # 如果是当前文件，更新显示
-            if file_path == self.current_file:
-                self.display_data(file_path)
+            elif file_path == self.current_file:
+                # 当前文件只追加新行，不重新合并数据，滚动位置和选中项保持不变；
+                # 多个数据块在下一次合并刷新时一起插入
+                self.table_model.queue_chunk(chunk_df)
+                self.ui_scheduler.schedule('rows', self.table_model.flush_pending_chunks)
+                self.ui_scheduler.schedule('title', lambda: self.setWindowTitle(
+                    f'数探 - {os.path.basename(file_path)} ({self.table_model.rowCount()}行)'))
+            
+            if is_last_chunk and file_path == self.current_file:
+                # 用合并后的完整数据替换模型中的数据块
+                self.table_model.finish_chunks(self.data_manager.full_data.get(file_path))
                 
             # 更新状态栏
             if is_last_chunk:
                 total_rows = self.data_manager.get_row_count(file_path)
-                self.statusBar().showMessage(f'已加载文件: {os.path.basename(file_path)} ({total_rows}行)')
+                self.show_status(f'已加载文件: {os.path.basename(file_path)} ({total_rows}行)')
+                self.prepare_indexes([file_path])
             else:
                 loaded_rows = self.data_manager.get_row_count(file_path)
-                self.statusBar().showMessage(f'正在加载: {os.path.basename(file_path)} ({loaded_rows}行已加载)')
+                self.show_status(f'正在加载: {os.path.basename(file_path)} ({loaded_rows}行已加载)')
                 
         except Exception as e:
             QMessageBox.critical(self, '错误', f'处理数据块时发生错误：{str(e)}')
+        
+        if is_last_chunk and file_paths is not None:
+            # 加载下一个文件
+            self.load_files_batch(file_paths, current_index + 1)
             
     @pyqtSlot(str, object)
     def on_file_loaded(self, file_path, df, file_paths, current_index):
@@ -786,13 +1550,7 @@ class DataSeek(QMainWindow):
             
             # 也添加到数据管理器
             if file_path not in self.data_manager.full_data:
-                self.data_manager.full_data[file_path] = df
-                
-                # 更新元数据
-                self.data_manager.meta_info[file_path] = {
-                    'columns': [str(col) for col in df.columns],
-                    'total_rows': len(df)
-                }
+                self.data_manager.add_dataframe(file_path, df)
             
             # 如果文件路径不在列表中，添加
             if file_path not in self.file_paths:
@@ -808,8 +1566,12 @@ class DataSeek(QMainWindow):
                 self.update_column_selector(file_path)
                 # 显示数据
                 self.display_data(file_path)
+            elif file_path == self.current_file:
+                # 重新加载的当前文件
+                self.display_data(file_path)
             
             self.statusBar().showMessage(f'已加载文件: {os.path.basename(file_path)} ({len(df)}行)')
+            self.prepare_indexes([file_path])
             
             # 加载下一个文件
             self.load_files_batch(file_paths, current_index + 1)
@@ -845,6 +1607,15 @@ class DataSeek(QMainWindow):
             if file_path is None or (file_path not in self.dfs and file_path not in self.data_manager.meta_info):
                 return
 
+            # 仍在分块加载的文件直接按块显示，不合并数据
+            chunks = self.data_manager.get_chunks(file_path)
+            if chunks:
+                self.table_model.set_chunks(chunks)
+                autosize_columns(self.table)
+                self.setWindowTitle(f'数探 - {os.path.basename(file_path)} ({self.table_model.rowCount()}行)')
+                self.clear_search_results()
+                return
+            
             # 优先从数据管理器获取数据
             df = self.data_manager.get_dataframe(file_path)
             
@@ -852,6 +1623,11 @@ class DataSeek(QMainWindow):
             if df is None and file_path in self.dfs:
                 df = self.dfs[file_path]
                 
+            if df is None and self.data_manager.stale_files:
+                # 快照中的源文件已变更，改为从源文件重新加载
+                self.reload_stale_files()
+                return
+                
             if df is None:
                 # 如果仍然没有获取到数据，仅更新表头
                 columns = self.data_manager.get_columns(file_path)
@@ -864,141 +1640,578 @@ class DataSeek(QMainWindow):
             # 更新虚拟化表格模型
             self.table_model.set_dataframe(df)
             
-            # 调整列宽以适应内容
-            self.table.resizeColumnsToContents()
+            # 按抽样估算列宽，避免测量全部单元格
+            autosize_columns(self.table)
             
             # 更新窗口标题
             row_count = len(df) if df is not None else self.data_manager.get_row_count(file_path)
             self.setWindowTitle(f'数探 - {os.path.basename(file_path)} ({row_count}行)')
             
             # 清空预览表格
-            self.preview_model.set_dataframe(pd.DataFrame())
+            self.clear_search_results()
             
         except Exception as e:
             QMessageBox.critical(self, '错误', f'显示数据时发生错误：{str(e)}')
             self.statusBar().showMessage('数据显示失败')
             
     def search_tables(self):
-        """搜索表格数据"""
-        try:
-            search_text = self.search_input.text().strip()
-            if not search_text:
-                return
+        """搜索表格数据，设置了结果上限时找够即停止，其余结果可加载更多"""
+        search_text = self.search_input.text().strip()
+        if not search_text:
+            return
 
-            # 获取搜索选项
-            options = {
-                'exact_match': self.exact_match.isChecked(),
-                'case_sensitive': self.case_sensitive.isChecked(),
-                'whole_word': self.whole_word.isChecked(),
-                'regex_match': self.regex_match.isChecked(),
-                'search_mode': self.search_mode.currentText(),
-                'column': self.column_selector.currentText() if self.column_selector.isEnabled() else None
-            }
+        # 获取搜索选项
+        options = self.current_search_options()
+        if not self.check_search_options(search_text, options):
+            return
 
-            # 存储搜索结果
-            match_results = []
-            total_matches = 0
+        cursor = {
+            'search_text': search_text,
+            'options': options,
+            'file_paths': self.search_order(),
+            'file_index': 0,  # 下一个要搜索的文件
+            'start': 0,  # 在该文件中继续搜索的行号
+            'version': None  # 该文件搜索时的数据版本
+        }
+        self.run_search(cursor, [])
+
+        # 保存搜索历史
+        self.add_to_history(search_text, options)
+
+    def load_more_results(self):
+        """从保存的搜索位置继续搜索，结果追加到当前结果之后"""
+        cursor = self.search_cursor
+        if cursor is None:
+            return
+        file_path = cursor['file_paths'][cursor['file_index']]
+        if cursor['version'] is not None and cursor['version'] != self.data_manager.data_version(file_path):
+            QMessageBox.warning(self, '警告', f'{os.path.basename(file_path)} 的数据已变更，请重新搜索')
+            return
+        self.run_search(dict(cursor), self.last_search_results)
+
+    def search_order(self):
+        """搜索文件的优先顺序：当前显示的文件优先，其余按加载顺序"""
+        if self.current_file in self.file_paths:
+            return [self.current_file] + [path for path in self.file_paths if path != self.current_file]
+        return list(self.file_paths)
+
+    def run_search(self, cursor, hits):
+        """从搜索位置开始逐个文件搜索，找到结果上限个匹配行即停止
+
+        hits 为已取出的行级匹配记录 [(文件路径, DataFrame, 行号数组, 匹配列位图)]，新结果追加在其后；
+        还有未搜索的部分时保存下一次继续的位置。
+        """
+        try:
+            search_text, options = cursor['search_text'], cursor['options']
+            file_paths = cursor['file_paths']
+            limit = self.search_limit
+            hits = list(hits)
+            found = 0
 
             # 创建进度对话框
-            progress_dialog = QProgressDialog('正在搜索...', '取消', 0, len(self.file_paths), self)
+            progress_dialog = QProgressDialog('正在搜索...', '取消', 0, len(file_paths), self)
             progress_dialog.setWindowTitle('搜索进度')
             progress_dialog.setWindowModality(Qt.WindowModal)
             progress_dialog.setMinimumDuration(0)
-            progress_dialog.setValue(0)
+            progress_dialog.setValue(cursor['file_index'])
 
             # 开始搜索定时器
             start_time = datetime.datetime.now()
 
-            # 遍历所有加载的数据
-            for i, file_path in enumerate(self.file_paths):
-                if progress_dialog.wasCanceled():
+            next_cursor = None
+            for i in range(cursor['file_index'], len(file_paths)):
+                file_path = file_paths[i]
+                start = cursor['start'] if i == cursor['file_index'] else 0
+                if progress_dialog.wasCanceled() or (limit and found >= limit):
+                    # 取消或已找够结果时，下次从这个文件继续
+                    next_cursor = dict(cursor, file_index=i, start=start,
+                                       version=self.data_manager.data_version(file_path))
                     break
-                    
+
                 progress_dialog.setValue(i)
                 progress_dialog.setLabelText(f'正在搜索: {os.path.basename(file_path)}')
-                
+
                 try:
                     # 优先从数据管理器获取数据
                     df = self.data_manager.get_dataframe(file_path)
-                    
+
                     # 如果数据管理器没有完整数据，则从dfs中获取
                     if df is None and file_path in self.dfs:
                         df = self.dfs[file_path]
-                        
+
                     if df is None:
                         # 文件尚未完全加载，跳过
                         continue
-                    
-                    # 根据搜索模式选择搜索方法
-                    file_matches = self.search_in_dataframe(df, search_text, options)
-                    
-                    # 将匹配结果添加到结果列表
-                    for match in file_matches:
-                        match_results.append({
-                            'file': file_path,
-                            'columns': match
-                        })
-                        total_matches += 1
+
+                    # 每个匹配行只记录一次：行号和匹配列的位图
+                    # 已统计过概况的列可据此跳过不可能匹配的列，模糊匹配索引和标准化列在多次搜索间复用
+                    profiles = self.data_manager.cached_profiles(file_path)
+                    index_cache = self.data_manager.index_cache(file_path)
+                    if limit:
+                        rows, matched, start = engine.search_hits_limited(df, search_text, options, limit - found,
+                                                                          start, profiles=profiles,
+                                                                          index_cache=index_cache)
+                    else:
+                        rows, matched = engine.search_hits(df, search_text, options,
+                                                           profiles=profiles, index_cache=index_cache)
+                        start = None
+                    if len(rows):
+                        if hits and hits[-1][0] == file_path:
+                            # 继续搜索同一文件时合并为一项
+                            _, _, previous_rows, previous_matched = hits[-1]
+                            hits[-1] = (file_path, df, np.concatenate([previous_rows, rows]),
+                                        np.concatenate([previous_matched, matched]))
+                        else:
+                            hits.append((file_path, df, rows, matched))
+                        found += len(rows)
+                    if start is not None:
+                        next_cursor = dict(cursor, file_index=i, start=start,
+                                           version=self.data_manager.data_version(file_path))
+                        break
                 except Exception as e:
                     QMessageBox.warning(self, '警告', f'搜索文件 {os.path.basename(file_path)} 时发生错误：{str(e)}')
                     continue
 
             progress_dialog.close()
 
+            # 搜索时发现源文件已变更的快照文件需重新加载
+            self.reload_stale_files()
+
             # 计算搜索耗时
             elapsed_time = (datetime.datetime.now() - start_time).total_seconds()
 
-            # 更新搜索预览
-            self.update_search_preview(search_text, match_results)
+            # 更新搜索预览，匹配的单元格高亮显示
+            self.last_search_text = search_text
+            self.last_search_results = hits
+            self.show_search_results(engine.schema_result_frames(hits))
+            self.search_cursor = next_cursor
+            self.load_more_button.setVisible(next_cursor is not None)
 
-            # 保存搜索历史
-            self.add_to_history(search_text, options)
-            
             # 更新状态栏
-            if match_results:
-                self.statusBar().showMessage(f'找到 {total_matches} 个匹配项 (搜索耗时: {elapsed_time:.2f}秒)')
+            total_matches = sum(len(rows) for _, _, rows, _ in hits)
+            if next_cursor is not None:
+                self.statusBar().showMessage(f'已取出 {total_matches} 个匹配行，还有未搜索的部分，'
+                                             f'可点击“加载更多”继续 (搜索耗时: {elapsed_time:.2f}秒)')
+            elif total_matches:
+                self.statusBar().showMessage(f'找到 {total_matches} 个匹配行 (搜索耗时: {elapsed_time:.2f}秒)')
             else:
                 self.statusBar().showMessage(f'未找到匹配项 (搜索耗时: {elapsed_time:.2f}秒)')
         except Exception as e:
             QMessageBox.critical(self, '错误', f'搜索时发生错误：{str(e)}')
             self.statusBar().showMessage('搜索失败')
+
+    def check_search_options(self, search_text, options):
+        """检查搜索条件是否可用，不可用时提示并返回False"""
+        if options['columns'] is not None and not options['columns']:
+            QMessageBox.warning(self, '警告', '请先选择多列搜索的列')
+            return False
+        if options['range_match'] and engine.parse_range_query(search_text) is None:
+            QMessageBox.warning(self, '警告', f'无法解析范围条件：{search_text}')
+            return False
+        return True
+
+    def count_search_matches(self):
+        """统计模式：直接由匹配掩码得出各文件、各列的匹配数量，不取出匹配行"""
+        search_text = self.search_input.text().strip()
+        if not search_text:
+            return
+        options = self.current_search_options()
+        if not self.check_search_options(search_text, options):
+            return
+        
+        try:
+            progress_dialog = QProgressDialog('正在统计...', '取消', 0, len(self.file_paths), self)
+            progress_dialog.setWindowTitle('统计进度')
+            progress_dialog.setWindowModality(Qt.WindowModal)
+            progress_dialog.setMinimumDuration(0)
+            start_time = time.perf_counter()
             
-    def update_search_preview(self, search_text, match_results):
-        """更新搜索预览"""
+            # 每个文件只保留行级匹配掩码，供之后对数值列汇总
+            masks = []  # [(文件路径, DataFrame, 行级匹配掩码)]
+            count_rows = []
+            for i, file_path in enumerate(self.file_paths):
+                if progress_dialog.wasCanceled():
+                    break
+                progress_dialog.setValue(i)
+                progress_dialog.setLabelText(f'正在统计: {os.path.basename(file_path)}')
+                df = self.data_manager.get_dataframe(file_path)
+                if df is None and file_path in self.dfs:
+                    df = self.dfs[file_path]
+                if df is None:
+                    continue
+                mask, counts = engine.count_matches(df, search_text, options,
+                                                    profiles=self.data_manager.cached_profiles(file_path),
+                                                    index_cache=self.data_manager.index_cache(file_path))
+                masks.append((file_path, df, mask))
+                file_name = os.path.basename(file_path)
+                count_rows.append({'文件名': file_name, '列': '（匹配行数）', '匹配数': int(np.count_nonzero(mask))})
+                count_rows.extend({'文件名': file_name, '列': str(col), '匹配数': count}
+                                  for col, count in counts.items())
+            progress_dialog.close()
+            self.reload_stale_files()
+            elapsed_time = time.perf_counter() - start_time
+            
+            self.add_to_history(search_text, options)
+            total_rows = sum(int(np.count_nonzero(mask)) for _, _, mask in masks)
+            self.statusBar().showMessage(f'统计完成: 共 {total_rows} 行匹配 (耗时: {elapsed_time:.2f}秒)')
+            self.show_match_statistics(search_text, pd.DataFrame(count_rows, columns=['文件名', '列', '匹配数']),
+                                       masks, total_rows, elapsed_time)
+        except Exception as e:
+            QMessageBox.critical(self, '错误', f'统计时发生错误：{str(e)}')
+            self.statusBar().showMessage('统计失败')
+
+    def show_match_statistics(self, search_text, counts, masks, total_rows, elapsed_time):
+        """显示统计结果；选择数值列后按匹配掩码汇总合计、最小/最大值和平均值"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f'统计: {search_text}')
+        dialog.setMinimumSize(480, 520)
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel(f'共 {total_rows} 行匹配，涉及 {len(masks)} 个文件 (耗时: {elapsed_time:.2f}秒)'))
+        
+        counts_model = VirtualizedDataModel()
+        counts_model.set_dataframe(counts)
+        counts_table = QTableView()
+        counts_table.setModel(counts_model)
+        counts_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        layout.addWidget(counts_table, 1)
+        autosize_columns(counts_table)
+        
+        # 所有文件的列名，按首次出现的顺序
+        column_names = list(dict.fromkeys(str(col) for _, df, _ in masks for col in df.columns))
+        aggregate_layout = QHBoxLayout()
+        aggregate_selector = QComboBox()
+        aggregate_selector.addItem('（选择数值列）')
+        aggregate_selector.addItems(column_names)
+        aggregate_layout.addWidget(QLabel('汇总列:'))
+        aggregate_layout.addWidget(aggregate_selector, 1)
+        layout.addLayout(aggregate_layout)
+        aggregate_text = QTextEdit()
+        aggregate_text.setReadOnly(True)
+        aggregate_text.setMaximumHeight(140)
+        layout.addWidget(aggregate_text)
+        
+        def format_number(value):
+            return '-' if value is None else f'{value:,.2f}'
+        
+        def format_aggregate(name, aggregate):
+            return (f"{name}: {aggregate['count']} 个值，合计 {format_number(aggregate['sum'])}，"
+                    f"最小 {format_number(aggregate['min'])}，最大 {format_number(aggregate['max'])}，"
+                    f"平均 {format_number(aggregate['mean'])}")
+        
+        def update_aggregate(index):
+            if index <= 0:
+                aggregate_text.clear()
+                return
+            column_name = aggregate_selector.currentText()
+            lines, aggregates = [], []
+            for file_path, df, mask in masks:
+                columns = [str(col) for col in df.columns]
+                if column_name not in columns:
+                    continue
+                aggregate = engine.aggregate_values(df.iloc[:, columns.index(column_name)], mask)
+                if aggregate is None:
+                    lines.append(f'{os.path.basename(file_path)}: 不是数值列')
+                    continue
+                aggregates.append(aggregate)
+                lines.append(format_aggregate(os.path.basename(file_path), aggregate))
+            combined = engine.combine_aggregates(aggregates)
+            if combined is not None and len(aggregates) > 1:
+                lines.append(format_aggregate('全部文件', combined))
+            aggregate_text.setPlainText('\n'.join(lines))
+        
+        aggregate_selector.currentIndexChanged.connect(update_aggregate)
+        
+        close_button = QPushButton('关闭')
+        close_button.clicked.connect(dialog.accept)
+        layout.addWidget(close_button, 0, Qt.AlignRight)
+        dialog.exec_()
+
+    def apply_table_filter(self):
+        """按当前搜索条件筛选主表格的行，不复制数据，多次筛选按“且”叠加"""
+        search_text = self.search_input.text().strip()
+        if not search_text:
+            return
+        if self.table_model.source_row_count == 0:
+            self.statusBar().showMessage('当前没有可筛选的数据')
+            return
+        options = self.current_search_options()
+        if not self.check_search_options(search_text, options):
+            return
+        
         try:
-            if not match_results:
-                self.preview_model.set_dataframe(pd.DataFrame())
+            start_time = time.perf_counter()
+            self.table_model.add_filter(search_text, options,
+                                        self.data_manager.cached_profiles(self.current_file))
+            elapsed_time = time.perf_counter() - start_time
+            self.statusBar().showMessage(
+                f'筛选后显示 {self.table_model.rowCount()}/{self.table_model.source_row_count} 行 '
+                f'(耗时: {elapsed_time:.3f}秒)')
+        except Exception as e:
+            QMessageBox.warning(self, '警告', f'筛选失败: {str(e)}')
+    
+    def update_filter_bar(self):
+        """更新筛选条件栏"""
+        filters = self.table_model.filters
+        self.filter_bar.setVisible(bool(filters))
+        if not filters:
+            return
+        
+        descriptions = []
+        for search_text, options in filters:
+            description = f'“{search_text}”'
+            if options.get('column'):
+                description += f'({options["column"]})'
+            descriptions.append(description)
+        self.filter_label.setText(f'筛选: {" 且 ".join(descriptions)}  '
+                                  f'显示 {self.table_model.rowCount()}/{self.table_model.source_row_count} 行')
+        self.filter_checkbox.blockSignals(True)
+        self.filter_checkbox.setChecked(self.table_model.filter_enabled)
+        self.filter_checkbox.blockSignals(False)
+    
+    def on_sort_finished(self, column, elapsed):
+        """后台排序完成"""
+        self.statusBar().showMessage(f'已按“{column}”排序 (耗时: {elapsed:.2f}秒)')
+
+    def current_search_options(self):
+        """读取界面上的搜索选项"""
+        return {
+            'exact_match': self.exact_match.isChecked(),
+            'case_sensitive': self.case_sensitive.isChecked(),
+            'whole_word': self.whole_word.isChecked(),
+            'regex_match': self.regex_match.isChecked(),
+            'fuzzy_match': self.fuzzy_match.isChecked(),
+            'fuzzy_threshold': self.fuzzy_threshold.value(),
+            'normalize': self.normalize_match.isChecked(),
+            'pinyin_match': self.pinyin_match.isChecked(),
+            'range_match': self.range_match.isChecked(),
+            'search_mode': self.search_mode.currentText(),
+            'column': self.column_selector.currentText() if self.column_selector.isEnabled() else None,
+            'columns': list(self.scope_columns) if self.scope_button.isEnabled() else None
+        }
+
+    def on_pinyin_match_toggled(self, checked):
+        """启用拼音匹配时检查pypinyin是否可用"""
+        if checked and not engine.pinyin_available():
+            QMessageBox.warning(self, '警告', '拼音匹配需要安装pypinyin：pip install pypinyin')
+            self.pinyin_match.setChecked(False)
+            return
+        self.prepare_indexes()
+
+    def build_index_in_background(self, file_path, cache_key, build, description):
+        """在后台建立文件的搜索索引，完成后存入索引缓存；已缓存或正在建立时跳过"""
+        key = (file_path, self.data_manager.data_version(file_path), cache_key)
+        if key in self.index_workers or cache_key in self.data_manager.index_cache(file_path):
+            return
+        worker = IndexBuildWorker(key, build)
+        worker.finished_signal.connect(
+            lambda key, index, elapsed: self.on_index_built(key, index, elapsed, description))
+        worker.error_signal.connect(lambda message: self.statusBar().showMessage(f'建立{description}失败: {message}'))
+        worker.finished.connect(lambda: self.index_workers.pop(key, None))
+        self.index_workers[key] = worker
+        worker.start()
+
+    def on_index_built(self, key, index, elapsed, description):
+        """索引建立完成，数据版本未变化时缓存供搜索使用"""
+        file_path, version, cache_key = key
+        self.data_manager.index_cache(file_path, version)[cache_key] = index
+        self.statusBar().showMessage(f'已建立{description}: {os.path.basename(file_path)} (耗时: {elapsed:.2f}秒)')
+
+    def prepare_indexes(self, file_paths=None):
+        """为已加载的文件在后台建立标准化影子列和关联键索引；尚未合并的大文件在使用时再建立"""
+        for file_path in (self.file_paths if file_paths is None else file_paths):
+            df = self.data_manager.full_data.get(file_path)
+            if df is None:
+                continue
+            if self.normalize_match.isChecked():
+                mode = engine.normalization_key(self.current_search_options())
+                self.build_index_in_background(file_path, ('normalized', mode),
+                                               lambda df=df, mode=mode: engine.normalized_frame(df, mode), '标准化列')
+            columns = [str(col) for col in df.columns]
+            for name in self.key_columns:
+                if name in columns:
+                    series = df.iloc[:, columns.index(name)]
+                    self.build_index_in_background(file_path, ('key', series.name),
+                                                   lambda series=series: engine.KeyIndex.from_series(series),
+                                                   f'关联键索引“{name}”')
+
+    def show_bulk_lookup_dialog(self):
+        """显示批量查找对话框"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle('批量查找')
+        dialog.setMinimumSize(400, 450)
+        
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel('每行输入一个查找值（可直接粘贴一列数据）：'))
+        values_edit = QTextEdit()
+        values_edit.setAcceptRichText(False)
+        layout.addWidget(values_edit)
+        
+        count_label = QLabel('共 0 个值')
+        values_edit.textChanged.connect(
+            lambda: count_label.setText(f'共 {len(engine.parse_lookup_values(values_edit.toPlainText()))} 个值'))
+        layout.addWidget(count_label)
+        layout.addWidget(QLabel('单元格内容与查找值完全相同才算匹配；搜索模式、列和“区分大小写”沿用搜索选项。'))
+        
+        def load_values_file():
+            file_path, _ = QFileDialog.getOpenFileName(
+                dialog, '导入查找值', '', '文本或CSV文件 (*.txt *.csv);;All Files (*)')
+            if not file_path:
                 return
+            try:
+                with open(file_path, 'r', encoding='utf-8-sig') as f:
+                    if file_path.endswith('.csv'):
+                        # CSV文件取第一列
+                        text = '\n'.join(row[0] for row in csv.reader(f) if row)
+                    else:
+                        text = f.read()
+                values_edit.setPlainText(text)
+            except Exception as e:
+                QMessageBox.critical(dialog, '错误', f'读取文件失败：{str(e)}')
+        
+        button_layout = QHBoxLayout()
+        load_button = QPushButton('从文件导入')
+        load_button.clicked.connect(load_values_file)
+        run_button = QPushButton('查找')
+        run_button.clicked.connect(dialog.accept)
+        cancel_button = QPushButton('取消')
+        cancel_button.clicked.connect(dialog.reject)
+        button_layout.addWidget(load_button)
+        button_layout.addStretch(1)
+        button_layout.addWidget(run_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+        
+        if dialog.exec_() == QDialog.Accepted:
+            self.run_bulk_lookup(engine.parse_lookup_values(values_edit.toPlainText()))
 
-            # 将匹配结果转换为DataFrame
-            result_data = []
-            
-            # 确定所有列
-            all_columns = set()
-            for result in match_results:
-                all_columns.update(str(k) for k in result['columns'].keys())
-            all_columns = sorted(list(all_columns))
-            
-            # 准备数据
-            for result in match_results:
-                row_data = {'文件名': os.path.basename(result['file'])}
-                # 添加其他列数据
-                for col in all_columns:
-                    row_data[col] = result['columns'].get(col, '')
-                result_data.append(row_data)
-                
-            # 创建DataFrame
-            result_df = pd.DataFrame(result_data)
+    def run_bulk_lookup(self, values):
+        """在所有已加载文件中批量查找，每列只扫描一次"""
+        if not values:
+            return
+        try:
+            options = self.current_search_options()
+            start_time = datetime.datetime.now()
             
-            # 重新排列列，确保"文件名"列在最前面
-            cols = ['文件名'] + [col for col in result_df.columns if col != '文件名']
-            result_df = result_df[cols]
+            frames = []
+            for file_path in self.file_paths:
+                df = self.data_manager.get_dataframe(file_path)
+                if df is None and file_path in self.dfs:
+                    df = self.dfs[file_path]
+                if df is not None:
+                    frames.append((file_path, df))
+            self.reload_stale_files()
             
-            # 设置预览表格模型
-            self.preview_model.set_dataframe(result_df)
+            result = engine.bulk_lookup(frames, values, options)
+            elapsed_time = (datetime.datetime.now() - start_time).total_seconds()
             
-            # 调整列宽以适应内容
-            self.preview_table.resizeColumnsToContents()
+            # 转换为预览结果，“查找值”列放在文件名之后，匹配的单元格高亮显示
+            dfs = dict(frames)
+            hits = []
+            for file_path, col, rows, _ in result.hits:
+                df = dfs[file_path]
+                columns = np.full(len(rows), df.columns.get_loc(col), dtype=np.int32)
+                hits.append((file_path, df, rows, engine.column_bits(columns, len(df.columns))))
+            lookup_values = np.asarray(result.values, dtype=object)
+            key_values = [lookup_values[value_indexes] for _, _, _, value_indexes in result.hits]
+            self.show_search_results(engine.schema_result_frames(
+                hits, {'查找值': np.concatenate(key_values) if key_values else []}))
+            
+            # 不区分大小写时，大小写不同的重复值已合并为一个
+            not_found = result.not_found()
+            value_count = len(result.values)
+            self.statusBar().showMessage(
+                f'批量查找 {value_count} 个值: 找到 {value_count - len(not_found)} 个，'
+                f'共 {result.total_matches()} 个匹配项 (耗时: {elapsed_time:.2f}秒)')
+            if not_found:
+                self.show_not_found_values(not_found, value_count)
+        except Exception as e:
+            QMessageBox.critical(self, '错误', f'批量查找时发生错误：{str(e)}')
+            self.statusBar().showMessage('批量查找失败')
+
+    def show_not_found_values(self, not_found, total):
+        """显示批量查找中未找到的值，便于复制"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle('未找到的值')
+        dialog.setMinimumSize(300, 400)
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel(f'{total} 个查找值中有 {len(not_found)} 个未找到：'))
+        not_found_edit = QTextEdit()
+        not_found_edit.setReadOnly(True)
+        not_found_edit.setPlainText('\n'.join(not_found))
+        layout.addWidget(not_found_edit)
+        close_button = QPushButton('关闭')
+        close_button.clicked.connect(dialog.accept)
+        layout.addWidget(close_button, 0, Qt.AlignRight)
+        dialog.exec_()
+
+    def create_result_view(self):
+        """创建一个结果分组表格"""
+        model = VirtualizedDataModel()
+        model.sort_finished_signal.connect(self.on_sort_finished)
+        model.set_key_columns(self.key_columns)
+        table_view = QTableView()
+        table_view.setModel(model)
+        table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table_view.setSortingEnabled(True)
+        table_view.setContextMenuPolicy(Qt.CustomContextMenu)
+        table_view.customContextMenuRequested.connect(self.show_preview_context_menu)
+        copy_shortcut = QShortcut(QKeySequence.Copy, table_view)
+        copy_shortcut.setContext(Qt.WidgetWithChildrenShortcut)
+        copy_shortcut.activated.connect(lambda: self.copy_selection(True))
+        self.result_views.append(table_view)
+        return table_view
+
+    def clear_search_results(self):
+        """清空所有结果分组和汇总"""
+        while self.result_tabs.count() > 1:
+            self.result_tabs.removeTab(1)
+        for table_view in self.result_views[:self.active_result_views]:
+            table_view.model().set_dataframe(None)
+        self.active_result_views = 0
+        self.summary_model.set_dataframe(None)
+        self.summary_group_indexes = []
+        self.search_cursor = None
+        self.load_more_button.setVisible(False)
+
+    def show_search_results(self, groups):
+        """按文件的列结构分组显示搜索结果，groups 为 engine.schema_result_frames 的返回值"""
+        try:
+            self.clear_search_results()
+            if not groups:
+                return
+
+            summary_rows = []
+            for group_index, (schema, files, frame, matched_bits) in enumerate(groups):
+                if group_index < len(self.result_views):
+                    table_view = self.result_views[group_index]
+                else:
+                    table_view = self.create_result_view()
+                table_view.model().set_dataframe(frame)
+                table_view.model().set_highlights(matched_bits)
+                
+                first_name = os.path.basename(files[0][0])
+                title = first_name if len(files) == 1 else f'{first_name} 等{len(files)}个文件'
+                self.result_tabs.addTab(table_view, f'{title} ({len(frame)})')
+                self.active_result_views = group_index + 1
+                
+                # 按抽样估算列宽，避免测量全部单元格
+                autosize_columns(table_view)
+                
+                for file_path, match_count in files:
+                    summary_rows.append({
+                        '文件名': os.path.basename(file_path),
+                        '结果分组': title,
+                        '列数': len(schema),
+                        '匹配项': match_count,
+                        '路径': file_path
+                    })
+                    self.summary_group_indexes.append(group_index)
+            
+            self.summary_model.set_dataframe(pd.DataFrame(summary_rows))
+            autosize_columns(self.summary_table)
+            
+            # 只有一个分组时直接显示结果，否则先显示汇总
+            self.result_tabs.setCurrentIndex(1 if len(groups) == 1 else 0)
             
             # 切换到预览选项卡
             self.tabs.setCurrentIndex(1)
@@ -1006,54 +2219,28 @@ class DataSeek(QMainWindow):
             QMessageBox.critical(self, '错误', f'更新预览时发生错误：{str(e)}')
             self.statusBar().showMessage('预览更新失败')
 
-    def show_context_menu(self, position):
-        """显示右键菜单"""
-        menu = QMenu()
-        
-        # 获取当前选中的单元格
-        current_item = self.preview_table.itemAt(position)
-        if current_item:
-            copy_cell = QAction('复制单元格内容', self)
-            copy_cell.triggered.connect(self.copy_cell_content)
-            menu.addAction(copy_cell)
-            
-            copy_row = QAction('复制整行内容', self)
-            copy_row.triggered.connect(self.copy_row_content)
-            menu.addAction(copy_row)
-            
-            export_action = QAction('导出搜索结果', self)
-            export_action.triggered.connect(self.export_results)
-            menu.addAction(export_action)
-            
-            menu.exec_(self.preview_table.mapToGlobal(position))
-
-    def copy_cell_content(self):
-        """复制单元格内容"""
-        selected_items = self.preview_table.selectedItems()
-        if selected_items:
-            clipboard = QApplication.clipboard()
-            clipboard.setText(selected_items[0].text())
-
-    def copy_row_content(self):
-        """复制整行内容"""
-        selected_items = self.preview_table.selectedItems()
-        if selected_items:
-            row = selected_items[0].row()
-            row_data = []
-            for col in range(self.preview_table.columnCount()):
-                item = self.preview_table.item(row, col)
-                row_data.append(item.text() if item else '')
-            clipboard = QApplication.clipboard()
-            clipboard.setText('\t'.join(row_data))
+    def open_result_group(self, index):
+        """双击汇总表的一行，切换到对应的结果分组"""
+        if not index.isValid():
+            return
+        group_index = self.summary_group_indexes[self.summary_model.source_row(index.row())]
+        self.result_tabs.setCurrentIndex(group_index + 1)
 
     def export_results(self):
-        """导出搜索结果"""
-        if self.preview_table.rowCount() == 0:
+        """在后台线程中按预览表格当前的排序和筛选分批导出搜索结果"""
+        model = self.preview_model
+        if model is None and self.active_result_views:
+            QMessageBox.warning(self, '警告', '搜索结果分为多个分组，请先选择要导出的分组')
+            return
+        if model is None or model.rowCount() == 0:
             QMessageBox.warning(self, '警告', '没有可导出的数据')
             return
+        if self.export_worker and self.export_worker.isRunning():
+            QMessageBox.warning(self, '警告', '正在导出，请等待当前导出完成')
+            return
 
         # 获取保存文件路径
-        file_path, _ = QFileDialog.getSaveFileName(
+        file_path, selected_filter = QFileDialog.getSaveFileName(
             self,
             '导出搜索结果',
             '',
@@ -1062,38 +2249,155 @@ class DataSeek(QMainWindow):
 
         if not file_path:
             return
+        if not file_path.lower().endswith(('.xlsx', '.csv')):
+            file_path += '.csv' if selected_filter.startswith('CSV') else '.xlsx'
 
-        try:
-            # 准备数据
-            data = []
-            headers = []
-            for col in range(self.preview_table.columnCount()):
-                headers.append(self.preview_table.horizontalHeaderItem(col).text())
-
-            for row in range(self.preview_table.rowCount()):
-                row_data = []
-                for col in range(self.preview_table.columnCount()):
-                    item = self.preview_table.item(row, col)
-                    row_data.append(item.text() if item else '')
-                data.append(row_data)
-
-            # 创建DataFrame
-            df = pd.DataFrame(data, columns=headers)
-
-            # 根据文件扩展名选择导出格式
-            if file_path.endswith('.xlsx'):
-                df.to_excel(file_path, index=False)
-            else:
-                df.to_csv(file_path, index=False, encoding='utf-8-sig')
+        total_rows = model.rowCount()
+        progress_dialog = QProgressDialog('正在导出...', '取消', 0, total_rows, self)
+        progress_dialog.setWindowTitle('导出进度')
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setValue(0)
+
+        # 导出线程只持有数据块和行号数组的引用，不复制数据
+        worker = ExportWorker(file_path, list(model.columns), list(model.chunks), model.row_order)
+        self.export_worker = worker
+
+        def update_progress(written):
+            self.ui_scheduler.schedule('export_progress', lambda: progress_dialog.setValue(written))
 
+        def on_finished(path, written, elapsed):
+            self.ui_scheduler.flush()
+            progress_dialog.close()
+            self.statusBar().showMessage(f'已导出 {written} 行到 {os.path.basename(path)} (耗时: {elapsed:.2f}秒)')
             QMessageBox.information(self, '成功', '数据导出成功！')
 
-        except Exception as e:
-            QMessageBox.critical(self, '错误', f'导出失败：{str(e)}')
+        def on_cancelled(path):
+            progress_dialog.close()
+            self.statusBar().showMessage('导出已取消')
+
+        def on_error(message):
+            progress_dialog.close()
+            QMessageBox.critical(self, '错误', f'导出失败：{message}')
+
+        worker.progress_signal.connect(update_progress)
+        worker.finished_signal.connect(on_finished)
+        worker.cancelled_signal.connect(on_cancelled)
+        worker.error_signal.connect(on_error)
+        progress_dialog.canceled.connect(worker.cancel)
+        worker.start()
 
     def toggle_column_selection(self, index):
         # 根据搜索模式启用或禁用列选择器
         self.column_selector.setEnabled(index == 1)  # 1 表示按列搜索
+        self.scope_button.setEnabled(index == 2)  # 2 表示多列搜索
+    
+    def set_scope_columns(self, columns):
+        """设置多列搜索的列范围"""
+        self.scope_columns = list(columns)
+        self.scope_button.setText(f'已选 {len(self.scope_columns)} 列' if self.scope_columns else '选择列...')
+        self.scope_button.setToolTip('、'.join(self.scope_columns))
+    
+    def show_column_scope_dialog(self):
+        """选择多列搜索的列；选中的列可按当前文件的列结构保存为列集"""
+        columns = self.data_manager.get_columns(self.current_file) if self.current_file else []
+        if not columns:
+            QMessageBox.warning(self, '警告', '请先加载文件')
+            return
+        # 列集按列结构保存：{列结构: {列集名称: [列名]}}
+        schema = '\t'.join(columns)
+        column_sets = self.settings.value('column_sets', {}) or {}
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle('选择搜索的列')
+        dialog.setMinimumSize(320, 460)
+        layout = QVBoxLayout(dialog)
+        
+        set_layout = QHBoxLayout()
+        set_selector = QComboBox()
+        set_layout.addWidget(QLabel('列集:'))
+        set_layout.addWidget(set_selector, 1)
+        layout.addLayout(set_layout)
+        
+        column_list = QListWidget()
+        for name in columns:
+            item = QListWidgetItem(name)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked if name in self.scope_columns else Qt.Unchecked)
+            column_list.addItem(item)
+        layout.addWidget(column_list)
+        
+        def checked_columns():
+            return [column_list.item(i).text() for i in range(column_list.count())
+                    if column_list.item(i).checkState() == Qt.Checked]
+        
+        def set_checked(names):
+            for i in range(column_list.count()):
+                item = column_list.item(i)
+                item.setCheckState(Qt.Checked if item.text() in names else Qt.Unchecked)
+        
+        def refresh_sets():
+            set_selector.blockSignals(True)
+            set_selector.clear()
+            set_selector.addItem('（未选择）')
+            set_selector.addItems(sorted(column_sets.get(schema, {})))
+            set_selector.blockSignals(False)
+        
+        def apply_set(index):
+            if index > 0:
+                set_checked(column_sets[schema][set_selector.currentText()])
+        
+        def save_set():
+            name, ok = QInputDialog.getText(dialog, '保存列集', '列集名称:')
+            name = name.strip()
+            if not ok or not name:
+                return
+            column_sets.setdefault(schema, {})[name] = checked_columns()
+            self.settings.setValue('column_sets', column_sets)
+            refresh_sets()
+            set_selector.setCurrentText(name)
+        
+        def delete_set():
+            if set_selector.currentIndex() <= 0:
+                return
+            del column_sets[schema][set_selector.currentText()]
+            if not column_sets[schema]:
+                del column_sets[schema]
+            self.settings.setValue('column_sets', column_sets)
+            refresh_sets()
+        
+        refresh_sets()
+        set_selector.currentIndexChanged.connect(apply_set)
+        
+        button_layout = QHBoxLayout()
+        select_all_button = QPushButton('全选')
+        select_all_button.clicked.connect(lambda: set_checked(columns))
+        clear_button = QPushButton('全不选')
+        clear_button.clicked.connect(lambda: set_checked([]))
+        save_button = QPushButton('保存为列集...')
+        save_button.clicked.connect(save_set)
+        delete_button = QPushButton('删除列集')
+        delete_button.clicked.connect(delete_set)
+        button_layout.addWidget(select_all_button)
+        button_layout.addWidget(clear_button)
+        button_layout.addStretch(1)
+        button_layout.addWidget(save_button)
+        button_layout.addWidget(delete_button)
+        layout.addLayout(button_layout)
+        
+        ok_layout = QHBoxLayout()
+        ok_button = QPushButton('确定')
+        ok_button.clicked.connect(dialog.accept)
+        cancel_button = QPushButton('取消')
+        cancel_button.clicked.connect(dialog.reject)
+        ok_layout.addStretch(1)
+        ok_layout.addWidget(ok_button)
+        ok_layout.addWidget(cancel_button)
+        layout.addLayout(ok_layout)
+        
+        if dialog.exec_() == QDialog.Accepted:
+            self.set_scope_columns(checked_columns())
     
     def add_to_history(self, search_text, options):
         # 添加到历史记录
@@ -1133,16 +2437,29 @@ class DataSeek(QMainWindow):
             self.search_input.setText(history_item["text"])
             options = history_item["options"]
             
-            # 设置搜索选项
-            self.search_mode.setCurrentIndex(options.get("search_mode", 0))
+            # 设置搜索选项（旧版本的历史记录中搜索模式为序号）
+            search_mode = options.get("search_mode", 0)
+            if isinstance(search_mode, int):
+                self.search_mode.setCurrentIndex(search_mode)
+            else:
+                self.search_mode.setCurrentText(search_mode)
             self.exact_match.setChecked(options.get("exact_match", False))
             self.case_sensitive.setChecked(options.get("case_sensitive", False))
             self.whole_word.setChecked(options.get("whole_word", False))
             self.regex_match.setChecked(options.get("regex_match", False))
-            
-            # 如果是按列搜索，设置列
-            if options.get("search_mode") == 1 and "column_index" in options:
+            self.fuzzy_match.setChecked(options.get("fuzzy_match", False))
+            self.fuzzy_threshold.setValue(options.get("fuzzy_threshold", FUZZY_DEFAULT_THRESHOLD))
+            self.normalize_match.setChecked(options.get("normalize", False))
+            self.pinyin_match.setChecked(options.get("pinyin_match", False))
+            self.range_match.setChecked(options.get("range_match", False))
+            
+            # 如果是按列搜索，设置列；多列搜索恢复列范围
+            if options.get("column"):
+                self.column_selector.setCurrentText(options["column"])
+            elif options.get("search_mode") == 1 and "column_index" in options:
                 self.column_selector.setCurrentIndex(options["column_index"])
+            if options.get("columns"):
+                self.set_scope_columns(options["columns"])
     
     def clear_history(self):
         self.search_history.clear()
@@ -1161,72 +2478,7 @@ class DataSeek(QMainWindow):
     def search_in_dataframe(self, df, search_text, options):
         """在DataFrame中搜索数据"""
         try:
-            search_mode = options.get("search_mode", "全局搜索")
-            exact_match = options.get("exact_match", False)
-            case_sensitive = options.get("case_sensitive", False)
-            whole_word = options.get("whole_word", False)
-            regex_match = options.get("regex_match", False)
-            column = options.get("column", None)
-            
-            matches = []
-            
-            # 确定要搜索的列
-            if search_mode == "全局搜索":
-                columns_to_search = df.columns
-            else:  # 按列搜索
-                if column and str(column) in [str(col) for col in df.columns]:
-                    # 找到匹配的列（考虑类型转换）
-                    column_idx = [str(col) for col in df.columns].index(str(column))
-                    columns_to_search = [df.columns[column_idx]]
-                else:
-                    return matches
-            
-            # 执行搜索
-            for col in columns_to_search:
-                for row_idx, value in enumerate(df[col]):
-                    # 处理NaN值，确保显示为空字符串而不是'nan'
-                    cell_text = '' if pd.isna(value) else str(value)
-                    match_found = False
-                    
-                    # 根据匹配模式执行搜索
-                    if regex_match:
-                        # 正则表达式搜索
-                        try:
-                            if case_sensitive:
-                                pattern = re.compile(search_text)
-                            else:
-                                pattern = re.compile(search_text, re.IGNORECASE)
-                            match_found = bool(pattern.search(cell_text))
-                        except re.error:
-                            continue
-                    elif exact_match:
-                        # 精确匹配
-                        if case_sensitive:
-                            match_found = (search_text == cell_text)
-                        else:
-                            match_found = (search_text.lower() == cell_text.lower())
-                    elif whole_word:
-                        # 整词匹配
-                        word_pattern = r'\b' + re.escape(search_text) + r'\b'
-                        if case_sensitive:
-                            match_found = bool(re.search(word_pattern, cell_text))
-                        else:
-                            match_found = bool(re.search(word_pattern, cell_text, re.IGNORECASE))
-                    else:
-                        # 包含匹配
-                        if case_sensitive:
-                            match_found = (search_text in cell_text)
-                        else:
-                            match_found = (search_text.lower() in cell_text.lower())
-                    
-                    if match_found:
-                        # 获取整行数据
-                        row_data = df.iloc[row_idx].to_dict()
-                        # 确保字典的键都是字符串
-                        row_data = {str(k): v for k, v in row_data.items()}
-                        matches.append(row_data)
-            
-            return matches
+            return engine.search_in_dataframe(df, search_text, options)
         except Exception as e:
             QMessageBox.warning(self, '警告', f'搜索数据时发生错误：{str(e)}')
             return []
@@ -1552,21 +2804,7 @@ class DataSeek(QMainWindow):
         
         # 如果有有效文件，则加载
         if files_to_load:
-            # 创建进度对话框
-            self.progress_dialog = QProgressDialog('正在加载文件...', '取消', 0, 100, self)
-            self.progress_dialog.setWindowTitle('加载进度')
-            self.progress_dialog.setWindowModality(Qt.WindowModal)
-            self.progress_dialog.setMinimumDuration(0)  # 立即显示
-            self.progress_dialog.setValue(0)
-            self.progress_dialog.setAutoClose(False)
-            self.progress_dialog.canceled.connect(self.cancel_loading)  # 连接取消信号
-            
-            # 加载多个文件时显示总体进度
-            if len(files_to_load) > 1:
-                self.progress_dialog.setLabelText(f'正在加载 {len(files_to_load)} 个文件 (0/{len(files_to_load)})')
-            
-            # 开始加载第一个文件
-            self.load_files_batch(files_to_load, 0)
+            self.start_batch_load(files_to_load)
             
             # 接受拖放操作
             event.acceptProposedAction()
@@ -1578,15 +2816,32 @@ class DataSeek(QMainWindow):
         QMessageBox.information(self, '模式已切换', 
                                f"{'已启用' if self.low_memory_mode else '已禁用'}低内存模式，将在下次加载文件时生效。")
         
+    def get_memory_usage(self):
+        """返回当前进程内存占用（MB），psutil不可用时返回None"""
+        # psutil.Process对象只创建一次，定时器每次触发时直接复用
+        if self._process is None:
+            try:
+                import psutil
+                self._process = psutil.Process(os.getpid())
+            except Exception:
+                self._process = False
+        if not self._process:
+            return None
+        try:
+            return self._process.memory_info().rss / 1024 / 1024
+        except Exception:
+            return None
+        
     def update_memory_usage(self):
         """更新内存使用量显示"""
-        try:
-            import psutil
-            process = psutil.Process(os.getpid())
-            memory_usage = process.memory_info().rss / 1024 / 1024  # MB
-            self.memory_usage_label.setText(f"内存: {memory_usage:.1f} MB")
-        except:
-            self.memory_usage_label.setText("内存使用: 未知")
+        memory_usage = self.get_memory_usage()
+        if memory_usage is None:
+            text = "内存使用: 未知"
+        else:
+            text = f"内存: {memory_usage:.1f} MB"
+        if self.frame_monitor.enabled:
+            text += f" | {self.frame_monitor.summary()}"
+        self.memory_usage_label.setText(text)
             
     def show_performance_options(self):
         """显示性能选项对话框"""
@@ -1632,17 +2887,29 @@ class DataSeek(QMainWindow):
         table_layout.addWidget(preload_combo)
         table_group.setLayout(table_layout)
         
+        # 搜索选项
+        search_group = QGroupBox("搜索")
+        search_layout = QHBoxLayout()
+        search_limit_spin = QSpinBox()
+        search_limit_spin.setRange(0, 10000000)
+        search_limit_spin.setSingleStep(1000)
+        search_limit_spin.setSpecialValueText("不限制")
+        search_limit_spin.setValue(self.search_limit)
+        search_limit_spin.setToolTip("找到这么多匹配行即停止搜索，其余结果可点击“加载更多”取出")
+        search_layout.addWidget(QLabel("每次搜索的结果上限:"))
+        search_layout.addWidget(search_limit_spin)
+        search_group.setLayout(search_layout)
+        
         layout.addWidget(memory_group)
         layout.addWidget(table_group)
+        layout.addWidget(search_group)
         
         # 当前内存使用情况
-        try:
-            import psutil
-            process = psutil.Process(os.getpid())
-            memory_usage = process.memory_info().rss / 1024 / 1024  # MB
-            memory_info = QLabel(f"当前内存使用: {memory_usage:.1f} MB")
-        except:
+        memory_usage = self.get_memory_usage()
+        if memory_usage is None:
             memory_info = QLabel("当前内存使用: 未知")
+        else:
+            memory_info = QLabel(f"当前内存使用: {memory_usage:.1f} MB")
         layout.addWidget(memory_info)
         
         # 按钮
@@ -1672,8 +2939,99 @@ class DataSeek(QMainWindow):
             preload_rows = int(preload_text.split('行')[0].replace(',', ''))
             self.settings.setValue("preload_rows", preload_rows)
             
+            # 结果上限对之后的搜索立即生效
+            self.search_limit = search_limit_spin.value()
+            self.settings.setValue("search_limit", self.search_limit)
+            
             QMessageBox.information(self, "设置已保存", "新的性能设置将在下次加载文件时生效。")
             
+    def show_header_context_menu(self, position):
+        """显示主表格表头的上下文菜单"""
+        column = self.table.horizontalHeader().logicalIndexAt(position)
+        if column < 0 or self.table_model.source_row_count == 0:
+            return
+        menu = QMenu()
+        profile_action = QAction(f'列概况: {self.table_model.columns[column]}', self)
+        profile_action.triggered.connect(lambda: self.show_column_profile(column))
+        menu.addAction(profile_action)
+        column_name = str(self.table_model.columns[column])
+        key_action = QAction('设为关联键', self)
+        key_action.setCheckable(True)
+        key_action.setChecked(column_name in self.key_columns)
+        key_action.toggled.connect(lambda checked: self.set_key_column(column_name, checked))
+        menu.addAction(key_action)
+        menu.exec_(self.table.horizontalHeader().mapToGlobal(position))
+
+    def set_key_column(self, column_name, is_key):
+        """设置或取消关联键列；关联键按列名对所有文件生效，并在后台建立哈希索引"""
+        if is_key and column_name not in self.key_columns:
+            self.key_columns.append(column_name)
+        elif not is_key and column_name in self.key_columns:
+            self.key_columns.remove(column_name)
+        self.settings.setValue('key_columns', self.key_columns)
+        for model in [self.table_model] + [view.model() for view in self.result_views]:
+            model.set_key_columns(self.key_columns)
+        if is_key:
+            self.prepare_indexes()
+        
+    def show_column_profile(self, column):
+        """打开列概况面板；概况按 (文件, 列, 数据版本) 缓存，未缓存时在后台计算"""
+        file_path = self.current_file
+        column_name = self.table_model.columns[column]
+        version = self.data_manager.data_version(file_path)
+        
+        if self.profile_dialog is None:
+            self.profile_dialog = QDialog(self)
+            self.profile_dialog.setMinimumSize(420, 460)
+            layout = QVBoxLayout(self.profile_dialog)
+            self.profile_text = QTextEdit()
+            self.profile_text.setReadOnly(True)
+            layout.addWidget(self.profile_text)
+        self.profile_dialog.setWindowTitle(f'列概况 - {column_name}')
+        self.profile_dialog_key = (file_path, column_name, version)
+        self.profile_dialog.show()
+        self.profile_dialog.raise_()
+        
+        profile = self.data_manager.get_profile(file_path, column_name, version)
+        if profile is not None:
+            self.profile_text.setPlainText(self.format_column_profile(column_name, profile))
+            return
+        
+        self.profile_text.setPlainText(f'正在统计列“{column_name}”...')
+        worker = ProfileWorker(self.profile_dialog_key, self.table_model.column_series(column))
+        worker.finished_signal.connect(self.on_column_profile_finished)
+        worker.error_signal.connect(lambda message: self.profile_text.setPlainText(f'统计失败: {message}'))
+        worker.finished.connect(lambda: self.profile_workers.discard(worker))
+        self.profile_workers.add(worker)
+        worker.start()
+        
+    def on_column_profile_finished(self, key, profile, elapsed):
+        """列概况计算完成，缓存后在面板仍显示该列时更新"""
+        file_path, column_name, version = key
+        self.data_manager.set_profile(file_path, column_name, version, profile)
+        if self.profile_dialog and self.profile_dialog_key == key:
+            self.profile_text.setPlainText(self.format_column_profile(column_name, profile))
+        self.statusBar().showMessage(f'已统计列“{column_name}” (耗时: {elapsed:.2f}秒)')
+        
+    def format_column_profile(self, column_name, profile):
+        """列概况的显示文本"""
+        lines = [
+            f'列: {column_name}',
+            f'数据类型: {profile["dtype"]}',
+            f'行数: {profile["rows"]}',
+            f'缺失值: {profile["nulls"]} ({profile["null_ratio"]:.2%})',
+            f'不同取值: {profile["distinct"]}',
+        ]
+        if profile['min'] is not None:
+            lines.append(f'最小值: {profile["min"]}')
+            lines.append(f'最大值: {profile["max"]}')
+        lines.append('')
+        lines.append('最常见的取值:')
+        rows = profile['rows'] or 1
+        for value, count in profile['top_values']:
+            lines.append(f'  {value}    {count} ({count / rows:.2%})')
+        return '\n'.join(lines)
+        
     def show_preview_context_menu(self, position):
         """显示预览表格的上下文菜单"""
         self.show_context_menu(position, is_preview=True)
@@ -1684,10 +3042,16 @@ class DataSeek(QMainWindow):
         
         # 确定使用哪个表格
         table_view = self.preview_table if is_preview else self.table
+        if table_view is None:
+            return
         
         # 获取当前选中的行
-        selected_indexes = table_view.selectedIndexes()
-        if selected_indexes:
+        if table_view.selectionModel().hasSelection():
+            copy_selection = QAction('复制选中内容', self)
+            copy_selection.setShortcut(QKeySequence.Copy)
+            copy_selection.triggered.connect(lambda: self.copy_selection(is_preview))
+            menu.addAction(copy_selection)
+            
             copy_cell = QAction('复制单元格内容', self)
             copy_cell.triggered.connect(lambda: self.copy_cell_content(is_preview))
             menu.addAction(copy_cell)
@@ -1696,6 +3060,15 @@ class DataSeek(QMainWindow):
             copy_row.triggered.connect(lambda: self.copy_row_content(is_preview))
             menu.addAction(copy_row)
             
+            save_selection = QAction('将选中内容保存到文件...', self)
+            save_selection.triggered.connect(lambda: self.copy_selection(is_preview, to_file=True))
+            menu.addAction(save_selection)
+            
+            if any(str(col) in self.key_columns for col in table_view.model().columns):
+                related_action = QAction('查找关联行', self)
+                related_action.triggered.connect(lambda: self.find_related_rows(is_preview))
+                menu.addAction(related_action)
+            
             if is_preview:
                 export_action = QAction('导出搜索结果', self)
                 export_action.triggered.connect(self.export_results)
@@ -1703,16 +3076,59 @@ class DataSeek(QMainWindow):
             
             menu.exec_(table_view.mapToGlobal(position))
             
+    def find_related_rows(self, is_preview=False):
+        """按当前行的关联键值，通过哈希索引查找所有文件中的相关行"""
+        table_view = self.preview_table if is_preview else self.table
+        if table_view is None or not table_view.currentIndex().isValid():
+            return
+        model = table_view.model()
+        row = table_view.currentIndex().row()
+        key_values = {}
+        for col, name in enumerate(model.columns):
+            if str(name) in self.key_columns and str(name) not in key_values:
+                key_values[str(name)] = model.data(model.index(row, col), Qt.DisplayRole)
+        
+        try:
+            start_time = time.perf_counter()
+            frames = []
+            for file_path in self.file_paths:
+                df = self.data_manager.get_dataframe(file_path)
+                if df is None and file_path in self.dfs:
+                    df = self.dfs[file_path]
+                if df is not None:
+                    frames.append((file_path, df))
+            self.reload_stale_files()
+            
+            index_caches = {file_path: self.data_manager.index_cache(file_path) for file_path, _ in frames}
+            results = engine.related_rows(frames, key_values, index_caches)
+            elapsed_time = time.perf_counter() - start_time
+            
+            # “关联键”列放在文件名之后，匹配的键单元格高亮显示
+            hits = [(file_path, df, rows, engine.column_bits(columns, len(df.columns)))
+                    for file_path, df, rows, columns, _ in results]
+            labels = [np.full(len(rows), f'{name}={key_values[name]}', dtype=object)
+                      for _, _, rows, _, name in results]
+            self.show_search_results(engine.schema_result_frames(
+                hits, {'关联键': np.concatenate(labels) if labels else []}))
+            total = sum(len(rows) for _, _, rows, _ in hits)
+            keys_text = '、'.join(f'{name}={value}' for name, value in key_values.items())
+            self.statusBar().showMessage(f'关联键 {keys_text}: 在 {len({hit[0] for hit in hits})} 个文件中找到 '
+                                         f'{total} 行 (耗时: {elapsed_time * 1000:.1f}毫秒)')
+        except Exception as e:
+            QMessageBox.critical(self, '错误', f'查找关联行时发生错误：{str(e)}')
+            self.statusBar().showMessage('查找关联行失败')
+
     def copy_cell_content(self, is_preview=False):
-        """复制单元格内容"""
+        """复制当前单元格内容"""
         table_view = self.preview_table if is_preview else self.table
-        indexes = table_view.selectedIndexes()
-        if not indexes:
+        if table_view is None:
+            return
+        index = table_view.currentIndex()
+        if not index.isValid():
             return
             
         # 获取单元格数据
-        model = table_view.model()
-        cell_text = model.data(indexes[0], Qt.DisplayRole)
+        cell_text = table_view.model().data(index, Qt.DisplayRole)
         
         # 复制到剪贴板
         if cell_text:
@@ -1720,32 +3136,100 @@ class DataSeek(QMainWindow):
             clipboard.setText(cell_text)
             
     def copy_row_content(self, is_preview=False):
-        """复制整行内容"""
+        """复制所有选中行的整行内容"""
+        self.copy_selection(is_preview, whole_rows=True)
+        
+    def selected_rows_and_columns(self, table_view):
+        """把（可能不连续的）多个选择区域合并为视图行号数组和列号列表"""
+        row_arrays = []
+        columns = set()
+        for selection_range in table_view.selectionModel().selection():
+            row_arrays.append(np.arange(selection_range.top(), selection_range.bottom() + 1))
+            columns.update(range(selection_range.left(), selection_range.right() + 1))
+        if not row_arrays:
+            return np.array([], dtype=np.int64), []
+        return np.unique(np.concatenate(row_arrays)), sorted(columns)
+        
+    def copy_selection(self, is_preview=False, whole_rows=False, to_file=False):
+        """在后台线程中把选中的行列从底层数组序列化为TSV，复制到剪贴板或保存到文件"""
         table_view = self.preview_table if is_preview else self.table
-        selection_model = table_view.selectionModel()
-        if not selection_model.hasSelection():
+        if table_view is None:
             return
-            
-        # 获取选中的行
-        row = selection_model.selectedRows()[0].row()
         model = table_view.model()
+        if self.copy_worker and self.copy_worker.isRunning():
+            self.statusBar().showMessage('正在复制上一次选中的内容，请稍候')
+            return
         
-        # 收集行数据
-        row_data = []
-        for col in range(model.columnCount()):
-            index = model.index(row, col)
-            cell_text = model.data(index, Qt.DisplayRole)
-            row_data.append(cell_text if cell_text else '')
-            
-        # 复制到剪贴板
-        clipboard = QApplication.clipboard()
-        clipboard.setText('\t'.join(row_data))
+        rows, columns = self.selected_rows_and_columns(table_view)
+        if whole_rows:
+            columns = list(range(model.columnCount()))
+        if not len(rows) or not columns:
+            return
+        
+        # 选中内容过大时不放入剪贴板，改为询问是否保存到文件
+        cell_count = len(rows) * len(columns)
+        if not to_file and cell_count > self.COPY_MAX_CELLS:
+            reply = QMessageBox.question(
+                self, '选中内容过大',
+                f'选中了 {len(rows)} 行 × {len(columns)} 列，超过剪贴板建议的 {self.COPY_MAX_CELLS} 个单元格。\n'
+                f'是否改为保存到文件？',
+                QMessageBox.Yes | QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+            to_file = True
+        
+        file_path = None
+        header = None
+        if to_file:
+            file_path, _ = QFileDialog.getSaveFileName(self, '保存选中内容', '', '制表符分隔文件 (*.tsv *.txt)')
+            if not file_path:
+                return
+            header = [model.columns[col] for col in columns]
+        
+        # 视图行号映射为源数据行号，数据直接从模型的数据块中读取
+        source_rows = rows if model.row_order is None else model.row_order[rows]
+        worker = CopyWorker(list(model.chunks), source_rows, columns, file_path, header)
+        self.copy_worker = worker
+        
+        def on_finished(text, row_count, elapsed):
+            if text is None:
+                self.statusBar().showMessage(
+                    f'已保存 {row_count} 行到 {os.path.basename(file_path)} (耗时: {elapsed:.2f}秒)')
+            else:
+                QApplication.clipboard().setText(text)
+                self.statusBar().showMessage(f'已复制 {row_count} 行 × {len(columns)} 列 (耗时: {elapsed:.2f}秒)')
+        
+        worker.finished_signal.connect(on_finished)
+        worker.error_signal.connect(lambda message: QMessageBox.critical(self, '错误', f'复制失败：{message}'))
+        self.statusBar().showMessage(f'正在复制 {len(rows)} 行...')
+        worker.start()
 
 def main():
+    if '--profile-startup' in sys.argv:
+        sys.argv.remove('--profile-startup')
+        startup_profiler.enabled = True
+    profile_ui = '--profile-ui' in sys.argv
+    if profile_ui:
+        sys.argv.remove('--profile-ui')
+    
     app = QApplication(sys.argv)
+    startup_profiler.mark('创建QApplication')
     window = DataSeek()
+    startup_profiler.mark('初始化主窗口')
     window.show()
-    sys.exit(app.exec_())
+    startup_profiler.mark('显示主窗口')
+    
+    # 首次进入事件循环时窗口已可见，此后再在后台导入pandas等模块
+    def on_first_event_loop():
+        startup_profiler.mark('进入事件循环（窗口可见）')
+        window.start_import_warmup()
+    QTimer.singleShot(0, on_first_event_loop)
+    
+    if profile_ui:
+        window.frame_monitor.start()
+    exit_code = app.exec_()
+    window.frame_monitor.report()
+    sys.exit(exit_code)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1 @@
+"""数探核心包：与图形界面无关的加载、搜索引擎和命令行工具"""
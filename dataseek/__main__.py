@@ -0,0 +1,7 @@
+"""支持以 python -m dataseek 方式运行命令行工具"""
+import sys
+
+from dataseek.cli import main
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,402 @@
+"""数探命令行：无图形界面地加载文件、建立工作区快照和批量搜索
+
+用法示例：
+    python -m dataseek load data/*.csv
+    python -m dataseek index data/ --out nightly.dsw
+    python -m dataseek search --workspace nightly.dsw --query 张三 --out results.csv
+    python -m dataseek lookup --workspace nightly.dsw --values-file ids.txt --out matches.csv
+    python -m dataseek serve --workspace nightly.dsw --port 8765
+"""
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from dataseek import engine
+from dataseek.workspace import WorkspaceSnapshot
+
+# 结果写出时每次写入的行数，避免一次性格式化超大结果
+WRITE_CHUNK_ROWS = 50000
+
+def build_parser():
+    """构造命令行参数解析器"""
+    parser = argparse.ArgumentParser(prog='python -m dataseek',
+                                     description='数探命令行：无界面加载、建立快照与批量搜索')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_source_arguments(sub):
+        sub.add_argument('files', nargs='*', help='Excel/CSV文件或包含它们的文件夹')
+        sub.add_argument('--workspace', help='从工作区快照(.dsw)读取文件数据')
+        sub.add_argument('--low-memory', action='store_true', help='分块读取大文件')
+        sub.add_argument('--chunk-size', type=int, default=50000, help='分块读取时每块的行数')
+        sub.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='并行进程数，默认使用全部CPU核心')
+
+    load_parser = subparsers.add_parser('load', help='加载文件并输出行数、列数和内存占用')
+    add_source_arguments(load_parser)
+
+    index_parser = subparsers.add_parser('index', help='加载文件并保存为工作区快照')
+    add_source_arguments(index_parser)
+    index_parser.add_argument('--out', required=True, help='快照保存路径(.dsw)')
+
+    search_parser = subparsers.add_parser('search', help='搜索文件并将匹配行写入CSV')
+    add_source_arguments(search_parser)
+    search_parser.add_argument('--query', required=True, help='搜索内容')
+    search_parser.add_argument('--column', help='只搜索指定列（默认全局搜索）')
+    search_parser.add_argument('--columns', help='只搜索这些列，以逗号分隔')
+    search_parser.add_argument('--exact', action='store_true', help='精确匹配')
+    search_parser.add_argument('--case-sensitive', action='store_true', help='区分大小写')
+    search_parser.add_argument('--whole-word', action='store_true', help='整词匹配')
+    search_parser.add_argument('--regex', action='store_true', help='正则表达式')
+    search_parser.add_argument('--fuzzy', action='store_true', help='模糊匹配（按编辑距离匹配整个单元格）')
+    search_parser.add_argument('--threshold', type=float, default=engine.FUZZY_DEFAULT_THRESHOLD,
+                               help='模糊匹配的相似度阈值(0~1]')
+    search_parser.add_argument('--normalize', action='store_true',
+                               help='标准化匹配：忽略全角/半角、繁简体（需opencc）和多余空白的差异')
+    search_parser.add_argument('--pinyin', action='store_true', help='配合--normalize按拼音匹配（需pypinyin）')
+    search_parser.add_argument('--range', action='store_true',
+                               help='范围查询数值列和日期列，如 1000..5000、">=1000 <5000"、2025-Q3')
+    search_parser.add_argument('--count', action='store_true',
+                               help='只统计各文件、各列的匹配数量，不输出匹配行')
+    search_parser.add_argument('--aggregate', metavar='COLUMN',
+                               help='配合--count，对匹配行的该数值列求合计、最小/最大值和平均值')
+    search_parser.add_argument('--limit', type=int, default=0,
+                               help='找到这么多匹配行即停止，按给出的文件顺序逐个搜索（默认不限制）')
+    search_parser.add_argument('--out', default='-', help='结果CSV路径，默认输出到标准输出')
+
+    lookup_parser = subparsers.add_parser('lookup', help='批量查找一组值，一次扫描输出每个值的匹配行和未找到的值')
+    add_source_arguments(lookup_parser)
+    lookup_parser.add_argument('--values-file', required=True, help='查找值文件，每行一个（CSV文件取第一列）')
+    lookup_parser.add_argument('--column', help='只在指定列中查找（默认所有列）')
+    lookup_parser.add_argument('--columns', help='只在这些列中查找，以逗号分隔')
+    lookup_parser.add_argument('--case-sensitive', action='store_true', help='区分大小写')
+    lookup_parser.add_argument('--out', default='-', help='结果CSV路径，默认输出到标准输出')
+    lookup_parser.add_argument('--not-found', help='将未找到的值写入该文件（每行一个）')
+
+    serve_parser = subparsers.add_parser('serve', help='加载文件并常驻内存，提供本地HTTP/JSON搜索服务')
+    add_source_arguments(serve_parser)
+    serve_parser.add_argument('--host', default='127.0.0.1', help='监听地址，默认仅本机访问')
+    serve_parser.add_argument('--port', type=int, default=8765, help='监听端口')
+
+    return parser
+
+def collect_sources(args):
+    """根据参数收集数据来源：文件路径或快照条目"""
+    sources = []
+    for path in args.files:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for file in sorted(files):
+                    if engine.is_supported_file(file):
+                        sources.append(os.path.join(root, file))
+        elif engine.is_supported_file(path):
+            sources.append(path)
+        else:
+            raise SystemExit(f'不支持的文件格式: {path}')
+    if args.workspace:
+        sources.extend(WorkspaceSnapshot.load(args.workspace))
+    if not sources:
+        raise SystemExit('没有可处理的文件')
+    return sources
+
+def source_path(source):
+    """数据来源对应的源文件路径"""
+    return source if isinstance(source, str) else source.file_path
+
+def load_source(source, low_memory=False, chunk_size=50000):
+    """加载数据来源，快照中源文件已变更时改为读取源文件"""
+    if not isinstance(source, str):
+        if not source.is_stale():
+            return source.load_dataframe()
+        source = source.file_path
+    if low_memory:
+        chunks = [chunk for chunk, _, _ in engine.iter_file_chunks(source, chunk_size)]
+        return pd.concat(chunks, ignore_index=True)
+    return engine.read_file(source)
+
+def search_options(args):
+    """将命令行参数转换为与界面一致的搜索选项"""
+    columns = [col.strip() for col in args.columns.split(',') if col.strip()] if args.columns else None
+    if columns:
+        search_mode = engine.SEARCH_MODE_COLUMNS
+    else:
+        search_mode = engine.SEARCH_MODE_COLUMN if args.column else engine.SEARCH_MODE_GLOBAL
+    return {
+        'exact_match': getattr(args, 'exact', False),
+        'case_sensitive': args.case_sensitive,
+        'whole_word': getattr(args, 'whole_word', False),
+        'regex_match': getattr(args, 'regex', False),
+        'fuzzy_match': getattr(args, 'fuzzy', False),
+        'fuzzy_threshold': getattr(args, 'threshold', engine.FUZZY_DEFAULT_THRESHOLD),
+        'normalize': getattr(args, 'normalize', False),
+        'pinyin_match': getattr(args, 'pinyin', False),
+        'range_match': getattr(args, 'range', False),
+        'search_mode': search_mode,
+        'column': args.column,
+        'columns': columns
+    }
+
+def source_columns(source):
+    """不加载数据，只读取来源的列名"""
+    return list(source.columns) if not isinstance(source, str) else engine.read_columns(source)
+
+def all_source_columns(sources):
+    """合并各来源的列名，按首次出现的顺序排列（与界面导出搜索结果时一致）"""
+    return list(dict.fromkeys(col for source in sources for col in source_columns(source)))
+
+# 以下函数在工作进程中执行
+
+def _load_task(source, low_memory, chunk_size):
+    start_time = time.perf_counter()
+    df = load_source(source, low_memory, chunk_size)
+    return {
+        'rows': len(df),
+        'columns': len(df.columns),
+        'memory_mb': df.memory_usage(deep=True).sum() / 1024 / 1024,
+        'elapsed': time.perf_counter() - start_time
+    }
+
+def _index_task(source, low_memory, chunk_size, tmp_dir, entry_name):
+    df = load_source(source, low_memory, chunk_size)
+    return WorkspaceSnapshot.save_entry(tmp_dir, entry_name, source_path(source), df)
+
+def _frame_task(source, low_memory, chunk_size):
+    return load_source(source, low_memory, chunk_size)
+
+def _search_task(source, low_memory, chunk_size, query, options):
+    start_time = time.perf_counter()
+    df = load_source(source, low_memory, chunk_size)
+    return engine.search_result_frame(df, query, options), time.perf_counter() - start_time
+
+def iter_limited_results(args, sources, query, options):
+    """按给出的顺序逐个文件搜索，找到args.limit个匹配行即停止，产出 (来源, (匹配行DataFrame, 耗时))"""
+    remaining = args.limit
+    for source in sources:
+        if remaining <= 0:
+            break
+        start_time = time.perf_counter()
+        df = load_source(source, args.low_memory, args.chunk_size)
+        rows, _, _ = engine.search_hits_limited(df, query, options, remaining)
+        remaining -= len(rows)
+        yield source, (df.iloc[rows], time.perf_counter() - start_time)
+
+def _count_task(source, low_memory, chunk_size, query, options, aggregate_column):
+    start_time = time.perf_counter()
+    df = load_source(source, low_memory, chunk_size)
+    mask, counts = engine.count_matches(df, query, options)
+    aggregate = None
+    columns = [str(col) for col in df.columns]
+    if aggregate_column in columns:
+        aggregate = engine.aggregate_values(df.iloc[:, columns.index(aggregate_column)], mask)
+    counts = {str(col): count for col, count in counts.items()}
+    return int(mask.sum()), counts, aggregate, time.perf_counter() - start_time
+
+def _lookup_task(source, low_memory, chunk_size, values, options):
+    start_time = time.perf_counter()
+    df = load_source(source, low_memory, chunk_size)
+    frame, found = engine.lookup_result_frame(df, values, options)
+    return frame, found, time.perf_counter() - start_time
+
+def run_tasks(args, sources, task, extra_args=lambda source: ()):
+    """在多个进程中并行执行任务，按完成顺序产出 (来源, 结果)
+
+    extra_args(source) 返回传给任务的附加参数。
+    """
+    if args.jobs <= 1 or len(sources) == 1:
+        for source in sources:
+            yield source, task(source, args.low_memory, args.chunk_size, *extra_args(source))
+        return
+
+    with ProcessPoolExecutor(max_workers=min(args.jobs, len(sources))) as executor:
+        futures = {executor.submit(task, source, args.low_memory, args.chunk_size, *extra_args(source)): source
+                   for source in sources}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+def command_load(args):
+    sources = collect_sources(args)
+    for source, info in run_tasks(args, sources, _load_task):
+        print(f"{source_path(source)}\t{info['rows']}行\t{info['columns']}列\t"
+              f"{info['memory_mb']:.1f} MB\t{info['elapsed']:.2f}秒")
+    return 0
+
+def command_index(args):
+    sources = collect_sources(args)
+    tmp_dir = WorkspaceSnapshot.begin(args.out)
+    entry_names = {id(source): f'f{i}' for i, source in enumerate(sources)}
+    files = {}
+    for source, info in run_tasks(args, sources, _index_task,
+                                  lambda source: (tmp_dir, entry_names[id(source)])):
+        files[id(source)] = info
+        print(f"已写入快照: {source_path(source)} ({info['total_rows']}行)", file=sys.stderr)
+    # 清单中的文件顺序与命令行给出的顺序一致
+    WorkspaceSnapshot.commit(args.out, [files[id(source)] for source in sources])
+    print(f'已保存工作区: {args.out} ({len(sources)}个文件)', file=sys.stderr)
+    return 0
+
+def command_search(args):
+    if args.regex:
+        try:
+            re.compile(args.query)
+        except re.error as e:
+            raise SystemExit(f'无效的正则表达式: {e}')
+    if args.fuzzy and not 0 < args.threshold <= 1:
+        raise SystemExit('模糊匹配的相似度阈值应在0到1之间')
+    if args.pinyin and not engine.pinyin_available():
+        raise SystemExit('拼音匹配需要安装pypinyin')
+    if args.range and engine.parse_range_query(args.query) is None:
+        raise SystemExit(f'无法解析范围条件: {args.query}')
+
+    sources = collect_sources(args)
+    options = search_options(args)
+    if args.count:
+        return write_counts(args, sources, options)
+
+    # 预先读取表头确定输出列，使结果可以边搜索边写出
+    all_columns = all_source_columns(sources)
+
+    out = sys.stdout if args.out == '-' else open(args.out, 'w', encoding='utf-8-sig', newline='')
+    try:
+        pd.DataFrame(columns=['文件名'] + all_columns).to_csv(out, index=False)
+        start_time = time.perf_counter()
+        total_matches = 0
+        if args.limit > 0:
+            results = iter_limited_results(args, sources, args.query, options)
+        else:
+            results = run_tasks(args, sources, _search_task, lambda source: (args.query, options))
+        for source, (result_df, elapsed) in results:
+            write_result_frame(out, result_df, all_columns, os.path.basename(source_path(source)))
+            total_matches += len(result_df)
+            print(f'{source_path(source)}: {len(result_df)}个匹配行 ({elapsed:.2f}秒)', file=sys.stderr)
+        print(f'共找到 {total_matches} 个匹配行 (总耗时: {time.perf_counter() - start_time:.2f}秒)',
+              file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+AGGREGATE_FIELDS = (('sum', '合计'), ('min', '最小值'), ('max', '最大值'), ('mean', '平均值'))
+
+def write_counts(args, sources, options):
+    """统计模式：每个文件输出一行匹配行数（及汇总值）和各列的匹配数量，不取出匹配行"""
+    out = sys.stdout if args.out == '-' else open(args.out, 'w', encoding='utf-8-sig', newline='')
+    try:
+        writer = csv.writer(out)
+        writer.writerow(['文件名', '列', '匹配数'] + [label for _, label in AGGREGATE_FIELDS])
+        start_time = time.perf_counter()
+        total_rows = 0
+        aggregates = []
+        results = run_tasks(args, sources, _count_task, lambda source: (args.query, options, args.aggregate))
+        for source, (rows, counts, aggregate, elapsed) in results:
+            file_name = os.path.basename(source_path(source))
+            values = ['' if aggregate is None or aggregate[key] is None else aggregate[key]
+                      for key, _ in AGGREGATE_FIELDS]
+            writer.writerow([file_name, '（匹配行数）', rows] + values)
+            for col, count in counts.items():
+                writer.writerow([file_name, col, count])
+            total_rows += rows
+            aggregates.append(aggregate)
+            print(f'{source_path(source)}: {rows}行匹配 ({elapsed:.2f}秒)', file=sys.stderr)
+        combined = engine.combine_aggregates(aggregates)
+        if combined is not None:
+            writer.writerow(['（全部文件）', '（匹配行数）', total_rows] +
+                            ['' if combined[key] is None else combined[key] for key, _ in AGGREGATE_FIELDS])
+        print(f'共 {total_rows} 行匹配 (总耗时: {time.perf_counter() - start_time:.2f}秒)', file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+def read_lookup_values(file_path):
+    """读取查找值文件"""
+    with open(file_path, 'r', encoding='utf-8-sig') as f:
+        if file_path.endswith('.csv'):
+            return engine.parse_lookup_values('\n'.join(row[0] for row in csv.reader(f) if row))
+        return engine.parse_lookup_values(f.read())
+
+def write_result_frame(out, frame, all_columns, file_name, leading_columns=()):
+    """按统一的列顺序分批写出结果行
+
+    frame 的前 len(leading_columns) 列为前置列（如“查找值”）。前置列和“文件名”列按位置写出，
+    源文件本身就有同名的列（如搜索目录中之前导出的结果文件）时也不会冲突。
+    """
+    leading_count = len(leading_columns)
+    for start in range(0, len(frame), WRITE_CHUNK_ROWS):
+        chunk = frame.iloc[start:start + WRITE_CHUNK_ROWS].astype(object)
+        values = chunk.iloc[:, leading_count:].reindex(columns=all_columns, fill_value='')
+        chunk = pd.concat([chunk.iloc[:, :leading_count], values], axis=1)
+        chunk.insert(0, '文件名', file_name, allow_duplicates=True)
+        chunk.to_csv(out, header=False, index=False)
+    out.flush()
+
+def command_lookup(args):
+    values = read_lookup_values(args.values_file)
+    if not values:
+        raise SystemExit('查找值文件为空')
+
+    sources = collect_sources(args)
+    options = search_options(args)
+    # 不区分大小写时，大小写不同的重复值只查找、统计一次
+    values = engine.unique_lookup_values(values, options)
+    all_columns = all_source_columns(sources)
+
+    out = sys.stdout if args.out == '-' else open(args.out, 'w', encoding='utf-8-sig', newline='')
+    try:
+        pd.DataFrame(columns=['文件名', '查找值'] + all_columns).to_csv(out, index=False)
+        start_time = time.perf_counter()
+        found = set()
+        total_matches = 0
+        results = run_tasks(args, sources, _lookup_task, lambda source: (values, options))
+        for source, (frame, found_indexes, elapsed) in results:
+            write_result_frame(out, frame, all_columns, os.path.basename(source_path(source)), ['查找值'])
+            found.update(found_indexes.tolist())
+            total_matches += len(frame)
+            print(f'{source_path(source)}: {len(frame)}个匹配项 ({elapsed:.2f}秒)', file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    not_found = [value for i, value in enumerate(values) if i not in found]
+    print(f'{len(values)}个查找值: 找到{len(values) - len(not_found)}个，未找到{len(not_found)}个，'
+          f'共{total_matches}个匹配项 (总耗时: {time.perf_counter() - start_time:.2f}秒)', file=sys.stderr)
+    if args.not_found:
+        with open(args.not_found, 'w', encoding='utf-8') as f:
+            f.writelines(value + '\n' for value in not_found)
+    return 0
+
+def command_serve(args):
+    from dataseek.server import SearchService, create_server
+
+    sources = collect_sources(args)
+    service = SearchService()
+    start_time = time.perf_counter()
+    for source, df in run_tasks(args, sources, _frame_task):
+        service.add_frame(source_path(source), df)
+        print(f'已加载: {source_path(source)} ({len(df)}行)', file=sys.stderr)
+    print(f'{len(sources)}个文件加载完成 (耗时: {time.perf_counter() - start_time:.2f}秒)', file=sys.stderr)
+
+    server = create_server(service, args.host, args.port)
+    print(f'搜索服务已启动: http://{args.host}:{server.server_port}/', file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+COMMANDS = {
+    'load': command_load,
+    'index': command_index,
+    'search': command_search,
+    'lookup': command_lookup,
+    'serve': command_serve,
+}
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return COMMANDS[args.command](args)
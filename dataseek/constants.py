@@ -0,0 +1,4 @@
+"""引擎和图形界面共用的默认值，不导入pandas/numpy，界面创建时可直接使用"""
+
+# 模糊匹配默认的相似度阈值：1 - 编辑距离 / 较长字符串的长度
+FUZZY_DEFAULT_THRESHOLD = 0.8
@@ -0,0 +1,1399 @@
+"""数探核心引擎：文件加载、数据后处理与搜索，不依赖图形界面"""
+import os
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python 3.10及以前
+    import sre_constants
+    import sre_parse
+
+from dataseek.constants import FUZZY_DEFAULT_THRESHOLD
+
+SUPPORTED_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+
+SEARCH_MODE_GLOBAL = '全局搜索'
+SEARCH_MODE_COLUMN = '按列搜索'
+SEARCH_MODE_COLUMNS = '多列搜索'
+
+def is_supported_file(file_path):
+    """判断文件扩展名是否受支持"""
+    return file_path.endswith(SUPPORTED_EXTENSIONS)
+
+def read_file(file_path):
+    """常规方式读取整个Excel/CSV文件并完成后处理"""
+    if file_path.endswith(('.xlsx', '.xls')):
+        # 过滤openpyxl的默认样式警告
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl.styles.stylesheet")
+            df = pd.read_excel(file_path)
+    elif file_path.endswith('.csv'):
+        df = pd.read_csv(file_path)
+    else:
+        raise ValueError('不支持的文件格式')
+
+    post_process_dataframe(df)
+    return df
+
+def iter_file_chunks(file_path, chunk_size=50000):
+    """分块读取文件，依次产出 (数据块, 是否最后一块, 已读取比例)"""
+    if file_path.endswith(('.xlsx', '.xls')):
+        chunks = _iter_excel_chunks(file_path, chunk_size)
+    elif file_path.endswith('.csv'):
+        chunks = _iter_csv_chunks(file_path, chunk_size)
+    else:
+        raise ValueError('不支持的文件格式')
+
+    # 预读下一块，以便准确标记最后一块
+    previous = None
+    for chunk, fraction in chunks:
+        post_process_dataframe(chunk)
+        if previous is not None:
+            yield previous[0], False, previous[1]
+        previous = (chunk, fraction)
+    if previous is not None:
+        yield previous[0], True, 1.0
+
+def _iter_excel_chunks(file_path, chunk_size):
+    """分块读取Excel文件"""
+    # 获取Excel表的行数
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl.styles.stylesheet")
+        import openpyxl
+        wb = openpyxl.load_workbook(file_path, read_only=True)
+        total_rows = wb.active.max_row
+        wb.close()
+
+    for i in range(0, total_rows, chunk_size):
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl.styles.stylesheet")
+            nrows = min(chunk_size, total_rows - i)
+            skiprows = list(range(1, i + 1)) if i > 0 else None
+            df_chunk = pd.read_excel(file_path, skiprows=skiprows, nrows=nrows)
+        yield df_chunk, min((i + nrows) / total_rows, 1.0)
+
+def _iter_csv_chunks(file_path, chunk_size):
+    """分块读取CSV文件"""
+    # 按字节统计总行数，仅用于计算进度
+    total_rows = 0
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            total_rows += block.count(b'\n')
+    total_rows = max(total_rows, 1)
+
+    loaded_rows = 0
+    for chunk in pd.read_csv(file_path, chunksize=chunk_size):
+        loaded_rows += len(chunk)
+        yield chunk, min(loaded_rows / total_rows, 1.0)
+
+def read_columns(file_path):
+    """只读取表头，返回后处理后的列名"""
+    if file_path.endswith(('.xlsx', '.xls')):
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl.styles.stylesheet")
+            df = pd.read_excel(file_path, nrows=0)
+    else:
+        df = pd.read_csv(file_path, nrows=0)
+    rename_unnamed_columns(df)
+    return list(df.columns)
+
+def post_process_dataframe(df):
+    """处理DataFrame"""
+    # 处理NaN值，将其替换为空字符串
+    df.fillna('', inplace=True)
+
+    # 处理无名列，并确保所有列名都是字符串类型
+    rename_unnamed_columns(df)
+
+    # 优化内存使用
+    optimize_dataframe_memory(df)
+
+def rename_unnamed_columns(df):
+    """将列名统一为字符串，并把pandas生成的Unnamed列重命名为“列N”"""
+    df.columns = [str(col) for col in df.columns]
+
+    # 检测列名中是否包含'Unnamed'开头的列
+    unnamed_cols = [col for col in df.columns if str(col).startswith('Unnamed')]
+    if unnamed_cols:
+        # 重命名无名列为更有意义的名称
+        rename_dict = {col: f"列{i+1}" for i, col in enumerate(unnamed_cols)}
+        df.rename(columns=rename_dict, inplace=True)
+
+def optimize_dataframe_memory(df):
+    """优化DataFrame内存使用"""
+    # 对于字符串列，转换为category类型可以节省内存
+    for col in df.columns:
+        if df[col].dtype == 'object' and df[col].nunique() < len(df) * 0.5:
+            df[col] = df[col].astype('category')
+
+    # 对于数值列，如果可能，使用较小的数据类型
+    for col in df.columns:
+        if pd.api.types.is_integer_dtype(df[col]):
+            # 对于整数列，尝试使用较小的整数类型
+            c_min = df[col].min()
+            c_max = df[col].max()
+            if c_min > -128 and c_max < 128:
+                df[col] = df[col].astype(np.int8)
+            elif c_min > -32768 and c_max < 32768:
+                df[col] = df[col].astype(np.int16)
+            elif c_min > -2147483648 and c_max < 2147483648:
+                df[col] = df[col].astype(np.int32)
+        elif pd.api.types.is_float_dtype(df[col]):
+            # 对于浮点列，尝试使用较小的浮点类型
+            df[col] = df[col].astype(np.float32)
+
+class ChunkedDataManager:
+    """分块数据管理器，用于处理大型数据集"""
+    def __init__(self):
+        self.chunks = {}  # 存储文件的数据块，键为文件路径，值为数据块列表
+        self.full_data = {}  # 存储完整数据，用于小型文件
+        self.meta_info = {}  # 存储元数据，如总行数、列名等
+        self.snapshot_entries = {}  # 从工作区快照恢复但尚未映射的文件
+        self.stale_files = []  # 访问时发现源文件已变更的快照文件
+        self.versions = {}  # 文件路径 -> 数据版本，数据变化时更新
+        self.profiles = {}  # (文件路径, 列名, 数据版本) -> 列概况
+        self.index_caches = {}  # 文件路径 -> (数据版本, 搜索索引缓存)
+        self._next_version = 1
+
+    def _bump_version(self, file_path):
+        """文件数据发生变化，更新数据版本并丢弃旧版本的列概况"""
+        self.versions[file_path] = self._next_version
+        self._next_version += 1
+        for key in [key for key in self.profiles if key[0] == file_path]:
+            del self.profiles[key]
+        self.index_caches.pop(file_path, None)
+
+    def data_version(self, file_path):
+        """文件当前的数据版本"""
+        return self.versions.get(file_path, 0)
+
+    def get_profile(self, file_path, column, version=None):
+        """获取缓存的列概况，没有时返回None"""
+        version = self.data_version(file_path) if version is None else version
+        return self.profiles.get((file_path, str(column), version))
+
+    def set_profile(self, file_path, column, version, profile):
+        """缓存列概况；数据版本已过期时丢弃"""
+        if version == self.data_version(file_path):
+            self.profiles[(file_path, str(column), version)] = profile
+
+    def cached_profiles(self, file_path):
+        """文件当前版本已缓存的全部列概况 {列名: 列概况}，供搜索时跳过不可能匹配的列"""
+        version = self.data_version(file_path)
+        return {column: profile for (path, column, profile_version), profile in self.profiles.items()
+                if path == file_path and profile_version == version}
+
+    def index_cache(self, file_path, version=None):
+        """文件当前版本的搜索索引缓存（模糊匹配索引、标准化影子列等），搜索时按需填充
+
+        指定的数据版本已过期时返回一个不会被保存的空缓存。
+        """
+        current = self.data_version(file_path)
+        if version is not None and version != current:
+            return {}
+        cached = self.index_caches.get(file_path)
+        if cached is None or cached[0] != current:
+            cached = self.index_caches[file_path] = (current, {})
+        return cached[1]
+
+    def add_chunk(self, file_path, chunk_df, is_last_chunk):
+        """添加数据块"""
+        # 确保文件路径存在于字典中
+        if file_path not in self.chunks:
+            self.chunks[file_path] = []
+            # 存储元数据
+            self.meta_info[file_path] = {
+                'columns': [str(col) for col in chunk_df.columns],
+                'total_rows': 0
+            }
+
+        # 添加数据块
+        self.chunks[file_path].append(chunk_df)
+        self._bump_version(file_path)
+
+        # 更新总行数
+        self.meta_info[file_path]['total_rows'] += len(chunk_df)
+
+        # 如果是最后一块，合并所有块
+        if is_last_chunk and len(self.chunks[file_path]) > 0:
+            # 如果总行数不太大，合并为完整数据
+            if self.meta_info[file_path]['total_rows'] < 500000:
+                self.full_data[file_path] = pd.concat(self.chunks[file_path], ignore_index=True)
+                # 释放块数据内存
+                self.chunks[file_path] = []
+
+    def add_dataframe(self, file_path, df):
+        """添加一次性加载的完整数据"""
+        self.full_data[file_path] = df
+        self._bump_version(file_path)
+        self.meta_info[file_path] = {
+            'columns': [str(col) for col in df.columns],
+            'total_rows': len(df)
+        }
+
+    def get_dataframe(self, file_path):
+        """获取文件的完整DataFrame"""
+        # 如果有完整数据，返回完整数据
+        if file_path in self.full_data:
+            return self.full_data[file_path]
+
+        # 如果来自工作区快照，首次访问时才校验源文件并映射数据
+        if file_path in self.snapshot_entries:
+            entry = self.snapshot_entries.pop(file_path)
+            if entry.is_stale():
+                # 源文件已修改，需重新从源文件加载
+                self.meta_info.pop(file_path, None)
+                self.stale_files.append(file_path)
+                return None
+            self.full_data[file_path] = entry.load_dataframe()
+            return self.full_data[file_path]
+
+        # 如果只有块数据，合并所有块返回
+        if file_path in self.chunks and self.chunks[file_path]:
+            return pd.concat(self.chunks[file_path], ignore_index=True)
+
+        return None
+
+    def get_chunks(self, file_path):
+        """获取尚未合并的数据块列表（不复制数据）；已有完整数据时返回空列表"""
+        if file_path in self.full_data:
+            return []
+        return list(self.chunks.get(file_path, []))
+
+    def add_snapshot_entry(self, entry):
+        """登记快照中的文件，数据在首次访问时才映射"""
+        self.snapshot_entries[entry.file_path] = entry
+        self.meta_info[entry.file_path] = {
+            'columns': list(entry.columns),
+            'total_rows': entry.total_rows
+        }
+
+    def pop_stale_files(self):
+        """取出源文件已变更、需要重新加载的文件列表"""
+        stale_files = self.stale_files
+        self.stale_files = []
+        return stale_files
+
+    def get_chunk(self, file_path, chunk_index):
+        """获取特定的数据块"""
+        if file_path in self.chunks and chunk_index < len(self.chunks[file_path]):
+            return self.chunks[file_path][chunk_index]
+        return None
+
+    def get_row_count(self, file_path):
+        """获取文件的总行数"""
+        if file_path in self.meta_info:
+            return self.meta_info[file_path]['total_rows']
+        return 0
+
+    def get_columns(self, file_path):
+        """获取文件的列名"""
+        if file_path in self.meta_info:
+            return self.meta_info[file_path]['columns']
+        return []
+
+    def clear_file(self, file_path):
+        """清除文件数据"""
+        if file_path in self.chunks:
+            del self.chunks[file_path]
+        if file_path in self.full_data:
+            del self.full_data[file_path]
+        if file_path in self.meta_info:
+            del self.meta_info[file_path]
+        if file_path in self.snapshot_entries:
+            del self.snapshot_entries[file_path]
+        self._bump_version(file_path)
+
+    def clear_all(self):
+        """清除所有数据"""
+        self.chunks.clear()
+        self.full_data.clear()
+        self.meta_info.clear()
+        self.snapshot_entries.clear()
+        self.stale_files = []
+        self.versions.clear()
+        self.profiles.clear()
+        self.index_caches.clear()
+
+def levenshtein(a, b, max_distance=None):
+    """计算编辑距离；超过max_distance时提前结束并返回max_distance + 1"""
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (char_a != char_b)))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+def _ngrams(text, q):
+    """字符串中不同的q-gram"""
+    return {text[i:i + q] for i in range(len(text) - q + 1)}
+
+class FuzzyIndex:
+    """列中不同取值的n-gram倒排索引，模糊匹配时先按长度和共有n-gram数筛选候选值，只对候选值计算编辑距离
+
+    values 为不同取值的列表，codes 为每行对应的取值序号。
+    """
+    GRAM_SIZES = (1, 2)
+
+    def __init__(self, values, codes, case_sensitive=False):
+        self.case_sensitive = case_sensitive
+        self.values = [value if case_sensitive else value.lower() for value in values]
+        self.codes = codes
+        self.lengths = np.fromiter((len(value) for value in self.values), dtype=np.int32,
+                                   count=len(self.values))
+        postings = {q: {} for q in self.GRAM_SIZES}
+        for value_id, value in enumerate(self.values):
+            for q in self.GRAM_SIZES:
+                for gram in _ngrams(value, q):
+                    postings[q].setdefault(gram, []).append(value_id)
+        self.postings = {q: {gram: np.array(ids, dtype=np.int32) for gram, ids in grams.items()}
+                         for q, grams in postings.items()}
+
+    @classmethod
+    def from_series(cls, series, case_sensitive=False, texts=None):
+        """按列的不同取值建立索引；category列直接使用其取值，缺失值对应空字符串"""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            values = [str(value) for value in series.cat.categories] + ['']
+            codes = series.cat.codes.to_numpy()
+            codes = np.where(codes < 0, len(values) - 1, codes)
+        else:
+            codes, uniques = pd.factorize(column_text(series) if texts is None else texts)
+            values = [str(value) for value in uniques]
+        return cls(values, codes, case_sensitive)
+
+    def candidates(self, search_text, threshold):
+        """按长度和共有n-gram数筛选可能达到相似度阈值的取值序号"""
+        query_length = len(search_text)
+        # 相似度达到阈值时，取值长度必须在此范围内
+        min_length = int(np.ceil(threshold * query_length - 1e-9))
+        max_length = int(np.floor(query_length / threshold + 1e-9))
+        in_range = (self.lengths >= min_length) & (self.lengths <= max_length)
+        # 每个取值允许的最大编辑距离
+        allowed = np.floor((1 - threshold) * np.maximum(self.lengths, query_length) + 1e-9).astype(np.int32)
+
+        # 一次编辑最多破坏查询中的q个n-gram，共有的不同n-gram数至少为 查询的不同n-gram数 - 编辑距离 * q
+        largest_allowed = int(np.floor((1 - threshold) * max_length + 1e-9))
+        for q in sorted(self.GRAM_SIZES, reverse=True):
+            grams = _ngrams(search_text, q)
+            if len(grams) - largest_allowed * q > 0:
+                break
+        else:
+            return np.flatnonzero(in_range)
+
+        posting_lists = [self.postings[q][gram] for gram in grams if gram in self.postings[q]]
+        shared = (np.bincount(np.concatenate(posting_lists), minlength=len(self.values))
+                  if posting_lists else np.zeros(len(self.values), dtype=np.int64))
+        return np.flatnonzero(in_range & (shared >= len(grams) - allowed * q))
+
+    def value_mask(self, search_text, threshold=FUZZY_DEFAULT_THRESHOLD):
+        """各个取值是否与搜索内容相似"""
+        if not self.case_sensitive:
+            search_text = search_text.lower()
+        mask = np.zeros(len(self.values), dtype=bool)
+        if not search_text:
+            return mask
+        for value_id in self.candidates(search_text, threshold):
+            value = self.values[value_id]
+            max_distance = int(np.floor((1 - threshold) * max(len(value), len(search_text)) + 1e-9))
+            mask[value_id] = levenshtein(search_text, value, max_distance) <= max_distance
+        return mask
+
+    def row_mask(self, search_text, threshold=FUZZY_DEFAULT_THRESHOLD):
+        """各行是否与搜索内容相似"""
+        return self.value_mask(search_text, threshold)[self.codes]
+
+def fuzzy_index(series, options, index_cache=None, texts=None):
+    """获取列的模糊匹配索引，index_cache 为文件的搜索索引缓存"""
+    case_sensitive = options.get("case_sensitive", False)
+    # 标准化影子列与原列同名，键中需区分
+    key = ('fuzzy', series.name, case_sensitive, normalization_key(options))
+    if index_cache is not None and key in index_cache:
+        return index_cache[key]
+    index = FuzzyIndex.from_series(series, case_sensitive, texts)
+    if index_cache is not None:
+        index_cache[key] = index
+    return index
+
+_converters = {}
+
+def _optional_converter(name):
+    """可选依赖提供的文本转换函数，未安装时返回None：'traditional' 繁体转简体(opencc)，'pinyin' 汉字转拼音(pypinyin)"""
+    if name not in _converters:
+        converter = None
+        try:
+            if name == 'traditional':
+                import opencc
+                converter = opencc.OpenCC('t2s').convert
+            elif name == 'pinyin':
+                from pypinyin import lazy_pinyin
+                converter = lambda text: ''.join(lazy_pinyin(text))
+        except Exception:
+            converter = None
+        _converters[name] = converter
+    return _converters[name]
+
+def pinyin_available():
+    """是否安装了pypinyin，可按拼音搜索"""
+    return _optional_converter('pinyin') is not None
+
+def normalization_key(options):
+    """搜索选项对应的标准化方式：None（不标准化）、'text' 或 'pinyin'"""
+    if not options.get("normalize", False):
+        return None
+    return 'pinyin' if options.get("pinyin_match", False) and pinyin_available() else 'text'
+
+def normalize_values(values, mode='text'):
+    """标准化字符串Series：全角/半角等兼容字符统一(NFKC)、繁体转简体(需opencc)、连续空白合并为一个空格；
+    mode 为 'pinyin' 时再转为不含空格的拼音(需pypinyin)"""
+    values = values.str.normalize('NFKC')
+    traditional = _optional_converter('traditional')
+    if traditional is not None:
+        values = values.map(traditional)
+    values = values.str.replace(r'\s+', ' ', regex=True).str.strip()
+    if mode == 'pinyin':
+        values = values.map(_optional_converter('pinyin')).str.replace(' ', '', regex=False)
+    return values
+
+def normalize_query(search_text, options):
+    """按与影子列相同的方式标准化搜索内容；正则表达式不做转换"""
+    mode = normalization_key(options)
+    if mode is None or options.get("regex_match", False):
+        return search_text
+    return normalize_values(pd.Series([search_text], dtype=object), mode).iloc[0]
+
+def normalized_column(series, mode='text'):
+    """生成列的标准化影子列：只转换不同取值，结果为category列，搜索时同样只匹配各个取值
+
+    数值、日期和布尔列的显示文本不受标准化影响，直接返回原列。
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        uniques = pd.Series(series.cat.categories).astype(str)
+        codes = series.cat.codes.to_numpy()
+    elif pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series
+    else:
+        codes, uniques = pd.factorize(series)
+        uniques = pd.Series(uniques).astype(str)
+    # 不同取值标准化后可能相同，重新编码使类别唯一；缺失值保持为-1
+    normalized_codes, normalized_uniques = pd.factorize(normalize_values(uniques, mode))
+    new_codes = np.where(codes >= 0, normalized_codes[np.maximum(codes, 0)] if len(uniques) else -1, -1)
+    return pd.Series(pd.Categorical.from_codes(new_codes, normalized_uniques), index=series.index, name=series.name)
+
+def normalized_frame(df, mode='text'):
+    """生成由标准化影子列组成的DataFrame，列与原DataFrame一一对应"""
+    return pd.DataFrame({i: normalized_column(df.iloc[:, i], mode) for i in range(len(df.columns))}
+                        ).set_axis(df.columns, axis=1)
+
+def normalized_target(df, search_text, options, index_cache=None):
+    """标准化搜索时返回 (影子列DataFrame, 标准化后的搜索内容)，否则原样返回；影子列缓存在 index_cache 中"""
+    mode = normalization_key(options)
+    if mode is None:
+        return df, search_text
+    key = ('normalized', mode)
+    if index_cache is not None and key in index_cache:
+        shadow = index_cache[key]
+    else:
+        shadow = normalized_frame(df, mode)
+        if index_cache is not None:
+            index_cache[key] = shadow
+    return shadow, normalize_query(search_text, options)
+
+def _collect_literals(items, literals):
+    """收集解析后的正则表达式中一定会出现的连续字面字符"""
+    current = []
+    for op, arg in items:
+        if op is sre_constants.LITERAL:
+            current.append(chr(arg))
+            continue
+        if current:
+            literals.append(''.join(current))
+            current = []
+        if op is sre_constants.SUBPATTERN:
+            _, add_flags, del_flags, sub_items = arg
+            # 分组内改变了大小写等规则时，其中的字面字符不能按外层规则预筛选
+            if not add_flags and not del_flags:
+                _collect_literals(sub_items, literals)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            min_count, _, sub_items = arg
+            if min_count >= 1:
+                _collect_literals(sub_items, literals)
+        elif op is getattr(sre_constants, 'ATOMIC_GROUP', None):
+            _collect_literals(arg, literals)
+        # 其余（分支、字符集、任意字符、断言、反向引用等）不产生确定的字面字符
+    if current:
+        literals.append(''.join(current))
+
+def regex_literals(pattern, flags=0):
+    """提取正则表达式的任何匹配都必须包含的字面子串，如 INV-\\d{6} 中的“INV-”；无法解析时返回空列表"""
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error:
+        return []
+    literals = []
+    _collect_literals(parsed, literals)
+    return literals
+
+def _casefold_safe_parts(literal):
+    """忽略大小写时把字面子串转为小写，并在不能可靠预筛选的字符处切开
+
+    正则忽略大小写时 i、s 还能匹配 ı、ſ，其他有大小写的非ASCII字母也有类似情况，
+    这些字符转为小写后不能用子串包含判断，只使用不含它们的部分。
+    """
+    parts, current = [], []
+    for char in literal:
+        if char.lower() == char.upper() or (char.isascii() and char not in 'iIsS'):
+            current.append(char.lower())
+        elif current:
+            parts.append(''.join(current))
+            current = []
+    if current:
+        parts.append(''.join(current))
+    return parts
+
+def regex_matcher(pattern, flags=0):
+    """构造正则表达式匹配函数，表达式只编译一次
+
+    先用任何匹配都必须包含的最长字面子串做子串包含预筛选，只对包含它的文本运行完整的正则表达式。
+    """
+    compiled = re.compile(pattern, flags)
+    ignore_case = bool(compiled.flags & re.IGNORECASE)
+    literals = regex_literals(pattern, flags)
+    if ignore_case:
+        literals = [part for literal in literals for part in _casefold_safe_parts(literal)]
+    if not literals:
+        return lambda texts: np.fromiter((compiled.search(text) is not None for text in texts.to_numpy()),
+                                         dtype=bool, count=len(texts))
+    literal = max(literals, key=len)
+
+    def match(texts):
+        candidates = (texts.str.lower() if ignore_case else texts).str.contains(literal, regex=False)
+        rows = np.flatnonzero(candidates.to_numpy(dtype=bool))
+        mask = np.zeros(len(texts), dtype=bool)
+        if len(rows):
+            mask[rows] = np.fromiter((compiled.search(text) is not None for text in texts.to_numpy()[rows]),
+                                     dtype=bool, count=len(rows))
+        return mask
+    return match
+
+def build_matcher(search_text, options):
+    """根据搜索选项构造匹配函数，输入字符串Series，返回布尔数组"""
+    case_sensitive = options.get("case_sensitive", False)
+    flags = 0 if case_sensitive else re.IGNORECASE
+
+    if options.get("fuzzy_match", False):
+        # 模糊匹配：按编辑距离计算整个单元格与搜索内容的相似度
+        threshold = options.get("fuzzy_threshold", FUZZY_DEFAULT_THRESHOLD)
+        return lambda texts: FuzzyIndex.from_series(texts, case_sensitive).row_mask(search_text, threshold)
+
+    if options.get("regex_match", False):
+        # 正则表达式搜索，无效的表达式不匹配任何内容
+        try:
+            return regex_matcher(search_text, flags)
+        except re.error:
+            return lambda texts: np.zeros(len(texts), dtype=bool)
+
+    if options.get("exact_match", False):
+        # 精确匹配
+        if case_sensitive:
+            return lambda texts: (texts == search_text).to_numpy(dtype=bool)
+        lowered = search_text.lower()
+        return lambda texts: (texts.str.lower() == lowered).to_numpy(dtype=bool)
+
+    if options.get("whole_word", False):
+        # 整词匹配
+        return regex_matcher(r'\b' + re.escape(search_text) + r'\b', flags)
+
+    # 包含匹配
+    if case_sensitive:
+        return lambda texts: texts.str.contains(search_text, regex=False).to_numpy(dtype=bool)
+    lowered = search_text.lower()
+    return lambda texts: texts.str.lower().str.contains(lowered, regex=False).to_numpy(dtype=bool)
+
+def column_text(series):
+    """将列转换为用于匹配的字符串Series，缺失值视为空字符串"""
+    return series.astype(str).where(series.notna(), '')
+
+def build_text_cache(df):
+    """预先计算非category列的匹配文本，供常驻内存的数据集反复搜索时复用"""
+    return {col: column_text(df[col]) for col in df.columns
+            if not isinstance(df[col].dtype, pd.CategoricalDtype)}
+
+def column_match_mask(series, matcher, texts=None):
+    """计算一列的匹配掩码，texts为预先计算好的匹配文本（可选）"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return category_lookup(series, matcher)[series.cat.codes.to_numpy()]
+    return matcher(column_text(series) if texts is None else texts)
+
+def category_lookup(series, matcher):
+    """category列只需匹配各个取值，再按编码展开；编码-1(缺失值)对应追加在末尾的空字符串"""
+    categories = pd.Series(series.cat.categories).astype(str)
+    return np.append(matcher(categories), matcher(pd.Series([''], dtype=object)))
+
+def columns_to_search(df, options):
+    """根据搜索模式确定要搜索的列"""
+    search_mode = options.get("search_mode", SEARCH_MODE_GLOBAL)
+    if search_mode == SEARCH_MODE_GLOBAL:
+        return list(df.columns)
+
+    if search_mode == SEARCH_MODE_COLUMNS:
+        # 多列搜索，只搜索选中的列，文件中没有的列忽略
+        selected = {str(col) for col in options.get("columns") or ()}
+        return [col for col in df.columns if str(col) in selected]
+
+    # 按列搜索，找到匹配的列（考虑类型转换）
+    column = options.get("column", None)
+    column_names = [str(col) for col in df.columns]
+    if column and str(column) in column_names:
+        return [df.columns[column_names.index(str(column))]]
+    return []
+
+SEARCH_PARTITION_ROWS = 100000  # 限量搜索时每次扫描的行数
+
+# 数值列的显示文本只可能包含这些字符
+NUMERIC_TEXT_CHARS = frozenset('0123456789.-+einf')
+
+def profile_column(series, top_n=10):
+    """计算列概况：行数、缺失值数量、不同取值数、最常见的取值以及最小/最大值
+
+    category列直接对编码计数，不展开各行的取值。
+    """
+    rows = len(series)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        codes = series.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+        present = np.flatnonzero(counts)
+        top = present[np.argsort(-counts[present], kind='stable')][:top_n]
+        top_values = [(categories[i], int(counts[i])) for i in top]
+        nulls = rows - int(counts.sum())
+        values = categories[present]
+        value_dtype = categories.dtype
+    else:
+        counts = series.value_counts(dropna=True)
+        top_values = [(value, int(count)) for value, count in counts.head(top_n).items()]
+        nulls = int(series.isna().sum())
+        values = counts.index
+        value_dtype = series.dtype
+
+    if pd.api.types.is_bool_dtype(value_dtype):
+        kind = 'text'
+    elif pd.api.types.is_numeric_dtype(value_dtype):
+        kind = 'numeric'
+    elif pd.api.types.is_datetime64_any_dtype(value_dtype):
+        kind = 'datetime'
+    else:
+        kind = 'text'
+
+    minimum = maximum = None
+    if len(values):
+        # 只在不同取值上计算，文本列按显示文本比较
+        if kind == 'text':
+            values = values.astype(str)
+        minimum, maximum = values.min(), values.max()
+    return {
+        'dtype': str(series.dtype),
+        'kind': kind,
+        'rows': rows,
+        'nulls': nulls,
+        'null_ratio': nulls / rows if rows else 0.0,
+        'distinct': len(values),
+        'top_values': top_values,
+        'min': minimum,
+        'max': maximum
+    }
+
+def column_may_match(profile, search_text, options):
+    """根据列概况判断该列是否可能匹配，返回False时搜索可以跳过该列；没有概况时总是返回True"""
+    if profile is None or options.get("regex_match", False) or options.get("fuzzy_match", False) \
+            or options.get("range_match", False):
+        return True
+    if profile['rows'] and profile['nulls'] == profile['rows']:
+        # 全部为缺失值，匹配文本都是空字符串
+        return False
+    if profile['kind'] != 'numeric':
+        return True
+    if options.get("exact_match", False):
+        try:
+            number = float(search_text)
+        except ValueError:
+            return False
+        if profile['min'] is not None and not (profile['min'] <= number <= profile['max']):
+            return False
+        return True
+    return set(search_text.lower()) <= NUMERIC_TEXT_CHARS
+
+# 范围条件中两个界限之间的分隔符
+RANGE_SEPARATOR = re.compile(r'\s*(?:\.\.|~|～|至|到)\s*')
+# 界限延伸到下一个比较符或结尾，可以包含空格，如 ">=2025-09-30 23:00"
+RANGE_COMPARISON = re.compile(r'(>=|<=|>|<|≥|≤)\s*([^<>=≥≤]+?)\s*(?=[<>≥≤]|$)')
+
+def parse_range_query(search_text):
+    """解析范围条件，返回 (下限, 上限, 是否含下限, 是否含上限)，界限为字符串，None表示不限；无法解析时返回None
+
+    支持 a..b（也可用 ~、至、到 分隔，省略一端表示不限）、>=a、>a、<=b、<b 及其组合（如 ">=1000 <5000"），
+    以及单个值。日期界限可以是年(2025)、季度(2025-Q3)、月(2025-07)或具体日期，表示整个时间段。
+    """
+    text = search_text.strip()
+    if not text:
+        return None
+    parts = RANGE_SEPARATOR.split(text)
+    if len(parts) == 2:
+        low, high = (part or None for part in parts)
+        if low is None and high is None:
+            return None
+        return low, high, True, True
+    if len(parts) > 2:
+        return None
+
+    comparisons = RANGE_COMPARISON.findall(text)
+    if not comparisons:
+        return text, text, True, True
+    if RANGE_COMPARISON.sub('', text).strip(' ,，'):
+        return None
+    low = high = None
+    low_inclusive = high_inclusive = True
+    for operator, value in comparisons:
+        # 多个条件之间可以用逗号分隔
+        value = value.strip(' ,，')
+        if not value:
+            return None
+        if operator in ('>', '>=', '≥'):
+            low, low_inclusive = value, operator != '>'
+        else:
+            high, high_inclusive = value, operator != '<'
+    return low, high, low_inclusive, high_inclusive
+
+def period_bounds(text):
+    """日期界限对应的时间段 [开始, 结束)，无法解析时返回None"""
+    text = text.strip()
+    try:
+        match = re.fullmatch(r'(\d{4})年?', text)
+        if match:
+            start = pd.Timestamp(int(match.group(1)), 1, 1)
+            return start, start + pd.DateOffset(years=1)
+        match = re.fullmatch(r'(\d{4})\s*[-/.年]?\s*[Qq]([1-4])', text)
+        if match:
+            start = pd.Timestamp(int(match.group(1)), 3 * int(match.group(2)) - 2, 1)
+            return start, start + pd.DateOffset(months=3)
+        match = re.fullmatch(r'(\d{4})\s*[-/.年]\s*(\d{1,2})月?', text)
+        if match:
+            start = pd.Timestamp(int(match.group(1)), int(match.group(2)), 1)
+            return start, start + pd.DateOffset(months=1)
+        start = pd.Timestamp(re.sub(r'[年月]', '-', text).replace('日', ''))
+        if start is pd.NaT:
+            return None
+        if start.tz is not None:
+            start = start.tz_localize(None)
+        if ':' not in text and start == start.normalize():
+            return start, start + pd.Timedelta(days=1)
+        return start, start + pd.Timedelta(1, 'ns')
+    except (pd.errors.OutOfBoundsDatetime, ValueError, OverflowError):
+        # 如 -1000 能解析为公元前的日期，但超出纳秒时间戳的范围，作为数值界限处理，日期列跳过
+        return None
+
+def range_bounds(query, kind):
+    """把范围条件的界限转换为索引中的值，返回 (下限, 上限, 是否含下限, 是否含上限)；界限无法转换时返回None"""
+    low, high, low_inclusive, high_inclusive = query
+    if kind == 'numeric':
+        try:
+            return (None if low is None else float(low.replace(',', '')),
+                    None if high is None else float(high.replace(',', '')),
+                    low_inclusive, high_inclusive)
+        except ValueError:
+            return None
+
+    # 日期界限都转换为半开区间：包含下限时取时间段的开始，不包含时取结束，上限相反
+    low_period = None if low is None else period_bounds(low)
+    high_period = None if high is None else period_bounds(high)
+    if (low is not None and low_period is None) or (high is not None and high_period is None):
+        return None
+    try:
+        low_value = None if low is None else low_period[0 if low_inclusive else 1].value
+        high_value = None if high is None else high_period[1 if high_inclusive else 0].value
+    except (ValueError, OverflowError):
+        return None
+    return low_value, high_value, True, False
+
+def comparable_values(series):
+    """把列转换为可比较的值，返回 (类型, 值数组, 有效值掩码)；类型为 'numeric'、'datetime'，不可比较时为None
+
+    数值和日期列直接使用；文本列（包括category列）只转换不同取值：
+    多数取值是数字时按数值比较，否则多数取值是日期时按日期比较（日期为int64纳秒）。
+    """
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return None, None, None
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        values = series.to_numpy()
+        return 'numeric', values, ~np.isnan(values) if values.dtype.kind == 'f' else np.ones(len(values), dtype=bool)
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        if getattr(series.dt, 'tz', None) is not None:
+            series = series.dt.tz_localize(None)
+        values = series.to_numpy(dtype='datetime64[ns]')
+        return 'datetime', values.view(np.int64), ~np.isnat(values)
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), pd.Series(series.cat.categories)
+    else:
+        codes, uniques = pd.factorize(series)
+        uniques = pd.Series(uniques, dtype=object)
+    texts = uniques.astype(str).str.strip()
+    present = (texts != '').to_numpy()
+    if not present.any():
+        return None, None, None
+
+    # 数字可带千分位逗号，日期可写作“2025年8月1日”
+    numbers = pd.to_numeric(texts.str.replace(',', '', regex=False).where(present, None),
+                            errors='coerce').to_numpy(dtype=np.float64)
+    kind, unique_values, unique_valid = 'numeric', numbers, ~np.isnan(numbers)
+    if unique_valid.sum() * 2 < present.sum():
+        date_texts = uniques.where(uniques.map(type) != str,
+                                   texts.str.replace('[年月]', '-', regex=True).str.replace('日', '', regex=False))
+        date_texts = date_texts.where(present, None)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            try:
+                dates = pd.to_datetime(date_texts, errors='coerce', format='mixed')
+            except (TypeError, ValueError):
+                dates = pd.to_datetime(date_texts, errors='coerce')
+        if getattr(dates.dt, 'tz', None) is not None:
+            dates = dates.dt.tz_localize(None)
+        dates = dates.to_numpy(dtype='datetime64[ns]')
+        kind, unique_values, unique_valid = 'datetime', dates.view(np.int64), ~np.isnat(dates)
+        if unique_valid.sum() * 2 < present.sum():
+            return None, None, None
+
+    # 按编码展开，缺失值（编码-1）无效
+    safe_codes = np.maximum(codes, 0)
+    return kind, unique_values[safe_codes], (codes >= 0) & unique_valid[safe_codes]
+
+class SortedIndex:
+    """数值或日期列的排序索引：有效值升序排列及其行号，范围查询只需二分查找"""
+    def __init__(self, kind, values, rows):
+        self.kind = kind  # 'numeric'、'datetime'，列不可比较时为None
+        self.values = values
+        self.rows = rows
+
+    @classmethod
+    def from_series(cls, series):
+        kind, values, valid = comparable_values(series)
+        if kind is None:
+            return cls(None, np.array([]), np.array([], dtype=np.int64))
+        valid_rows = np.flatnonzero(valid)
+        valid_values = values[valid_rows]
+        order = np.argsort(valid_values, kind='stable')
+        return cls(kind, valid_values[order], valid_rows[order])
+
+    def range_rows(self, low=None, high=None, low_inclusive=True, high_inclusive=True):
+        """值在范围内的行号（升序）"""
+        if self.values.dtype.kind == 'f' and self.values.dtype.itemsize < 8:
+            # float32列的值按其自身精度显示，界限需转换为同样的精度，否则12.3等值与float64的界限不相等
+            with np.errstate(over='ignore'):
+                low = None if low is None else self.values.dtype.type(low)
+                high = None if high is None else self.values.dtype.type(high)
+        start = 0 if low is None else np.searchsorted(self.values, low, 'left' if low_inclusive else 'right')
+        end = len(self.values) if high is None else np.searchsorted(self.values, high,
+                                                                      'right' if high_inclusive else 'left')
+        return np.sort(self.rows[start:end])
+
+def sorted_index(series, options, index_cache=None):
+    """获取列的排序索引，index_cache 为文件的搜索索引缓存"""
+    key = ('sorted', series.name, normalization_key(options))
+    if index_cache is not None and key in index_cache:
+        return index_cache[key]
+    index = SortedIndex.from_series(series)
+    if index_cache is not None:
+        index_cache[key] = index
+    return index
+
+def iter_range_matches(df, search_text, options, index_cache=None):
+    """范围查询：逐列在排序索引中二分查找，产出 (列名, 匹配行号数组)；不可比较或界限类型不符的列跳过"""
+    query = parse_range_query(search_text)
+    if query is None:
+        return
+    for col in columns_to_search(df, options):
+        rows = _range_rows(df[col], query, options, index_cache)
+        if rows is not None and len(rows):
+            yield col, rows
+
+def _range_rows(series, query, options, index_cache=None):
+    """在一列的排序索引中查找范围内的行号（升序），列不可比较或界限类型不符时返回None"""
+    index = sorted_index(series, options, index_cache)
+    bounds = range_bounds(query, index.kind) if index.kind else None
+    if bounds is None:
+        return None
+    return index.range_rows(*bounds)
+
+def _column_mask(df, col, search_text, options, matcher, text_cache, index_cache):
+    """计算一列的匹配掩码；模糊匹配且提供了索引缓存时复用该列的n-gram索引"""
+    if options.get("fuzzy_match", False) and index_cache is not None:
+        index = fuzzy_index(df[col], options, index_cache, text_cache.get(col))
+        return index.row_mask(search_text, options.get("fuzzy_threshold", FUZZY_DEFAULT_THRESHOLD))
+    return column_match_mask(df[col], matcher, text_cache.get(col))
+
+def iter_column_matches(df, search_text, options, text_cache=None, profiles=None, index_cache=None):
+    """逐列搜索，产出 (列名, 匹配行号数组)
+
+    profiles 为已缓存的列概况 {列名: 列概况}，可据此跳过不可能匹配的列；
+    index_cache 为文件的搜索索引缓存（模糊匹配索引、标准化影子列、排序索引），按需建立并在多次搜索间复用。
+    """
+    df, search_text = normalized_target(df, search_text, options, index_cache)
+    if options.get("range_match", False):
+        yield from iter_range_matches(df, search_text, options, index_cache)
+        return
+    matcher = build_matcher(search_text, options)
+    text_cache = text_cache or {}
+    for col in columns_to_search(df, options):
+        if profiles and not column_may_match(profiles.get(str(col)), search_text, options):
+            continue
+        rows = np.flatnonzero(_column_mask(df, col, search_text, options, matcher, text_cache, index_cache))
+        if len(rows):
+            yield col, rows
+
+def _partition_mask_function(df, col, search_text, options, matcher, text_cache, index_cache, query=None):
+    """返回计算一列中 [begin, end) 行匹配掩码的函数，列不参与范围查询时返回None
+
+    category列和有索引的列（模糊匹配索引、范围查询的排序索引）只计算一次，各分区按编码或行号取出。
+    """
+    series = df[col]
+    if query is not None:
+        rows = _range_rows(series, query, options, index_cache)
+        if rows is None:
+            return None
+
+        def range_mask(begin, end):
+            mask = np.zeros(end - begin, dtype=bool)
+            mask[rows[np.searchsorted(rows, begin):np.searchsorted(rows, end)] - begin] = True
+            return mask
+        return range_mask
+
+    if options.get("fuzzy_match", False) and index_cache is not None:
+        index = fuzzy_index(series, options, index_cache, text_cache.get(col))
+        lookup = index.value_mask(search_text, options.get("fuzzy_threshold", FUZZY_DEFAULT_THRESHOLD))
+        return lambda begin, end: lookup[index.codes[begin:end]]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        lookup = category_lookup(series, matcher)
+        codes = series.cat.codes.to_numpy()
+        return lambda begin, end: lookup[codes[begin:end]]
+    texts = text_cache.get(col)
+    if texts is None:
+        return lambda begin, end: matcher(column_text(series.iloc[begin:end]))
+    return lambda begin, end: matcher(texts.iloc[begin:end])
+
+def iter_partition_matches(df, search_text, options, start_row=0, text_cache=None, profiles=None,
+                           index_cache=None, partition_rows=SEARCH_PARTITION_ROWS):
+    """从 start_row 起按行分区搜索，产出 (匹配行号数组, 每行匹配列的位图)
+
+    每个分区搜索全部要搜索的列，行号升序；调用方找够结果后即可停止，后面的分区不再扫描。
+    位图的格式见 row_hits。
+    """
+    df, search_text = normalized_target(df, search_text, options, index_cache)
+    query = None
+    if options.get("range_match", False):
+        query = parse_range_query(search_text)
+        if query is None:
+            return
+    matcher = None if query else build_matcher(search_text, options)
+    text_cache = text_cache or {}
+    positions = {col: i for i, col in enumerate(df.columns)}
+    functions = []  # [(列序号, 分区掩码函数)]，在第一个分区时才建立
+    for begin in range(start_row, len(df), partition_rows):
+        end = min(begin + partition_rows, len(df))
+        if begin == start_row:
+            for col in columns_to_search(df, options):
+                if not query and profiles and not column_may_match(profiles.get(str(col)), search_text, options):
+                    continue
+                function = _partition_mask_function(df, col, search_text, options, matcher, text_cache,
+                                                    index_cache, query)
+                if function is not None:
+                    functions.append((positions[col], function))
+            if not functions:
+                return
+
+        masks = [(position, function(begin, end)) for position, function in functions]
+        rows = np.flatnonzero(np.logical_or.reduce([mask for _, mask in masks]))
+        if not len(rows):
+            continue
+        matched = np.zeros((len(rows), len(df.columns)), dtype=bool)
+        for position, mask in masks:
+            matched[:, position] = mask[rows]
+        yield rows + begin, np.packbits(matched, axis=1, bitorder='little')
+
+def search_hits_limited(df, search_text, options, limit, start_row=0, text_cache=None, profiles=None,
+                        index_cache=None):
+    """从 start_row 起搜索至多 limit 个匹配行，返回 (行号数组, 匹配列位图, 下次继续的行号)
+
+    找够limit行即停止扫描；下次继续的行号可作为start_row传回，以取出后面的匹配行，
+    文件已搜索完时为None。
+    """
+    row_arrays, matched_arrays = [], []
+    found = 0
+    next_row = None if limit > 0 else start_row
+    if limit > 0:
+        for rows, matched in iter_partition_matches(df, search_text, options, start_row, text_cache, profiles,
+                                                    index_cache):
+            row_arrays.append(rows[:limit - found])
+            matched_arrays.append(matched[:limit - found])
+            found += len(row_arrays[-1])
+            if found >= limit:
+                # 从最后一个已取出的匹配行之后继续
+                next_row = int(row_arrays[-1][-1]) + 1
+                break
+    if not row_arrays:
+        return empty_row_hits(len(df.columns)) + (next_row,)
+    return np.concatenate(row_arrays), np.concatenate(matched_arrays), next_row
+
+def match_mask(df, search_text, options, text_cache=None, profiles=None, index_cache=None):
+    """计算行级匹配掩码：任一被搜索的列匹配即为True，用于在表格中直接筛选行"""
+    return count_matches(df, search_text, options, text_cache, profiles, index_cache)[0]
+
+def count_matches(df, search_text, options, text_cache=None, profiles=None, index_cache=None):
+    """只统计匹配数量，不取出匹配行：返回 (行级匹配掩码, {列名: 匹配单元格数})，没有匹配的列不列出"""
+    df, search_text = normalized_target(df, search_text, options, index_cache)
+    mask = np.zeros(len(df), dtype=bool)
+    counts = {}
+    if options.get("range_match", False):
+        for col, rows in iter_range_matches(df, search_text, options, index_cache):
+            mask[rows] = True
+            counts[col] = len(rows)
+        return mask, counts
+    matcher = build_matcher(search_text, options)
+    text_cache = text_cache or {}
+    for col in columns_to_search(df, options):
+        if profiles and not column_may_match(profiles.get(str(col)), search_text, options):
+            continue
+        column_mask = _column_mask(df, col, search_text, options, matcher, text_cache, index_cache)
+        count = int(np.count_nonzero(column_mask))
+        if count:
+            mask |= column_mask
+            counts[col] = count
+    return mask, counts
+
+def aggregate_values(series, mask):
+    """汇总匹配行中数值列的取值：返回 {'count', 'sum', 'min', 'max', 'mean'}，列不能按数值比较时返回None
+
+    文本形式的数字（包括带千分位逗号的）按数值处理，缺失值和无法转换的值不计入。
+    """
+    kind, values, valid = comparable_values(series)
+    if kind != 'numeric':
+        return None
+    selected = values[mask & valid].astype(np.float64)
+    if not len(selected):
+        return {'count': 0, 'sum': 0.0, 'min': None, 'max': None, 'mean': None}
+    total = float(selected.sum())
+    return {'count': len(selected), 'sum': total, 'min': float(selected.min()),
+            'max': float(selected.max()), 'mean': total / len(selected)}
+
+def combine_aggregates(aggregates):
+    """合并多个文件的汇总结果，忽略为None的项"""
+    aggregates = [aggregate for aggregate in aggregates if aggregate]
+    if not aggregates:
+        return None
+    count = sum(aggregate['count'] for aggregate in aggregates)
+    total = sum(aggregate['sum'] for aggregate in aggregates)
+    minimums = [aggregate['min'] for aggregate in aggregates if aggregate['min'] is not None]
+    maximums = [aggregate['max'] for aggregate in aggregates if aggregate['max'] is not None]
+    return {'count': count, 'sum': total, 'min': min(minimums) if minimums else None,
+            'max': max(maximums) if maximums else None, 'mean': total / count if count else None}
+
+def row_hits(cell_rows, cell_columns, column_count):
+    """把单元格级的匹配记录合并为行级记录：返回 (升序的行号数组, 每行匹配列的位图)
+
+    位图为uint8数组，形状为 (行数, ceil(列数/8))，第i列对应第 i//8 个字节的第 i%8 位（低位在前）。
+    """
+    rows, inverse = np.unique(cell_rows, return_inverse=True)
+    matched = np.zeros((len(rows), column_count), dtype=bool)
+    matched[inverse, cell_columns] = True
+    return rows, np.packbits(matched, axis=1, bitorder='little')
+
+def empty_row_hits(column_count):
+    """没有匹配行时的行级记录"""
+    return np.array([], dtype=np.int64), np.zeros((0, (column_count + 7) // 8), dtype=np.uint8)
+
+def column_bits(columns, column_count):
+    """每行只匹配一列时的匹配列位图，columns 为各行匹配的列序号"""
+    return row_hits(np.arange(len(columns)), columns, column_count)[1]
+
+def matched_positions(bits, column_count):
+    """一行的匹配列位图中为1的列序号"""
+    return np.flatnonzero(np.unpackbits(bits, count=column_count, bitorder='little'))
+
+def search_hits(df, search_text, options, text_cache=None, profiles=None, index_cache=None):
+    """搜索DataFrame，返回行级匹配记录 (升序的行号数组, 每行匹配列的位图)
+
+    一行有多列匹配时只出现一次，位图的格式见 row_hits。
+    """
+    positions = {col: i for i, col in enumerate(df.columns)}
+    row_arrays, column_arrays = [], []
+    for col, rows in iter_column_matches(df, search_text, options, text_cache, profiles, index_cache):
+        row_arrays.append(rows)
+        column_arrays.append(np.full(len(rows), positions[col], dtype=np.int32))
+    if not row_arrays:
+        return empty_row_hits(len(df.columns))
+    return row_hits(np.concatenate(row_arrays), np.concatenate(column_arrays), len(df.columns))
+
+def schema_result_frames(hits, leading_columns=None):
+    """按文件的列结构分组合并匹配记录，每组只包含这些文件实际拥有的列
+
+    hits 为 [(文件路径, DataFrame, 行号数组, 匹配列位图)]，位图的格式见 row_hits；leading_columns 为
+    {列名: 与全部匹配项一一对应的取值数组}，放在“文件名”列之后。
+    返回 [(列名元组, [(文件路径, 匹配项数)], 结果DataFrame, 每个结果行匹配列的位图)]，
+    结果位图按结果表的列序号排列，分组按首次出现的顺序排列。
+    """
+    leading_columns = {name: np.asarray(values, dtype=object) for name, values in (leading_columns or {}).items()}
+    groups = {}  # 列名元组 -> [(文件路径, DataFrame, 行号数组, 匹配列位图, 在全部匹配项中的起始位置)]
+    start = 0
+    for file_path, df, rows, columns in hits:
+        schema = tuple(str(col) for col in df.columns)
+        groups.setdefault(schema, []).append((file_path, df, rows, columns, start))
+        start += len(rows)
+
+    results = []
+    for schema, members in groups.items():
+        parts = []
+        for _, df, rows, _, _ in members:
+            part = df.iloc[rows]
+            part.columns = list(schema)
+            parts.append(part)
+        frame = pd.concat(parts, ignore_index=True)
+        frame.insert(0, '文件名', np.concatenate(
+            [np.full(len(rows), os.path.basename(file_path), dtype=object)
+             for file_path, _, rows, _, _ in members]), allow_duplicates=True)
+        for i, (name, values) in enumerate(leading_columns.items()):
+            frame.insert(i + 1, name, np.concatenate(
+                [values[offset:offset + len(rows)] for _, _, rows, _, offset in members]), allow_duplicates=True)
+        # 文件中的列序号加上前置列的数量即为结果表中的列序号
+        offset = 1 + len(leading_columns)
+        matched = np.zeros((len(frame), offset + len(schema)), dtype=bool)
+        matched[:, offset:] = np.unpackbits(np.concatenate([bits for _, _, _, bits, _ in members]), axis=1,
+                                            count=len(schema), bitorder='little')
+        files = [(file_path, len(rows)) for file_path, _, rows, _, _ in members]
+        results.append((schema, files, frame, np.packbits(matched, axis=1, bitorder='little')))
+    return results
+
+def search_in_dataframe(df, search_text, options):
+    """在DataFrame中搜索数据，每个匹配行返回一次（键为字符串的字典），按行号顺序排列"""
+    rows, _ = search_hits(df, search_text, options)
+    # 确保字典的键都是字符串
+    return [{str(k): v for k, v in row_data.items()} for row_data in df.iloc[rows].to_dict('records')]
+
+def search_result_frame(df, search_text, options):
+    """在DataFrame中搜索数据，返回由匹配行组成的DataFrame，每个匹配行只出现一次（行顺序与search_in_dataframe一致）"""
+    return df.iloc[search_hits(df, search_text, options)[0]]
+
+def parse_lookup_values(text):
+    """从粘贴的文本中解析批量查找值：每行一个（也接受制表符分隔），去除空白和重复项并保持顺序"""
+    values = []
+    seen = set()
+    for line in text.splitlines():
+        for value in line.split('\t'):
+            value = value.strip()
+            if value and value not in seen:
+                seen.add(value)
+                values.append(value)
+    return values
+
+def unique_lookup_values(values, options):
+    """去掉查找值中的重复项并保持顺序；不区分大小写时，大小写不同但转为小写后相同的值只保留第一个"""
+    if options.get("case_sensitive", False):
+        return list(dict.fromkeys(values))
+    seen = set()
+    unique = []
+    for value in values:
+        if value.lower() not in seen:
+            seen.add(value.lower())
+            unique.append(value)
+    return unique
+
+def iter_lookup_matches(df, values, options):
+    """批量查找：每个搜索列只做一次哈希探测（isin），产出 (列名, 匹配行号数组, 对应查找值序号数组)
+
+    单元格文本与查找值完全相同才算匹配，case_sensitive 选项控制是否区分大小写。
+    values 应已经过 unique_lookup_values 去重，每个查找值对应一个不同的键。
+    """
+    case_sensitive = options.get("case_sensitive", False)
+    key_index = pd.Index(values if case_sensitive else [value.lower() for value in values])
+
+    for col in columns_to_search(df, options):
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # category列只探测各个取值，再按编码找出对应的行
+            categories = pd.Index(series.cat.categories.astype(str))
+            if not case_sensitive:
+                categories = categories.str.lower()
+            category_keys = key_index.get_indexer(categories)
+            codes = series.cat.codes.to_numpy()
+            hit_categories = np.flatnonzero(category_keys >= 0)
+            if not len(hit_categories):
+                continue
+            rows = np.flatnonzero(np.isin(codes, hit_categories))
+            row_keys = category_keys[codes[rows]]
+        else:
+            texts = column_text(series)
+            if not case_sensitive:
+                texts = texts.str.lower()
+            rows = np.flatnonzero(texts.isin(key_index).to_numpy())
+            if not len(rows):
+                continue
+            row_keys = key_index.get_indexer(texts.to_numpy()[rows])
+        yield col, rows, row_keys
+
+class BulkLookupResult:
+    """批量查找结果：记录每个查找值匹配到的位置，以及未找到的值"""
+    def __init__(self, values):
+        self.values = list(values)
+        self.hits = []  # (文件路径, 列名, 行号数组, 查找值序号数组)
+
+    def add(self, file_path, col, rows, value_indexes):
+        self.hits.append((file_path, col, rows, value_indexes))
+
+    def match_counts(self):
+        """每个查找值的匹配单元格数"""
+        counts = np.zeros(len(self.values), dtype=np.int64)
+        for _, _, _, value_indexes in self.hits:
+            counts += np.bincount(value_indexes, minlength=len(self.values))
+        return counts
+
+    def total_matches(self):
+        return sum(len(rows) for _, _, rows, _ in self.hits)
+
+    def not_found(self):
+        """未在任何文件中找到的查找值"""
+        counts = self.match_counts()
+        return [value for value, count in zip(self.values, counts) if count == 0]
+
+    def matches_for(self, value):
+        """某个查找值的所有匹配位置 [(文件路径, 列名, 行号)]"""
+        index = self.values.index(value)
+        return [(file_path, col, int(row))
+                for file_path, col, rows, value_indexes in self.hits
+                for row in rows[value_indexes == index]]
+
+def bulk_lookup(frames, values, options):
+    """在多个文件中批量查找，frames 为 (文件路径, DataFrame) 序列；按当前选项重复的查找值只保留一个"""
+    result = BulkLookupResult(unique_lookup_values(values, options))
+    if not result.values:
+        return result
+    for file_path, df in frames:
+        for col, rows, value_indexes in iter_lookup_matches(df, result.values, options):
+            result.add(file_path, col, rows, value_indexes)
+    return result
+
+def lookup_result_frame(df, values, options):
+    """批量查找单个文件，返回 (匹配行组成的DataFrame（首列为“查找值”）, 找到的查找值序号数组)
+
+    values 应已经过 unique_lookup_values 去重。
+    """
+    row_arrays, value_arrays = [], []
+    for _, rows, value_indexes in iter_lookup_matches(df, values, options):
+        row_arrays.append(rows)
+        value_arrays.append(value_indexes)
+    if not row_arrays:
+        frame = df.iloc[0:0].copy()
+        frame.insert(0, '查找值', [], allow_duplicates=True)
+        return frame, np.array([], dtype=np.int64)
+
+    value_indexes = np.concatenate(value_arrays)
+    frame = df.iloc[np.concatenate(row_arrays)].copy()
+    frame.insert(0, '查找值', np.asarray(values, dtype=object)[value_indexes], allow_duplicates=True)
+    return frame, np.unique(value_indexes)
+
+# 整数值的浮点数文本（如 1001.0）作为关联键时去掉小数部分
+INTEGRAL_FLOAT_TEXT = re.compile(r'^(-?\d+)\.0+$')
+
+def normalize_key(value):
+    """关联键的比较文本：去除首尾空白，1001.0 与 1001 视为同一个键"""
+    text = '' if value is None or (not isinstance(value, str) and pd.isna(value)) else str(value).strip()
+    return INTEGRAL_FLOAT_TEXT.sub(r'\1', text)
+
+def key_texts(series):
+    """把列的不同取值转换为关联键文本，返回 (每行的键编号数组, 键文本数组)；空值的编号为-1"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), pd.Series(series.cat.categories, dtype=object)
+    else:
+        codes, uniques = pd.factorize(series)
+        uniques = pd.Series(uniques, dtype=object)
+    keys = uniques.astype(str).str.strip()
+    # 只对含小数点的取值做正则替换
+    dotted = keys.str.contains('.', regex=False).to_numpy(dtype=bool)
+    if dotted.any():
+        keys[dotted] = keys[dotted].str.replace(INTEGRAL_FLOAT_TEXT, r'\1', regex=True)
+    # 不同取值转换后可能相同，重新编码；空字符串不作为键
+    key_codes, key_uniques = pd.factorize(keys.where(keys != '', None))
+    if len(uniques):
+        codes = np.where(codes >= 0, key_codes[np.maximum(codes, 0)], -1)
+    return codes, key_uniques
+
+class KeyIndex:
+    """关联键列的哈希索引：键文本 -> 行号，每个键只需一次哈希探测即可取出全部行"""
+    def __init__(self, codes, keys):
+        self.keys = pd.Index(keys)
+        valid_rows = np.flatnonzero(codes >= 0)
+        # 行号按键编号分组排列，starts[i]:starts[i + 1] 为第i个键的行
+        order = np.argsort(codes[valid_rows], kind='stable')
+        self.rows = valid_rows[order]
+        self.starts = np.concatenate([[0], np.cumsum(np.bincount(codes[valid_rows], minlength=len(keys)))])
+
+    @classmethod
+    def from_series(cls, series):
+        return cls(*key_texts(series))
+
+    def lookup(self, values):
+        """多个键对应的行号（升序）"""
+        positions = self.keys.get_indexer([normalize_key(value) for value in values])
+        parts = [self.rows[self.starts[i]:self.starts[i + 1]] for i in positions if i >= 0]
+        if not parts:
+            return np.array([], dtype=np.int64)
+        return np.sort(np.concatenate(parts))
+
+def key_index(series, index_cache=None):
+    """获取关联键列的哈希索引，index_cache 为文件的搜索索引缓存"""
+    key = ('key', series.name)
+    if index_cache is not None and key in index_cache:
+        return index_cache[key]
+    index = KeyIndex.from_series(series)
+    if index_cache is not None:
+        index_cache[key] = index
+    return index
+
+def related_rows(frames, key_values, index_caches=None):
+    """按关联键查找各文件中的相关行
+
+    frames 为 [(文件路径, DataFrame)]，key_values 为 {关联键列名: 键值}，
+    index_caches 为 {文件路径: 搜索索引缓存}。只在含有同名列的文件中查找，
+    返回 [(文件路径, DataFrame, 行号数组, 匹配列序号数组, 关联键列名)]。
+    """
+    index_caches = index_caches or {}
+    results = []
+    for file_path, df in frames:
+        columns = [str(col) for col in df.columns]
+        for name, value in key_values.items():
+            if name not in columns or not normalize_key(value):
+                continue
+            position = columns.index(name)
+            index = key_index(df.iloc[:, position], index_caches.get(file_path))
+            rows = index.lookup([value])
+            if len(rows):
+                results.append((file_path, df, rows, np.full(len(rows), position, dtype=np.int32), name))
+    return results
+
+def sort_permutation(series, ascending=True):
+    """返回列排序后的行号排列（稳定排序，缺失值排在最后），只处理单列，不复制整个DataFrame"""
+    values = series.reset_index(drop=True)
+    try:
+        ordered = values.sort_values(ascending=ascending, kind='stable', na_position='last')
+    except TypeError:
+        # 混合类型（如数字和空字符串）的列按显示文本排序
+        ordered = column_text(values).sort_values(ascending=ascending, kind='stable')
+    return ordered.index.to_numpy()
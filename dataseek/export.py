@@ -0,0 +1,109 @@
+"""结果导出：按行分批写出CSV/XLSX，内存占用与导出的总行数无关"""
+import os
+
+import numpy as np
+import pandas as pd
+
+EXPORT_CHUNK_ROWS = 10000  # 每批写出的行数
+EXCEL_MAX_ROWS = 1048576  # Excel工作表最大行数（含表头）
+
+def iter_row_chunks(frames, row_order=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """按行顺序分批产出DataFrame
+
+    frames 为按行依次拼接的若干DataFrame（列相同），row_order 为输出行到
+    拼接后行号的映射（None表示按原顺序输出全部行）。每批只取出chunk_rows行。
+    """
+    starts = np.cumsum([0] + [len(frame) for frame in frames])
+    if row_order is None:
+        for frame in frames:
+            for start in range(0, len(frame), chunk_rows):
+                yield frame.iloc[start:start + chunk_rows]
+        return
+
+    for start in range(0, len(row_order), chunk_rows):
+        rows = np.asarray(row_order[start:start + chunk_rows])
+        if len(frames) == 1:
+            yield frames[0].iloc[rows]
+            continue
+        frame_ids = np.searchsorted(starts, rows, side='right') - 1
+        # 行分布在多个DataFrame中时，先按所在DataFrame分别取出，再恢复原来的顺序
+        parts, positions = [], []
+        for frame_id in np.unique(frame_ids):
+            selected = np.flatnonzero(frame_ids == frame_id)
+            parts.append(frames[frame_id].iloc[rows[selected] - starts[frame_id]])
+            positions.append(selected)
+        chunk = pd.concat(parts, ignore_index=True)
+        yield chunk.iloc[np.argsort(np.concatenate(positions), kind='stable')]
+
+def write_csv(file_path, columns, chunks, progress_callback=None):
+    """逐批追加写出CSV（UTF-8 BOM，Excel可直接打开）"""
+    written = 0
+    with open(file_path, 'w', encoding='utf-8-sig', newline='') as out:
+        pd.DataFrame(columns=columns).to_csv(out, index=False)
+        for chunk in chunks:
+            chunk.to_csv(out, header=False, index=False)
+            written += len(chunk)
+            if progress_callback and progress_callback(written) is False:
+                return written, False
+    return written, True
+
+def _excel_value(value, illegal_characters):
+    """转换为openpyxl可写入的值"""
+    if isinstance(value, str):
+        return illegal_characters.sub('', value)
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime().replace(tzinfo=None)
+    return str(value)
+
+def write_xlsx(file_path, columns, chunks, progress_callback=None):
+    """使用openpyxl的只写模式逐行流式写出XLSX，不在内存中保留已写出的行"""
+    import openpyxl
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('搜索结果')
+    sheet.append(list(columns))
+    written = 0
+    completed = True
+    for chunk in chunks:
+        # 转为Python对象，缺失值写为空单元格
+        values = chunk.astype(object).where(chunk.notna(), None).to_numpy().tolist()
+        for row in values:
+            sheet.append([_excel_value(value, ILLEGAL_CHARACTERS_RE) for value in row])
+        written += len(chunk)
+        if progress_callback and progress_callback(written) is False:
+            completed = False
+            break
+    # 只写模式的工作簿必须保存才会关闭临时文件，中止时由调用方删除
+    workbook.save(file_path)
+    return written, completed
+
+def export_rows(file_path, columns, frames, row_order=None, progress_callback=None,
+                chunk_rows=EXPORT_CHUNK_ROWS):
+    """按扩展名导出为XLSX或CSV，返回 (已写出行数, 是否完成)
+
+    progress_callback(已写出行数) 返回False时中止导出，并删除未写完的文件。
+    """
+    total_rows = sum(len(frame) for frame in frames) if row_order is None else len(row_order)
+    is_excel = file_path.lower().endswith('.xlsx')
+    if is_excel and total_rows + 1 > EXCEL_MAX_ROWS:
+        raise ValueError(f'结果共{total_rows}行，超过Excel单个工作表的行数上限，请导出为CSV文件')
+
+    chunks = iter_row_chunks(frames, row_order, chunk_rows)
+    writer = write_xlsx if is_excel else write_csv
+    written, completed = writer(file_path, columns, chunks, progress_callback)
+    if not completed and os.path.exists(file_path):
+        os.remove(file_path)
+    return written, completed
+
+def write_delimited(out, frames, rows, columns, sep='\t', header=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """把指定行和列分批写为分隔符文本
+
+    rows 为按行拼接后的行号数组，columns 为列序号列表，header 为表头列名列表（None表示不写表头）。
+    """
+    if header is not None:
+        pd.DataFrame(columns=header).to_csv(out, sep=sep, index=False)
+    for chunk in iter_row_chunks(frames, rows, chunk_rows):
+        chunk.iloc[:, columns].to_csv(out, sep=sep, header=False, index=False)
@@ -0,0 +1,312 @@
+"""本地HTTP/JSON搜索服务：一次加载文件并常驻内存，供多个客户端并发搜索
+
+接口：
+    GET  /files                      已加载文件列表
+    GET  /search?q=...               搜索，参数见 parse_search_params
+    POST /search                     同上，参数以JSON请求体提交
+    GET  /count?q=...                只统计各文件、各列的匹配数量，aggregate=列名 时汇总该数值列
+
+搜索参数 offset/limit 用于分页；stream=1 时以NDJSON逐行流式返回
+（每行一个匹配项，最后一行为汇总信息）。
+"""
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from dataseek import engine
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 10000
+# 最近搜索结果缓存数量，翻页时无需重新搜索
+RESULT_CACHE_SIZE = 32
+# 流式返回时每批序列化的行数
+STREAM_BATCH_ROWS = 1000
+
+class SearchService:
+    """常驻内存的数据集及其搜索逻辑，可被多个请求线程共享"""
+    def __init__(self):
+        self.frames = OrderedDict()  # 文件路径 -> DataFrame
+        self.text_caches = {}  # 文件路径 -> 预先计算的匹配文本
+        self.index_caches = {}  # 文件路径 -> 搜索索引缓存（模糊匹配索引、标准化影子列），首次使用时建立
+        self._results = OrderedDict()  # 搜索条件 -> 匹配结果
+        self._lock = threading.Lock()
+
+    def add_frame(self, file_path, df):
+        """添加数据集并预先计算搜索用文本"""
+        self.frames[file_path] = df
+        self.text_caches[file_path] = engine.build_text_cache(df)
+        self.index_caches[file_path] = {}
+
+    def files(self):
+        """已加载文件的信息"""
+        return [{'file': file_path, 'rows': len(df), 'columns': [str(col) for col in df.columns]}
+                for file_path, df in self.frames.items()]
+
+    def search(self, query, options, files=None):
+        """搜索所有（或指定的）文件，返回 [(文件路径, 匹配行号数组, 匹配列位图)]，每个匹配行只出现一次"""
+        key = (query, json.dumps(options, sort_keys=True), tuple(files or ()))
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+
+        hits = []
+        for file_path, df in self.frames.items():
+            if files and file_path not in files:
+                continue
+            rows, matched = engine.search_hits(df, query, options, self.text_caches[file_path],
+                                               index_cache=self.index_caches[file_path])
+            if len(rows):
+                hits.append((file_path, rows, matched))
+
+        with self._lock:
+            self._results[key] = hits
+            while len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return hits
+
+    def count(self, query, options, files=None, aggregate_column=None):
+        """统计各文件的匹配行数和各列的匹配数量，不取出匹配行"""
+        results = []
+        for file_path, df in self.frames.items():
+            if files and file_path not in files:
+                continue
+            mask, counts = engine.count_matches(df, query, options, self.text_caches[file_path],
+                                                index_cache=self.index_caches[file_path])
+            columns = [str(col) for col in df.columns]
+            aggregate = None
+            if aggregate_column in columns:
+                aggregate = engine.aggregate_values(df.iloc[:, columns.index(aggregate_column)], mask)
+            results.append({'file': file_path, 'rows': int(mask.sum()),
+                            'columns': {str(col): count for col, count in counts.items()},
+                            'aggregate': aggregate})
+        return results
+
+    def iter_records(self, hits, offset=0, limit=None, batch_rows=STREAM_BATCH_ROWS):
+        """按分页范围产出匹配行记录，每次只取出一批行；matched 为该行匹配的列名"""
+        end = None if limit is None else offset + limit
+        position = 0
+        for file_path, rows, matched in hits:
+            if end is not None and position >= end:
+                break
+            start = max(offset - position, 0)
+            stop = len(rows) if end is None else min(len(rows), end - position)
+            position += len(rows)
+            if start >= stop:
+                continue
+
+            df = self.frames[file_path]
+            columns = [str(col) for col in df.columns]
+            for batch_start in range(start, stop, batch_rows):
+                batch_stop = min(batch_start + batch_rows, stop)
+                batch = rows[batch_start:batch_stop]
+                for row, bits, values in zip(batch, matched[batch_start:batch_stop],
+                                             df.iloc[batch].itertuples(index=False, name=None)):
+                    yield {'file': file_path, 'row': int(row), 'values': dict(zip(columns, values)),
+                           'matched': [columns[i] for i in engine.matched_positions(bits, len(columns))]}
+
+def parse_bool(value):
+    """解析查询参数中的布尔值"""
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ('1', 'true', 'yes', 'on')
+
+def parse_number(params, name, convert, default):
+    """解析查询参数中的数值，无法转换时抛出ValueError"""
+    value = params.get(name, default)
+    try:
+        return convert(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f'参数 {name} 应为数字: {value!r}')
+
+def parse_search_params(params):
+    """解析搜索参数，返回 (搜索内容, 搜索选项, 文件列表, offset, limit, 是否流式)"""
+    query = params.get('q', '')
+    if not isinstance(query, str):
+        raise ValueError('搜索内容参数 q 应为字符串')
+    if not query:
+        raise ValueError('缺少搜索内容参数 q')
+
+    # columns 可以是列名列表，也可以是逗号分隔的字符串
+    columns = params.get('columns')
+    if isinstance(columns, str):
+        columns = [col.strip() for col in columns.split(',') if col.strip()]
+    if columns:
+        search_mode = engine.SEARCH_MODE_COLUMNS
+    else:
+        search_mode = engine.SEARCH_MODE_COLUMN if params.get('column') else engine.SEARCH_MODE_GLOBAL
+
+    options = {
+        'exact_match': parse_bool(params.get('exact', False)),
+        'case_sensitive': parse_bool(params.get('case_sensitive', False)),
+        'whole_word': parse_bool(params.get('whole_word', False)),
+        'regex_match': parse_bool(params.get('regex', False)),
+        'fuzzy_match': parse_bool(params.get('fuzzy', False)),
+        'fuzzy_threshold': engine.FUZZY_DEFAULT_THRESHOLD,
+        'normalize': parse_bool(params.get('normalize', False)),
+        'pinyin_match': parse_bool(params.get('pinyin', False)),
+        'range_match': parse_bool(params.get('range', False)),
+        'search_mode': search_mode,
+        'column': params.get('column') or None,
+        'columns': columns
+    }
+    if options['regex_match']:
+        try:
+            re.compile(query)
+        except re.error as e:
+            raise ValueError(f'无效的正则表达式: {e}')
+
+    if options['range_match'] and engine.parse_range_query(query) is None:
+        raise ValueError(f'无法解析范围条件: {query}')
+    if options['fuzzy_match']:
+        options['fuzzy_threshold'] = parse_number(params, 'threshold', float, engine.FUZZY_DEFAULT_THRESHOLD)
+        if not 0 < options['fuzzy_threshold'] <= 1:
+            raise ValueError('模糊匹配的相似度阈值应在0到1之间')
+
+    files = params.get('files')
+    if isinstance(files, str):
+        files = [files]
+
+    stream = parse_bool(params.get('stream', False))
+    offset = max(parse_number(params, 'offset', int, 0), 0)
+    if params.get('limit') is None:
+        limit = None if stream else DEFAULT_PAGE_SIZE
+    else:
+        limit = min(max(parse_number(params, 'limit', int, None), 0), MAX_PAGE_SIZE)
+    return query, options, files, offset, limit, stream
+
+def _json_default(value):
+    """序列化numpy标量、时间等JSON不支持的类型"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+def dumps(data):
+    return json.dumps(data, ensure_ascii=False, default=_json_default)
+
+class SearchRequestHandler(BaseHTTPRequestHandler):
+    """处理搜索服务的HTTP请求"""
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        params = {key: values[-1] for key, values in query.items()}
+        # file参数可重复出现，用于限定搜索的文件
+        params['files'] = query.get('file')
+        self.route(url.path, params)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            params = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self.send_json({'error': '请求体不是有效的JSON'}, status=400)
+            return
+        if not isinstance(params, dict):
+            self.send_json({'error': '请求体应为JSON对象'}, status=400)
+            return
+        self.route(url.path, params)
+
+    def route(self, path, params):
+        if path == '/files':
+            self.send_json({'files': self.service.files()})
+        elif path == '/search':
+            self.handle_search(params)
+        elif path == '/count':
+            self.handle_count(params)
+        else:
+            self.send_json({'error': f'未知的接口: {path}'}, status=404)
+
+    def handle_search(self, params):
+        try:
+            query, options, files, offset, limit, stream = parse_search_params(params)
+        except ValueError as e:
+            self.send_json({'error': str(e)}, status=400)
+            return
+
+        start_time = time.perf_counter()
+        hits = self.service.search(query, options, files)
+        total = sum(len(rows) for _, rows, _ in hits)
+        records = self.service.iter_records(hits, offset, limit)
+
+        if stream:
+            self.send_stream(records, {'query': query, 'total': total, 'offset': offset, 'limit': limit},
+                             start_time)
+            return
+
+        self.send_json({
+            'query': query,
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'results': list(records),
+            'elapsed': time.perf_counter() - start_time
+        })
+
+    def handle_count(self, params):
+        try:
+            query, options, files, _, _, _ = parse_search_params(params)
+        except ValueError as e:
+            self.send_json({'error': str(e)}, status=400)
+            return
+
+        start_time = time.perf_counter()
+        results = self.service.count(query, options, files, params.get('aggregate'))
+        self.send_json({
+            'query': query,
+            'total_rows': sum(result['rows'] for result in results),
+            'files': results,
+            'aggregate': engine.combine_aggregates(result['aggregate'] for result in results),
+            'elapsed': time.perf_counter() - start_time
+        })
+
+    def send_json(self, data, status=200):
+        body = dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_stream(self, records, summary, start_time):
+        """以分块传输编码逐行写出NDJSON"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        lines = []
+        try:
+            for record in records:
+                lines.append(dumps(record))
+                if len(lines) >= STREAM_BATCH_ROWS:
+                    self.write_chunk('\n'.join(lines) + '\n')
+                    lines = []
+            summary['elapsed'] = time.perf_counter() - start_time
+            lines.append(dumps({'summary': summary}))
+            self.write_chunk('\n'.join(lines) + '\n')
+            self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            # 客户端提前断开
+            self.close_connection = True
+
+    def write_chunk(self, text):
+        data = text.encode('utf-8')
+        self.wfile.write(f'{len(data):X}\r\n'.encode('ascii') + data + b'\r\n')
+
+def create_server(service, host='127.0.0.1', port=8765):
+    """创建多线程HTTP服务器"""
+    server = ThreadingHTTPServer((host, port), SearchRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
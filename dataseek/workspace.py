@@ -0,0 +1,224 @@
+"""工作区快照：将已加载文件的处理后数据保存为可内存映射的二进制格式"""
+import os
+import json
+import shutil
+import datetime
+
+import numpy as np
+import pandas as pd
+
+def _sorted_value_table(codes, uniques):
+    """把取值表按值排序（混合类型按显示文本排序），使还原后的category列按编码排序即按值排序，返回 (新编码, 取值表)"""
+    if not len(uniques):
+        return codes, uniques
+    values = uniques.to_numpy()
+    try:
+        order = np.argsort(values, kind='stable')
+    except TypeError:
+        order = np.argsort(values.astype(str), kind='stable')
+    remap = np.empty(len(order), dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    return np.where(codes >= 0, remap[np.maximum(codes, 0)], -1), uniques[order]
+
+def _plain_value(value):
+    """把取值转为可按类型保存的标量：字符串、数字和时间保持原样，其他类型只保留显示文本"""
+    if isinstance(value, np.datetime64):
+        return pd.Timestamp(value)
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (str, bool, int, float, datetime.date, datetime.time)):
+        return value
+    return str(value)
+
+def _plain_value_table(codes, uniques):
+    """把取值表转为可保存的取值，只保留显示文本后相同的取值合并为一个，返回 (新编码, 取值表)"""
+    plain = pd.Index([_plain_value(value) for value in uniques], dtype=object)
+    if plain.is_unique:
+        return codes, plain
+    plain_codes, plain = pd.factorize(plain)
+    return np.where(codes >= 0, plain_codes[np.maximum(codes, 0)], -1), pd.Index(plain, dtype=object)
+
+def _encode_value(value):
+    """把_plain_value转换后的取值转为JSON值，时间带类型标记"""
+    if isinstance(value, datetime.datetime):
+        return {'datetime': value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {'date': value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {'time': value.isoformat()}
+    return value
+
+def _decode_value(value):
+    """还原_encode_value保存的取值"""
+    if not isinstance(value, dict):
+        return value
+    if 'datetime' in value:
+        return pd.Timestamp(value['datetime'])
+    if 'date' in value:
+        return datetime.date.fromisoformat(value['date'])
+    return datetime.time.fromisoformat(value['time'])
+
+def _compact_codes(codes, category_count):
+    """按pandas为该类别数选用的整数类型保存编码，加载时category列可直接使用映射的编码而不复制"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if category_count < np.iinfo(dtype).max:
+            return codes.astype(dtype, copy=False)
+    return codes.astype(np.int64, copy=False)
+
+class SnapshotEntry:
+    """工作区快照中的单个文件，列数据以.npy格式存储并按需内存映射"""
+    def __init__(self, snapshot_dir, info):
+        self.entry_dir = os.path.join(snapshot_dir, info['dir'])
+        self.file_path = info['source']
+        self.source_mtime = info['mtime']
+        self.source_size = info['size']
+        self.total_rows = info['total_rows']
+        self.column_info = info['columns']
+        self.columns = [col['name'] for col in self.column_info]
+
+    def is_stale(self):
+        """检查源文件是否在保存快照后被修改（源文件不存在时继续使用快照）"""
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return False
+        return stat.st_mtime != self.source_mtime or stat.st_size != self.source_size
+
+    def load_dataframe(self):
+        """映射快照数据，返回DataFrame"""
+        data = {}
+        for i, col in enumerate(self.column_info):
+            values = np.load(os.path.join(self.entry_dir, f'c{i}.npy'), mmap_mode='c')
+            if col['kind'] == 'array':
+                data[col['name']] = values
+                continue
+
+            # category和文本列以编码+取值表的形式存储，还原为直接使用映射编码的category列，编码-1表示缺失值
+            # 取值表为数值/时间数组或JSON列表，读取时不反序列化任何Python对象
+            if col['values'] == 'json':
+                with open(os.path.join(self.entry_dir, f'c{i}_values.json'), 'r', encoding='utf-8') as f:
+                    uniques = pd.Index([_decode_value(value) for value in json.load(f)], dtype=object)
+            else:
+                uniques = np.load(os.path.join(self.entry_dir, f'c{i}_values.npy'))
+            data[col['name']] = pd.Categorical.from_codes(values, uniques, ordered=col.get('ordered', False))
+        return pd.DataFrame(data, columns=self.columns, copy=False)
+
+class WorkspaceSnapshot:
+    """工作区快照：保存已加载文件的处理后数据和列元数据，用于快速恢复会话"""
+    MANIFEST_NAME = 'manifest.json'
+    FORMAT_VERSION = 2
+
+    @staticmethod
+    def save(snapshot_dir, data_manager, file_paths, progress_callback=None):
+        """将文件数据写入快照目录，先写临时目录再替换，避免留下不完整的快照"""
+        tmp_dir = WorkspaceSnapshot.begin(snapshot_dir)
+
+        files = []
+        for index, file_path in enumerate(file_paths):
+            df = data_manager.get_dataframe(file_path)
+            if df is None:
+                continue
+            files.append(WorkspaceSnapshot.save_entry(tmp_dir, f'f{index}', file_path, df))
+            if progress_callback:
+                progress_callback(index + 1)
+
+        WorkspaceSnapshot.commit(snapshot_dir, files)
+        return len(files)
+
+    @staticmethod
+    def begin(snapshot_dir):
+        """创建用于写入快照的临时目录"""
+        tmp_dir = snapshot_dir + '.tmp'
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir)
+        os.makedirs(tmp_dir)
+        return tmp_dir
+
+    @staticmethod
+    def save_entry(tmp_dir, entry_name, file_path, df):
+        """将单个文件的数据写入临时目录下的子目录，返回清单中的文件信息
+
+        不同文件写入不同子目录，可在多个进程中并行调用。
+        """
+        entry_dir = os.path.join(tmp_dir, entry_name)
+        os.makedirs(entry_dir)
+
+        try:
+            stat = os.stat(file_path)
+            mtime, size = stat.st_mtime, stat.st_size
+        except OSError:
+            mtime, size = None, None
+
+        columns = []
+        for i, col in enumerate(df.columns):
+            columns.append(WorkspaceSnapshot._save_column(entry_dir, i, str(col), df[col]))
+        return {
+            'source': file_path,
+            'dir': entry_name,
+            'mtime': mtime,
+            'size': size,
+            'total_rows': len(df),
+            'columns': columns
+        }
+
+    @staticmethod
+    def commit(snapshot_dir, files):
+        """写入清单并用临时目录替换原有快照"""
+        tmp_dir = snapshot_dir + '.tmp'
+        manifest = {
+            'version': WorkspaceSnapshot.FORMAT_VERSION,
+            'created': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'files': files
+        }
+        with open(os.path.join(tmp_dir, WorkspaceSnapshot.MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+        if os.path.exists(snapshot_dir):
+            shutil.rmtree(snapshot_dir)
+        os.replace(tmp_dir, snapshot_dir)
+
+    @staticmethod
+    def _save_column(entry_dir, index, name, series):
+        """保存单列数据，返回列元数据"""
+        values_path = os.path.join(entry_dir, f'c{index}.npy')
+        dtype = series.dtype
+
+        if isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM':
+            # 数值、布尔和时间列可直接内存映射
+            np.save(values_path, series.to_numpy())
+            return {'name': name, 'kind': 'array', 'dtype': str(dtype)}
+
+        if isinstance(dtype, pd.CategoricalDtype):
+            kind, ordered = 'category', bool(dtype.ordered)
+            codes, uniques = series.cat.codes.to_numpy(), dtype.categories
+        else:
+            # 其余列（字符串、混合类型）分解为编码和取值表，加载后为category列
+            kind, ordered = 'object', False
+            codes, uniques = pd.factorize(series)
+            uniques = pd.Index(uniques, dtype=object)
+
+        as_array = isinstance(uniques.dtype, np.dtype) and uniques.dtype.kind in 'biufcmM'
+        if not as_array:
+            codes, uniques = _plain_value_table(codes, uniques)
+        if not ordered:
+            codes, uniques = _sorted_value_table(codes, uniques)
+
+        info = {'name': name, 'kind': kind, 'dtype': str(dtype), 'ordered': ordered}
+        if as_array:
+            info['values'] = 'array'
+            np.save(os.path.join(entry_dir, f'c{index}_values.npy'), uniques.to_numpy())
+        else:
+            info['values'] = 'json'
+            with open(os.path.join(entry_dir, f'c{index}_values.json'), 'w', encoding='utf-8') as f:
+                json.dump([_encode_value(value) for value in uniques], f, ensure_ascii=False)
+        np.save(values_path, _compact_codes(codes, len(uniques)))
+        return info
+
+    @staticmethod
+    def load(snapshot_dir):
+        """读取快照清单，返回SnapshotEntry列表（此时不读取任何列数据）"""
+        with open(os.path.join(snapshot_dir, WorkspaceSnapshot.MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != WorkspaceSnapshot.FORMAT_VERSION:
+            raise ValueError(f"不支持的快照版本: {manifest.get('version')}，请重新保存工作区")
+        return [SnapshotEntry(snapshot_dir, info) for info in manifest['files']]
@@ -0,0 +1,12 @@
+"""命令行工具的回归测试"""
+import pandas as pd
+
+from dataseek.cli import main
+
+def test_search_output_keeps_first_seen_column_order(tmp_path):
+    pd.DataFrame({'姓名': ['张三'], '城市': ['北京']}).to_csv(tmp_path / 'a.csv', index=False)
+    pd.DataFrame({'城市': ['上海'], '备注': ['张三']}).to_csv(tmp_path / 'b.csv', index=False)
+    out = tmp_path / 'out.csv'
+    main(['search', str(tmp_path / 'a.csv'), str(tmp_path / 'b.csv'), '--query', '张三',
+          '--jobs', '1', '--out', str(out)])
+    assert list(pd.read_csv(out, encoding='utf-8-sig').columns) == ['文件名', '姓名', '城市', '备注']
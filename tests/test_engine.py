@@ -0,0 +1,45 @@
+"""搜索引擎的回归测试"""
+import numpy as np
+import pandas as pd
+
+from dataseek import engine
+
+RANGE_OPTIONS = {'range_match': True, 'search_mode': engine.SEARCH_MODE_GLOBAL}
+
+def range_rows(df, query):
+    return {str(col): rows.tolist() for col, rows in engine.iter_range_matches(df, query, RANGE_OPTIONS)}
+
+def test_range_query_matches_float32_values_exactly():
+    # optimize_dataframe_memory 会把浮点列转为float32，显示的值与界限相等时应当匹配
+    df = pd.DataFrame({'金额': np.array([12.3, 100, 600.41], dtype=np.float32)})
+    assert range_rows(df, '600.41') == {'金额': [2]}
+    assert range_rows(df, '12.3') == {'金额': [0]}
+    assert range_rows(df, '<=12.3') == {'金额': [0]}
+    assert range_rows(df, '>12.3') == {'金额': [1, 2]}
+    assert range_rows(df, '12.3..100') == {'金额': [0, 1]}
+
+def test_bulk_lookup_merges_case_variants_when_case_insensitive():
+    df = pd.DataFrame({'编号': ['a1', 'x']})
+    result = engine.bulk_lookup([('a.csv', df)], ['a1', 'A1', 'b2', 'zz'], {'case_sensitive': False})
+    assert result.values == ['a1', 'b2', 'zz']
+    assert result.not_found() == ['b2', 'zz']
+
+def test_lookup_result_frame_keeps_existing_lookup_column():
+    # 搜索目录中之前导出的结果文件本身就有“查找值”列
+    df = pd.DataFrame({'查找值': ['x'], '编号': ['abc1']})
+    frame, found = engine.lookup_result_frame(df, ['abc1'], {})
+    assert list(frame.columns) == ['查找值', '查找值', '编号']
+    assert frame.iloc[0].tolist() == ['abc1', 'x', 'abc1']
+    assert found.tolist() == [0]
+
+def test_numeric_range_skips_datetime_columns_it_cannot_convert():
+    # -1000 能解析为公元前的日期，但超出纳秒时间戳的范围，日期列应被跳过而不是报错
+    df = pd.DataFrame({'日期': pd.to_datetime(['2025-01-01', '2025-06-01']), '金额': [-2000, 5]})
+    assert range_rows(df, '<-1000') == {'金额': [0]}
+    assert range_rows(df, '-1000..1000') == {'金额': [1]}
+
+def test_range_comparison_bound_may_include_time():
+    assert engine.parse_range_query('>=2025-09-30 23:00 <2025-10-01') == ('2025-09-30 23:00', '2025-10-01', True, False)
+    assert engine.parse_range_query('>=1,000, <5,000') == ('1,000', '5,000', True, False)
+    df = pd.DataFrame({'时间': pd.to_datetime(['2025-09-30 22:00', '2025-09-30 23:00', '2025-10-01 02:00'])})
+    assert range_rows(df, '>=2025-09-30 23:00') == {'时间': [1, 2]}
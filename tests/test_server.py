@@ -0,0 +1,24 @@
+"""搜索服务的回归测试"""
+import pytest
+
+from dataseek import engine
+from dataseek.server import parse_search_params
+
+@pytest.mark.parametrize('params', [
+    {'q': 123},
+    {'q': '张三', 'offset': None},
+    {'q': '张三', 'limit': []},
+    {'q': '张三', 'offset': 'abc'},
+    {'q': '张三', 'fuzzy': True, 'threshold': None},
+    {'q': '张三', 'fuzzy': True, 'threshold': 1.5},
+])
+def test_invalid_search_params_raise_value_error(params):
+    # handle_search/handle_count把ValueError转为400响应
+    with pytest.raises(ValueError):
+        parse_search_params(params)
+
+def test_threshold_ignored_without_fuzzy():
+    query, options, files, offset, limit, stream = parse_search_params(
+        {'q': '张三', 'threshold': None, 'offset': '5', 'limit': 20})
+    assert options['fuzzy_threshold'] == engine.FUZZY_DEFAULT_THRESHOLD
+    assert (offset, limit) == (5, 20)
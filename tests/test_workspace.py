@@ -0,0 +1,40 @@
+"""工作区快照的回归测试"""
+import numpy as np
+import pandas as pd
+
+from dataseek import engine
+from dataseek.workspace import WorkspaceSnapshot
+
+def save_and_load(tmp_path, df):
+    """保存为快照后重新加载"""
+    snapshot_dir = str(tmp_path / 'w.dsw')
+    tmp_dir = WorkspaceSnapshot.begin(snapshot_dir)
+    WorkspaceSnapshot.commit(snapshot_dir, [WorkspaceSnapshot.save_entry(tmp_dir, 'f0', 'a.csv', df)])
+    return WorkspaceSnapshot.load(snapshot_dir)[0].load_dataframe()
+
+def test_snapshot_text_columns_load_without_pickle(tmp_path):
+    when = pd.Timestamp('2025-01-02 03:04:05')
+    df = pd.DataFrame({'姓名': ['张三', None, '李四', '张三'], '混合': [1, '1', when, None],
+                       '金额': [1.5, 2.0, 3.0, 4.0]})
+    loaded = save_and_load(tmp_path, df)
+    # 文本列还原为直接使用映射编码的category列
+    assert isinstance(loaded['姓名'].dtype, pd.CategoricalDtype)
+    assert isinstance(loaded['姓名'].cat.codes.to_numpy().base, np.ndarray)
+    assert loaded['姓名'].tolist()[::2] == ['张三', '李四']
+    assert pd.isna(loaded['姓名'][1])
+    # 混合类型列的取值保持原类型，1 和 '1' 不合并
+    assert loaded['混合'].tolist()[:3] == [1, '1', when]
+    assert type(loaded['混合'][0]) is int
+    assert loaded['金额'].tolist() == [1.5, 2.0, 3.0, 4.0]
+
+def test_snapshot_columns_sort_by_value_after_load(tmp_path):
+    df = pd.DataFrame({'名称': ['b', 'c', 'a', 'b'],
+                       '等级': pd.Categorical(['y', 'z', 'x', 'y'], categories=['z', 'y', 'x']),
+                       '有序': pd.Categorical(['低', '高', '中', '低'], categories=['低', '中', '高'], ordered=True)})
+    loaded = save_and_load(tmp_path, df)
+    for column, expected in (('名称', ['a', 'b', 'b', 'c']), ('等级', ['x', 'y', 'y', 'z']),
+                             ('有序', ['低', '低', '中', '高'])):
+        order = engine.sort_permutation(loaded[column], True)
+        assert loaded[column].to_numpy()[order].tolist() == expected
+    # 有序category保持原有的类别顺序
+    assert list(loaded['有序'].cat.categories) == ['低', '中', '高']